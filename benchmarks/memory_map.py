@@ -0,0 +1,77 @@
+"""Compares the peak memory of reading a large template with mapping it into memory.
+
+Run with `python benchmarks/memory_map.py [megabytes]` on Linux. Every case runs in a fresh process, which reports how
+far constructing the template, and rendering it into a file as well, raised its peak resident set size, and how much
+of its heap the template keeps. Mapped files are decoded once for parsing, so parsing them needs memory for their whole
+text, like parsing read files.
+"""
+
+import gc
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from pyforma import Template
+
+_block = "Static text that is copied to the output as it is. " * 1000 + "{{ x }}\n"
+
+
+def _peak_mib() -> float:
+    """The peak resident set size of this process, in MiB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _heap_mib() -> float:
+    """The current size of the anonymous memory of this process, in MiB, excluding mapped files"""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("RssAnon missing from /proc/self/status")
+
+
+def _run(path: Path, memory_map: bool, render: bool) -> None:
+    peak, heap = _peak_mib(), _heap_mib()
+    template = Template(path, memory_map=memory_map)
+    if render:
+        with open(path.with_suffix(".out"), "w") as file:
+            template.render_to(file, {"x": 1})
+    _ = gc.collect()
+    print(_peak_mib() - peak, _heap_mib() - heap)
+    del template
+
+
+def main() -> None:
+    if len(sys.argv) == 5 and sys.argv[1] == "--run":
+        _run(Path(sys.argv[2]), sys.argv[3] == "mapped", sys.argv[4] == "render")
+        return
+
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "template.txt"
+        # Written block by block: the peak of this process is inherited by the processes it starts
+        with open(path, "w") as file:
+            for _ in range(megabytes * (1 << 20) // len(_block) + 1):
+                _ = file.write(_block)
+        print(
+            f"Template of {path.stat().st_size / (1 << 20):.0f} MiB, increase of the peak resident set size, and heap kept"
+        )
+        for mode in ("read", "mapped"):
+            for render in ("parse", "render"):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--run", str(path), mode, render],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                peak, kept = (float(value) for value in output.split())
+                name = (
+                    f"{mode}, {'parse and render' if render == 'render' else 'parse'}"
+                )
+                print(f"{name:24} peak {peak:9.1f} MiB  kept {kept:9.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Measures how parse time grows with the size of a template.
+
+Run with `python benchmarks/parse_scaling.py`. Linear growth yields ratios of about the size factor, quadratic growth
+about its square.
+"""
+
+import timeit
+from collections.abc import Callable
+
+from pyforma._parser import ParseContext, TemplateSyntaxConfig, template
+
+_repeat = 3
+
+
+def _block(i: int) -> str:
+    return (
+        f"line {i}: static text with some words\n"
+        f"{{{{ items[{i}].name + prefix * 2 }}}}\n"
+        "{% for x in xs %}{{ x }}, {% endfor %}\n"
+        "{# a comment #}\n"
+    )
+
+
+_cases: dict[str, Callable[[int], str]] = {
+    "blocks": lambda n: "".join(_block(i) for i in range(n)),
+    "comment": lambda n: "{# " + "x" * (1000 * n) + " #}",
+    "string literal": lambda n: "{{ '" + "x" * (1000 * n) + "' }}",
+}
+
+
+def _parse_time(source: str) -> float:
+    parse = template(TemplateSyntaxConfig())
+
+    def run():
+        assert parse(ParseContext(source, diagnostics=False)).is_success
+
+    return min(timeit.repeat(run, number=1, repeat=_repeat))
+
+
+def main() -> None:
+    sizes = (10, 40, 160)
+    print(f"Parse time by size, best of {_repeat}")
+    for name, source in _cases.items():
+        times = [_parse_time(source(size)) for size in sizes]
+        ratios = "  ".join(f"{t / times[0]:6.1f}x" for t in times[1:])
+        print(
+            f"{name:16} {'  '.join(f'{t * 1e3:9.2f} ms' for t in times)}  ratios {ratios}"
+        )
+
+
+if __name__ == "__main__":
+    main()
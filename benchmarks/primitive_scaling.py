@@ -0,0 +1,52 @@
+"""Measures how the time to parse identifiers, whitespace and digits grows with their length.
+
+Run with `python benchmarks/primitive_scaling.py`. Linear growth yields ratios of about the length factor, quadratic
+growth about its square.
+"""
+
+import timeit
+
+from pyforma._parser import (
+    ParseContext,
+    Parser,
+    bindigits,
+    digits,
+    hexdigits,
+    identifier,
+    octdigits,
+    whitespace,
+)
+
+_repeat = 3
+
+_cases: dict[str, tuple[Parser[str], str]] = {
+    "identifier": (identifier, "a_b1"),
+    "whitespace": (whitespace, " \t\n "),
+    "digits": (digits, "1234"),
+    "hexdigits": (hexdigits, "9abF"),
+    "octdigits": (octdigits, "0127"),
+    "bindigits": (bindigits, "0110"),
+}
+
+
+def _munch_time(parser: Parser[str], source: str) -> float:
+    def run():
+        result = parser(ParseContext(source))
+        assert result.success.result == source
+
+    return min(timeit.repeat(run, number=10, repeat=_repeat)) / 10
+
+
+def main() -> None:
+    lengths = (500, 4000, 32000)
+    print(f"Parse time by number of repetitions, best of {_repeat}")
+    for name, (parser, unit) in _cases.items():
+        times = [_munch_time(parser, unit * length) for length in lengths]
+        ratios = "  ".join(f"{t / times[0]:6.1f}x" for t in times[1:])
+        print(
+            f"{name:12} {'  '.join(f'{t * 1e6:9.1f} µs' for t in times)}  ratios {ratios}"
+        )
+
+
+if __name__ == "__main__":
+    main()
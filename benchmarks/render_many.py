@@ -0,0 +1,97 @@
+"""Compares batch rendering with render_many() to a loop of render() calls.
+
+Run with `python benchmarks/render_many.py [count]`.
+"""
+
+import sys
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, final
+
+from pyforma import DefaultTemplateContext, Template
+
+_repeat = 5
+
+_source = """\
+Dear {{ recipient.name }},
+
+{% if recipient.orders %}\
+your recent orders:
+{% for order in recipient.orders %}\
+- {{ order.item }}: {{ order.quantity }} x {{ order.price }} = {{ order.quantity * order.price }}
+{% endfor %}\
+Total: {{ total }}
+{% else %}\
+you haven't ordered anything yet.
+{% endif %}
+Kind regards,
+{{ sender }}
+"""
+
+
+@final
+@dataclass(frozen=True)
+class _Order:
+    item: str
+    quantity: int
+    price: float
+
+
+@final
+@dataclass(frozen=True)
+class _Recipient:
+    name: str
+    orders: list[_Order]
+
+
+def _variables(count: int) -> list[dict[str, Any]]:
+    variables: list[dict[str, Any]] = []
+    for n in range(count):
+        orders = [_Order(f"Item {i}", i + 1, 1.5 * i) for i in range(n % 4)]
+        recipient = _Recipient(f"Recipient {n}", orders)
+        total = sum(o.quantity * o.price for o in recipient.orders)
+        variables.append({"recipient": recipient, "total": total})
+    return variables
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    variables = _variables(count)
+    context = DefaultTemplateContext(default_variables={"sender": "The shop"})
+
+    def cases(template: Template) -> dict[str, Callable[[], object]]:
+        return {
+            "Template.render() loop": lambda: [
+                template.render(v | {"sender": "The shop"}) for v in variables
+            ],
+            "Template.render_many()": lambda: list(
+                template.render_many(v | {"sender": "The shop"} for v in variables)
+            ),
+            "Template.render_many(executor='process')": lambda: list(
+                template.render_many(
+                    (v | {"sender": "The shop"} for v in variables), executor="process"
+                )
+            ),
+            "TemplateContext.render() loop": lambda: [
+                context.render(template, variables=v) for v in variables
+            ],
+            "TemplateContext.render_many()": lambda: list(
+                context.render_many(template, variables=variables)
+            ),
+        }
+
+    print(f"{count} renders per batch, best of {_repeat} batches")
+    for name in cases(Template(_source)):
+        seconds = min(
+            # A fresh template per batch, so that no batch profits from the compilation of an earlier one
+            timeit.timeit(cases(Template(_source))[name], number=1)
+            for _ in range(_repeat)
+        )
+        print(
+            f"{name:42} {seconds * 1e3:9.1f} ms  {seconds / count * 1e6:7.2f} µs/render"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,11 @@ from ._template_context import TemplateContext as TemplateContext
 from ._template_context import DefaultTemplateContext as DefaultTemplateContext
 from ._parser import TemplateSyntaxConfig as TemplateSyntaxConfig
 from ._parser import BlockSyntaxConfig as BlockSyntaxConfig
+from ._parser import ParseStatistics as ParseStatistics
+from ._parse_cache import ParseCache as ParseCache
+from ._parse_cache import ParseCacheStatistics as ParseCacheStatistics
+from ._template_cache import TemplateCache as TemplateCache
+from ._template_cache import TemplateCacheStatistics as TemplateCacheStatistics
+from ._tiering import TieringPolicy as TieringPolicy
+from ._tiering import ExecutionStatistics as ExecutionStatistics
+from ._tiering import ExecutionTier as ExecutionTier
@@ -0,0 +1,235 @@
+import asyncio
+import inspect
+from collections.abc import Awaitable, Callable, Sequence
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Any, final
+
+from pyforma._util import destructure_value
+
+from .expressions import (
+    AttributeExpression,
+    BinOpExpression,
+    CallExpression,
+    DictExpression,
+    Expression,
+    ForExpression,
+    IfExpression,
+    IndexExpression,
+    ListExpression,
+    TemplateExpression,
+    UnOpExpression,
+    WithExpression,
+)
+from .expressions.template_expression import render
+from .origin import Origin
+from .source_text import SourceText
+
+
+@final
+class _AsyncEvaluator:
+    """Evaluates an expression tree, awaiting the awaitable results of calls and attributes.
+
+    Sibling expressions are evaluated concurrently, as are the iterations of for-expressions. Subtrees without calls
+    and attributes cannot produce awaitables, so they are evaluated synchronously, as are the bodies of lambdas.
+    """
+
+    def __init__(
+        self,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+        max_concurrency: int | None,
+    ):
+        self._renderers = renderers
+        self._limit: AbstractAsyncContextManager[Any] = (
+            nullcontext()
+            if max_concurrency is None
+            else asyncio.Semaphore(max_concurrency)
+        )
+        self._may_await: dict[int, bool] = {}  # id(expression) -> whether it may await
+
+    def may_await(self, e: Expression) -> bool:
+        """Checks whether evaluating an expression may produce an awaitable"""
+        key = id(e)
+        if key not in self._may_await:
+            match e:
+                case CallExpression() | AttributeExpression():
+                    result = True
+                case UnOpExpression():
+                    result = self.may_await(e.operand)
+                case BinOpExpression():
+                    result = self.may_await(e.lhs) or self.may_await(e.rhs)
+                case IndexExpression():
+                    result = self.may_await(e.expression) or self.may_await(e.index)
+                case ListExpression():
+                    result = any(self.may_await(element) for element in e.elements)
+                case DictExpression():
+                    result = any(
+                        self.may_await(k) or self.may_await(v) for k, v in e.elements
+                    )
+                case IfExpression():
+                    result = any(
+                        self.may_await(condition) or self.may_await(expr)
+                        for condition, expr in e.cases
+                    )
+                case ForExpression():
+                    result = self.may_await(e.iter_expr) or self.may_await(e.expr)
+                case WithExpression():
+                    result = self.may_await(e.expr) or any(
+                        self.may_await(binding) for _, binding in e.bindings
+                    )
+                case TemplateExpression():
+                    result = any(self.may_await(content) for content in e.content)
+                case _:  # Values, identifiers and lambdas
+                    result = False
+            self._may_await[key] = result
+        return self._may_await[key]
+
+    async def evaluate(self, e: Expression, variables: dict[str, Any]) -> Any:
+        """Evaluates an expression like Expression.evaluate, awaiting awaitable results"""
+        if not self.may_await(e):
+            return e.evaluate(variables, renderers=self._renderers)
+
+        match e:
+            case CallExpression():
+                callee, args, kwargs = await self._gather(
+                    self.evaluate(e.callee, variables),
+                    self._gather(*(self.evaluate(a, variables) for a in e.arguments)),
+                    self._gather(
+                        *(self.evaluate(a, variables) for _, a in e.kw_arguments)
+                    ),
+                )
+                kwargs = {iden: arg for (iden, _), arg in zip(e.kw_arguments, kwargs)}
+                value = e.apply(callee, tuple(args), kwargs)
+                return await self._resolve(
+                    value, lambda: e.error(callee, tuple(args), kwargs)
+                )
+            case AttributeExpression():
+                obj = await self.evaluate(e.object, variables)
+                value = e.apply(obj)
+                return await self._resolve(value, lambda: e.error(obj))
+            case UnOpExpression():
+                operand = await self.evaluate(e.operand, variables)
+                return e.apply(operand)
+            case BinOpExpression():
+                lhs, rhs = await self._gather(
+                    self.evaluate(e.lhs, variables), self.evaluate(e.rhs, variables)
+                )
+                return e.apply(lhs, rhs)
+            case IndexExpression():
+                expression, index = await self._gather(
+                    self.evaluate(e.expression, variables),
+                    self.evaluate(e.index, variables),
+                )
+                return e.apply(expression, index)
+            case ListExpression():
+                return await self._gather(
+                    *(self.evaluate(element, variables) for element in e.elements)
+                )
+            case DictExpression():
+                keys, values = await self._gather(
+                    self._gather(*(self.evaluate(k, variables) for k, _ in e.elements)),
+                    self._gather(*(self.evaluate(v, variables) for _, v in e.elements)),
+                )
+                return dict(zip(keys, values))
+            case IfExpression() | WithExpression():
+                value, _ = await self.evaluate_with_origin(e, variables)
+                return value
+            case ForExpression():
+                iterable = await self.evaluate(e.iter_expr, variables)
+                scopes = [
+                    variables | destructure_value(e.var_names, value)
+                    for value in iterable
+                ]
+                return await self._gather(
+                    *(self.evaluate(e.expr, scope) for scope in scopes)
+                )
+            case TemplateExpression():
+                return await self._template(e, variables)
+            case _:  # pragma: no cover # should never happen
+                raise AssertionError(f"{e.origin}: Unexpected expression {e}")
+
+    async def evaluate_with_origin(
+        self, e: Expression, variables: dict[str, Any]
+    ) -> tuple[Any, Origin]:
+        """Evaluates an expression like Expression.evaluate_with_origin, awaiting awaitable results"""
+        if not self.may_await(e):
+            return e.evaluate_with_origin(variables, renderers=self._renderers)
+
+        match e:
+            case IfExpression():
+                for condition, expr in e.cases:
+                    if await self.evaluate(condition, variables):
+                        return await self.evaluate_with_origin(expr, variables)
+                return None, e.origin
+            case WithExpression():
+                values = await self._gather(
+                    *(self.evaluate(binding, variables) for _, binding in e.bindings)
+                )
+                scope = variables.copy()
+                for (names, _), value in zip(e.bindings, values):
+                    scope.update(destructure_value(names, value))
+                return await self.evaluate_with_origin(e.expr, scope)
+            case _:
+                return await self.evaluate(e, variables), e.origin
+
+    async def _template(self, e: TemplateExpression, variables: dict[str, Any]) -> str:
+        parts = await self._gather(
+            *(self._template_part(content, variables) for content in e.content)
+        )
+        return e.join_parts(parts)
+
+    async def _template_part(
+        self, e: Expression, variables: dict[str, Any]
+    ) -> str | SourceText | Expression:
+        """Evaluates and renders a part of a template, so that rendering errors are raised in the order of the parts"""
+        value, origin = await self.evaluate_with_origin(e, variables)
+        match value:
+            case str() | SourceText() | Expression():
+                return value
+            case _:
+                return render(value, origin, self._renderers)
+
+    async def _resolve(self, value: Any, error: Callable[[], Exception]) -> Any:
+        """Awaits a value if it is awaitable, raising the given error if that fails"""
+        if not inspect.isawaitable(value):
+            return value
+        try:
+            async with self._limit:
+                return await value
+        except Exception as ex:
+            raise error() from ex
+
+    async def _gather(self, *awaitables: Awaitable[Any]) -> list[Any]:
+        """Awaits several awaitables concurrently. If some fail, the error of the first of them is raised."""
+        if len(awaitables) <= 1:
+            return [await a for a in awaitables]
+        results = await asyncio.gather(*awaitables, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+
+async def evaluate_async(
+    expression: Expression,
+    variables: dict[str, Any],
+    renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    max_concurrency: int | None,
+) -> Any:
+    """Evaluates an expression tree, awaiting the awaitable results of calls and attributes.
+
+    Independent expressions, such as the elements of a list or the contents of a template, are evaluated concurrently.
+    Identifiers are looked up when they are evaluated, so identifiers in branches that aren't taken don't need to be
+    bound by the variables. Evaluating an unbound identifier raises a ValueError.
+
+    Args:
+        expression: The expression to evaluate
+        variables: The variables to substitute
+        renderers: Renderers to use for rendering values into templates
+        max_concurrency: Maximum number of awaitables awaited at the same time, or None for no limit
+
+    Returns:
+        The value of the expression
+    """
+    return await _AsyncEvaluator(renderers, max_concurrency).evaluate(
+        expression, variables
+    )
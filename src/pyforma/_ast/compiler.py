@@ -0,0 +1,364 @@
+import keyword
+from collections.abc import Callable, Sequence
+from typing import Any, final
+
+from pyforma._util import destructure_value
+
+from .expressions import (
+    AttributeExpression,
+    BinOpExpression,
+    CallExpression,
+    DictExpression,
+    Expression,
+    ForExpression,
+    IdentifierExpression,
+    IfExpression,
+    IndexExpression,
+    ListExpression,
+    TemplateExpression,
+    UnOpExpression,
+    ValueExpression,
+    WithExpression,
+)
+from .origin import Origin
+from .renderers import RendererRegistry
+from .source_text import SourceText
+
+
+def _render_value(
+    value: Any, origin: Origin, renderers: RendererRegistry
+) -> str | SourceText | Expression:
+    """Renders a value that isn't exactly a str, like TemplateExpression.evaluate does.
+
+    Mapped text and expressions are returned as they are, to be joined by TemplateExpression.join_parts().
+    """
+    if isinstance(value, str | SourceText | Expression):
+        return value
+    return renderers.render(value, origin)
+
+
+@final
+class _FunctionBuilder:
+    """Generates a Python function that evaluates an expression tree.
+
+    Every expression is compiled to statements that store its value in a local variable. Identifiers bound by
+    expressions are given fresh local variables, free identifiers are read from the variables once, at the start of
+    the function. Expressions without dedicated code generation are evaluated by the interpreter.
+    """
+
+    def __init__(self, renderers: Sequence[tuple[type, Callable[[Any], str]]]):
+        registry = (
+            renderers
+            if isinstance(renderers, RendererRegistry)
+            else RendererRegistry(renderers)
+        )
+        self.namespace: dict[str, Any] = {
+            "_renderers": registry,
+            # Types whose values are rendered by str, so that they are rendered without calling into Python code
+            "_str_types": frozenset(
+                t for t in (int, float) if registry.renderer(t) is str
+            ),
+            "_render_value": _render_value,
+            "_destructure_value": destructure_value,
+        }
+        self._lines: list[str] = []
+        self._indent = 1
+        self._locals = 0
+        self._free: dict[str, str] = {}  # Free identifier -> local variable
+
+    def build(self, root: Expression) -> str:
+        """Generates the function source. The function is called "evaluate" and takes the variables."""
+        result = self._expression(root, {})
+        prologue = [
+            f"    {name} = variables[{iden!r}]" for iden, name in self._free.items()
+        ]
+        lines = [
+            f"# Generated from expression at {root.origin}",
+            "def evaluate(variables):",
+            *prologue,
+            *self._lines,
+            f"    return {result}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _emit(self, line: str) -> None:
+        self._lines.append("    " * self._indent + line)
+
+    def _local(self) -> str:
+        self._locals += 1
+        return f"_l{self._locals}"
+
+    def _constant(self, value: Any) -> str:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def _guarded(
+        self, node: Expression, target: str, value: str, operands: str
+    ) -> None:
+        """Emits code that stores a value in target, raising the error of node if its computation fails"""
+        self._emit("try:")
+        self._emit(f"    {target} = {value}")
+        self._emit("except Exception as ex:")
+        self._emit(f"    raise {self._constant(node)}.error({operands}) from ex")
+
+    def _expression(self, e: Expression, scope: dict[str, str]) -> str:
+        """Emits code that evaluates e, and returns the local variable or constant holding its value"""
+        match e:
+            case ValueExpression():
+                return self._constant(e.value)
+            case IdentifierExpression():
+                if e.identifier in scope:
+                    return scope[e.identifier]
+                return self._free.setdefault(e.identifier, f"_f{len(self._free)}")
+            case UnOpExpression():
+                operand = self._expression(e.operand, scope)
+                result = self._local()
+                op = "not " if e.op == "not" else e.op
+                self._guarded(e, result, f"{op}{operand}", operand)
+                return result
+            case BinOpExpression():
+                lhs = self._expression(e.lhs, scope)
+                rhs = self._expression(e.rhs, scope)
+                result = self._local()
+                self._guarded(e, result, f"{lhs} {e.op} {rhs}", f"{lhs}, {rhs}")
+                return result
+            case IndexExpression():
+                expression = self._expression(e.expression, scope)
+                index = self._expression(e.index, scope)
+                result = self._local()
+                self._guarded(
+                    e, result, f"{expression}[{index}]", f"{expression}, {index}"
+                )
+                return result
+            case AttributeExpression():
+                obj = self._expression(e.object, scope)
+                result = self._local()
+                if e.attribute.isidentifier() and not keyword.iskeyword(e.attribute):
+                    value = f"{obj}.{e.attribute}"
+                else:
+                    value = f"getattr({obj}, {e.attribute!r})"
+                self._guarded(e, result, value, obj)
+                return result
+            case CallExpression():
+                return self._call(e, scope)
+            case ListExpression():
+                elements = [self._expression(element, scope) for element in e.elements]
+                result = self._local()
+                self._emit(f"{result} = [{', '.join(elements)}]")
+                return result
+            case DictExpression():
+                elements = [
+                    f"{self._expression(k, scope)}: {self._expression(v, scope)}"
+                    for k, v in e.elements
+                ]
+                result = self._local()
+                self._emit(f"{result} = {{{', '.join(elements)}}}")
+                return result
+            case IfExpression():
+                return self._if(e, scope)
+            case ForExpression():
+                return self._for(e, scope)
+            case WithExpression():
+                return self._with(e, scope)
+            case TemplateExpression():
+                return self._template(e, scope)
+            case _:
+                return self._interpreted(e, scope)
+
+    def _call(self, e: CallExpression, scope: dict[str, str]) -> str:
+        callee = self._expression(e.callee, scope)
+        args = [self._expression(arg, scope) for arg in e.arguments]
+        kwargs = [(iden, self._expression(arg, scope)) for iden, arg in e.kw_arguments]
+
+        args_tuple = "".join(f"{arg}, " for arg in args)
+        kwargs_dict = ", ".join(f"{iden!r}: {arg}" for iden, arg in kwargs)
+        if all(
+            iden.isidentifier() and not keyword.iskeyword(iden) for iden, _ in kwargs
+        ) and len({iden for iden, _ in kwargs}) == len(kwargs):
+            arguments = [*args, *(f"{iden}={arg}" for iden, arg in kwargs)]
+        else:  # Not expressible as keyword arguments
+            arguments = [*args, f"**{{{kwargs_dict}}}"]
+
+        result = self._local()
+        self._guarded(
+            e,
+            result,
+            f"{callee}({', '.join(arguments)})",
+            f"{callee}, ({args_tuple}), {{{kwargs_dict}}}",
+        )
+        return result
+
+    def _if(
+        self, e: IfExpression, scope: dict[str, str], origin: str | None = None
+    ) -> str:
+        """Emits code that evaluates e, also storing the origin of its value in the local variable origin if given"""
+        result = self._local()
+        indent = self._indent
+        for condition, expr in e.cases:
+            if isinstance(condition, ValueExpression):
+                if not condition.value:
+                    continue  # Never taken
+                self._branch(expr, scope, result, origin)
+                break
+            value = self._expression(condition, scope)
+            self._emit(f"if {value}:")
+            self._indent += 1
+            self._branch(expr, scope, result, origin)
+            self._indent -= 1
+            self._emit("else:")
+            self._indent += 1
+        else:
+            self._emit(f"{result} = None")
+            if origin is not None:
+                self._emit(f"{origin} = {self._constant(e.origin)}")
+        self._indent = indent
+        return result
+
+    def _branch(
+        self, expr: Expression, scope: dict[str, str], result: str, origin: str | None
+    ) -> None:
+        if origin is None:
+            self._emit(f"{result} = {self._expression(expr, scope)}")
+            return
+        value, value_origin = self._value_with_origin(expr, scope)
+        self._emit(f"{result} = {value}")
+        self._emit(f"{origin} = {value_origin}")
+
+    def _value_with_origin(
+        self, e: Expression, scope: dict[str, str]
+    ) -> tuple[str, str]:
+        """Emits code that evaluates e, and returns the names holding its value and the origin of that value.
+
+        The origin is the one evaluate_with_origin() provides.
+        """
+        match e:
+            case IfExpression():
+                origin = self._local()
+                return self._if(e, scope, origin), origin
+            case WithExpression():
+                return self._value_with_origin(e.expr, self._with_scope(e, scope))
+            case _:
+                return self._expression(e, scope), self._constant(e.origin)
+
+    def _bind(
+        self, names: tuple[str, ...], value: str, scope: dict[str, str]
+    ) -> dict[str, str]:
+        """Emits code that destructures a value, and returns the scope with the names bound"""
+        if len(names) == 1:
+            return scope | {names[0]: value}
+
+        values = self._local()
+        self._emit(f"{values} = _destructure_value({names!r}, {value})")
+        scope = scope.copy()
+        for name in names:
+            scope[name] = self._local()
+            self._emit(f"{scope[name]} = {values}[{name!r}]")
+        return scope
+
+    def _for(self, e: ForExpression, scope: dict[str, str]) -> str:
+        iterable = self._expression(e.iter_expr, scope)
+        result = self._local()
+        value = self._local()
+        self._emit(f"{result} = []")
+        self._emit(f"for {value} in {iterable}:")
+        self._indent += 1
+        body_scope = self._bind(e.var_names, value, scope)
+        self._emit(f"{result}.append({self._expression(e.expr, body_scope)})")
+        self._indent -= 1
+        return result
+
+    def _with(self, e: WithExpression, scope: dict[str, str]) -> str:
+        return self._expression(e.expr, self._with_scope(e, scope))
+
+    def _with_scope(self, e: WithExpression, scope: dict[str, str]) -> dict[str, str]:
+        """Emits code that evaluates the bindings of e, and returns the scope of its body"""
+        body_scope = scope
+        for names, binding in e.bindings:
+            value = self._expression(binding, scope)  # Bindings don't see each other
+            body_scope = self._bind(names, value, body_scope)
+        return body_scope
+
+    def _template(self, e: TemplateExpression, scope: dict[str, str]) -> str:
+        texts: list[str] = [
+            content.value
+            for content in e.content
+            if isinstance(content, ValueExpression) and isinstance(content.value, str)
+        ]
+        if len(texts) == len(e.content):  # Static text only
+            return self._constant("".join(texts))
+
+        parts: list[str] = []  # One for every part of the content, for join_parts()
+        for content in e.content:
+            if isinstance(content, ValueExpression) and isinstance(
+                content.value, str | SourceText
+            ):  # Mapped text is kept as reference until rendered
+                parts.append(self._constant(content.value))
+                continue
+            value, origin = self._value_with_origin(content, scope)
+            part = self._local()
+            self._emit(
+                f"{part} = {value} if {value}.__class__ is str else str({value}) if {value}.__class__ in _str_types else _render_value({value}, {origin}, _renderers)"
+            )
+            parts.append(part)
+
+        result = self._local()
+        values = "".join(f"{part}, " for part in parts)
+        # Joined inline, as the parts are usually all text, and by join_parts() otherwise, which raises the errors
+        self._emit("try:")
+        self._emit(f"    {result} = ''.join(({values}))")
+        self._emit("except TypeError:")
+        self._emit(f"    {result} = {self._constant(e)}.join_parts(({values}))")
+        return result
+
+    def _interpreted(self, e: Expression, scope: dict[str, str]) -> str:
+        bound = ", ".join(f"{name!r}: {local}" for name, local in scope.items())
+        variables = f"variables | {{{bound}}}" if scope else "variables"
+        result = self._local()
+        self._emit(
+            f"{result} = {self._constant(e)}.evaluate({variables}, renderers=_renderers)"
+        )
+        return result
+
+
+def generate_source(
+    expression: Expression,
+    renderers: Sequence[tuple[type, Callable[[Any], str]]],
+) -> tuple[str, dict[str, Any]]:
+    """Generates the source code of a Python function that evaluates an expression tree.
+
+    Args:
+        expression: The expression to compile
+        renderers: Renderers to use for rendering values into templates
+
+    Returns:
+        The function source and the namespace it must be executed in. The namespace holds the constants and
+        expressions the function refers to.
+    """
+    builder = _FunctionBuilder(renderers)
+    source = builder.build(expression)
+    return source, builder.namespace
+
+
+def compile_expression(
+    expression: Expression,
+    renderers: Sequence[tuple[type, Callable[[Any], str]]],
+) -> Callable[[dict[str, Any]], Any] | None:
+    """Compiles an expression tree into a Python function.
+
+    The function takes the variables and returns the same value as evaluating the expression, or raises the same
+    error. All identifiers that the expression leaves unresolved must be bound by the variables.
+
+    Args:
+        expression: The expression to compile
+        renderers: Renderers to use for rendering values into templates
+
+    Returns:
+        The compiled function, or None if the expression is nested too deeply to be compiled
+    """
+    try:
+        source, namespace = generate_source(expression, renderers)
+        exec(compile(source, f"<compiled {expression.origin}>", "exec"), namespace)
+    except (RecursionError, SyntaxError):
+        return None
+    return namespace["evaluate"]
@@ -0,0 +1,270 @@
+import sys
+from typing import Any
+
+from pyforma._util import join
+
+from .expressions import (
+    AttributeExpression,
+    BinOpExpression,
+    CallExpression,
+    DictExpression,
+    Expression,
+    ForExpression,
+    IdentifierExpression,
+    IfExpression,
+    IndexExpression,
+    LambdaExpression,
+    ListExpression,
+    TemplateExpression,
+    UnOpExpression,
+    ValueExpression,
+    WithExpression,
+)
+from .renderers import RendererRegistry
+
+# Functions that parsed templates call, all of which return the same result for the same arguments without side effects
+_pure_functions = (join, slice)
+
+# Folding must not depend on the renderers of a render, so values other than str are never rendered while folding
+_no_renderers = RendererRegistry()
+
+_immutable_types = (type(None), bool, int, float, complex, str, bytes)
+
+# Maximum size of folded values in bytes, or characters of text, so that folding doesn't store large values with the
+# template or spend time on computing them
+_max_folded_size = 4096
+
+
+def _is_immutable(value: Any) -> bool:
+    """Checks whether a value cannot be changed, so that it can be shared by all renders"""
+    if type(value) in _immutable_types:
+        return True
+    if type(value) in (tuple, frozenset):
+        return all(_is_immutable(element) for element in value)
+    if type(value) is slice:
+        return all(_is_immutable(v) for v in (value.start, value.stop, value.step))
+    return False
+
+
+def _is_value(e: Expression) -> bool:
+    return isinstance(e, ValueExpression) and _is_immutable(e.value)
+
+
+def _is_bounded(e: BinOpExpression) -> bool:
+    """Checks whether the value of a binary operation is small enough to fold it.
+
+    Repeating sequences, powers and shifts can produce values that are much larger than the template, which would be
+    computed while parsing even if they are never rendered. Formatting text can pad it to any width. These operations
+    are only folded if their operands are values, and their result is known to be small.
+    """
+    if e.op not in ("*", "**", "<<", "%"):
+        return True
+    if not (isinstance(e.lhs, ValueExpression) and isinstance(e.rhs, ValueExpression)):
+        return False
+    lhs, rhs = e.lhs.value, e.rhs.value
+    max_bits = 8 * _max_folded_size
+    match e.op, lhs, rhs:
+        case "*", str() | bytes() | tuple(), int():
+            return len(lhs) * rhs <= _max_folded_size  # pyright: ignore[reportUnknownArgumentType]
+        case "*", int(), str() | bytes() | tuple():
+            return lhs * len(rhs) <= _max_folded_size  # pyright: ignore[reportUnknownArgumentType]
+        case "**", int(), int():
+            return rhs < 0 or abs(lhs).bit_length() * rhs <= max_bits
+        case "<<", int(), int():
+            return rhs < 0 or lhs.bit_length() + rhs <= max_bits
+        case "%", str() | bytes(), _:
+            return False
+        case _:
+            return True
+
+
+def _is_small(value: Any) -> bool:
+    """Checks whether a folded value is small enough to be stored in the parsed template"""
+    if type(value) in (str, bytes, tuple, frozenset):
+        return len(value) <= _max_folded_size
+    return sys.getsizeof(value) <= _max_folded_size
+
+
+def _unchanged(folded: tuple[Any, ...], original: tuple[Any, ...]) -> bool:
+    """Checks whether folding kept all parts of an expression, which then doesn't need to be created again"""
+    return len(folded) == len(original) and all(
+        f is o for f, o in zip(folded, original)
+    )
+
+
+def _fold(e: Expression) -> tuple[Expression, bool]:
+    """Folds the constant sub-expressions of an expression.
+
+    Returns:
+        The folded expression, and whether it can be folded as part of its parent: evaluating it is free of side
+        effects, only depends on the values of its identifiers, and doesn't produce values that are too large
+    """
+    match e:
+        case ValueExpression():
+            return e, _is_immutable(e.value) or any(
+                e.value is f for f in _pure_functions
+            )
+        case IdentifierExpression():
+            return e, True
+        case UnOpExpression():
+            operand, pure = _fold(e.operand)
+            if operand is not e.operand:
+                e = UnOpExpression(origin=e.origin, op=e.op, operand=operand)
+        case BinOpExpression():
+            (lhs, lhs_pure), (rhs, rhs_pure) = _fold(e.lhs), _fold(e.rhs)
+            if lhs is not e.lhs or rhs is not e.rhs:
+                e = BinOpExpression(origin=e.origin, op=e.op, lhs=lhs, rhs=rhs)
+            pure = lhs_pure and rhs_pure and _is_bounded(e)
+        case IndexExpression():
+            (expression, expression_pure), (index, index_pure) = (
+                _fold(e.expression),
+                _fold(e.index),
+            )
+            if expression is not e.expression or index is not e.index:
+                e = IndexExpression(origin=e.origin, expression=expression, index=index)
+            pure = expression_pure and index_pure
+        case CallExpression():
+            callee, callee_pure = _fold(e.callee)
+            arguments = [_fold(arg) for arg in e.arguments]
+            kw_arguments = [(iden, _fold(arg)) for iden, arg in e.kw_arguments]
+            e = CallExpression(
+                origin=e.origin,
+                callee=callee,
+                arguments=tuple(arg for arg, _ in arguments),
+                kw_arguments=tuple((iden, arg) for iden, (arg, _) in kw_arguments),
+            )
+            pure = (
+                callee_pure
+                and isinstance(callee, ValueExpression)
+                and all(pure for _, pure in arguments)
+                and all(pure for _, (_, pure) in kw_arguments)
+            )
+        case AttributeExpression():  # Attributes may be properties with side effects
+            obj, _ = _fold(e.object)
+            if obj is not e.object:
+                e = AttributeExpression(
+                    origin=e.origin, object=obj, attribute=e.attribute
+                )
+            return e, False
+        case ListExpression():
+            elements = [_fold(element) for element in e.elements]
+            e = ListExpression(
+                origin=e.origin, elements=tuple(element for element, _ in elements)
+            )
+            pure = all(pure for _, pure in elements)
+        case DictExpression():
+            items = [(_fold(k), _fold(v)) for k, v in e.elements]
+            e = DictExpression(
+                origin=e.origin, elements=tuple((k, v) for (k, _), (v, _) in items)
+            )
+            pure = all(k_pure and v_pure for (_, k_pure), (_, v_pure) in items)
+        case LambdaExpression():  # Functions are neither immutable nor known to be pure
+            return_value, _ = _fold(e.return_value)
+            if return_value is not e.return_value:
+                e = LambdaExpression(
+                    origin=e.origin, parameters=e.parameters, return_value=return_value
+                )
+            return e, False
+        case IfExpression():
+            cases = [(_fold(condition), _fold(expr)) for condition, expr in e.cases]
+            folded_cases = tuple((c, x) for (c, _), (x, _) in cases)
+            if not _unchanged(sum(folded_cases, ()), sum(e.cases, ())):
+                e = IfExpression(origin=e.origin, cases=folded_cases)
+            pure = all(c_pure and x_pure for (_, c_pure), (_, x_pure) in cases)
+        case ForExpression():
+            (iter_expr, iter_pure), (expr, expr_pure) = (
+                _fold(e.iter_expr),
+                _fold(e.expr),
+            )
+            if (
+                isinstance(iter_expr, ListExpression)
+                and all(_is_value(element) for element in iter_expr.elements)
+            ):  # The list is only iterated, so it can be replaced by a tuple that all renders share
+                iter_expr = ValueExpression(
+                    origin=iter_expr.origin,
+                    value=tuple(
+                        element.value
+                        for element in iter_expr.elements
+                        if isinstance(element, ValueExpression)
+                    ),
+                )
+            if iter_expr is not e.iter_expr or expr is not e.expr:
+                e = ForExpression(
+                    origin=e.origin,
+                    var_names=e.var_names,
+                    iter_expr=iter_expr,
+                    expr=expr,
+                )
+            pure = iter_pure and expr_pure
+        case WithExpression():
+            bindings = [(names, _fold(binding)) for names, binding in e.bindings]
+            expr, pure = _fold(e.expr)
+            e = WithExpression(
+                origin=e.origin,
+                bindings=tuple((names, binding) for names, (binding, _) in bindings),
+                expr=expr,
+            )
+            pure = pure and all(pure for _, (_, pure) in bindings)
+        case TemplateExpression():
+            content = [_fold(c) for c in e.content]
+            folded_content = _merge_text([c for c, _ in content])
+            if not _unchanged(folded_content, e.content):
+                e = TemplateExpression(origin=e.origin, content=folded_content)
+            pure = all(pure for _, pure in content)
+        case _:  # Unknown expressions are kept as they are
+            return e, False
+
+    if pure and not e.unresolved_identifiers():
+        try:
+            # Simplified like by Template.substitute(), which keeps the origins of the values
+            folded = e.simplify({}, renderers=_no_renderers)
+        except Exception:  # Raised again by every render, with the same message
+            pass
+        else:
+            if isinstance(folded, ValueExpression) and _is_immutable(folded.value):
+                if _is_small(folded.value):
+                    return folded, True
+                return (
+                    e,
+                    False,
+                )  # Evaluated by every render instead, and not again by its parents
+    return e, pure
+
+
+def _merge_text(content: list[Expression]) -> tuple[Expression, ...]:
+    """Joins adjacent text in the content of a template"""
+    merged: list[Expression] = []
+    for e in content:
+        if (
+            merged
+            and isinstance(e, ValueExpression)
+            and type(e.value) is str
+            and isinstance(previous := merged[-1], ValueExpression)
+            and type(previous.value) is str
+        ):
+            merged[-1] = ValueExpression(
+                origin=previous.origin, value=previous.value + e.value
+            )
+        else:
+            merged.append(e)
+    return tuple(merged)
+
+
+def fold_constants(template: TemplateExpression) -> TemplateExpression:
+    """Folds the constant sub-expressions of a parsed template.
+
+    Sub-expressions without unresolved identifiers, whose evaluation has no side effects, are evaluated once and
+    replaced by their values, so that renders don't evaluate them again. Only immutable values are folded, as all
+    renders share them: list and dict literals are kept, but lists that are only iterated are replaced by tuples.
+    Expressions whose values would have to be rendered, which depends on the renderers of the render, and expressions
+    that raise errors are kept as well, and so are values larger than _max_folded_size and operations that could
+    produce them from small operands, see _is_bounded(). Adjacent text is joined. Mapped text is never decoded.
+
+    Args:
+        template: The template to fold
+
+    Returns:
+        The folded template
+    """
+    content = _merge_text([_fold(e)[0] for e in template.content])
+    return TemplateExpression(origin=template.origin, content=content)
@@ -15,9 +15,13 @@ class AttributeExpression(ExpressionImpl):
     attribute: str
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
         return self.object.unresolved_identifiers()
 
+    @override
+    def _is_simplified(self) -> bool:
+        return self.object._simplified and not isinstance(self.object, ValueExpression)
+
     @override
     def simplify(
         self,
@@ -25,23 +29,38 @@ class AttributeExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         object = self.object.simplify(variables, renderers=renderers)
-        attribute = self.attribute
 
         if isinstance(object, ValueExpression):
-            try:
-                return ValueExpression(
-                    origin=self.origin,
-                    value=getattr(object.value, attribute),
-                )
-
-            except Exception as ex:
-                raise TypeError(
-                    f"{self.origin}: Invalid attribute expression for value {object.value} of type {type(object.value)} and attribute {attribute}"
-                ) from ex
+            return ValueExpression(origin=self.origin, value=self.apply(object.value))
 
         return AttributeExpression(
             origin=self.origin,
             object=object,
-            attribute=attribute,
+            attribute=self.attribute,
+        )
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        return self.apply(self.object.evaluate(variables, renderers=renderers))
+
+    def apply(self, object: Any) -> Any:
+        """Applies the operation to evaluated operands, raising the error of this expression if it fails"""
+        try:
+            return getattr(object, self.attribute)
+        except Exception as ex:
+            raise self.error(object) from ex
+
+    def error(self, object: Any) -> TypeError:
+        """Creates the error raised if the operation fails for the given operands"""
+        return TypeError(
+            f"{self.origin}: Invalid attribute expression for value {object} of type {type(object)} and attribute {self.attribute}"
         )
@@ -1,3 +1,4 @@
+import operator
 from collections.abc import Sequence, Callable
 from dataclasses import dataclass
 from typing import Literal, override, Any
@@ -7,6 +8,33 @@ from .expression_impl import ExpressionImpl
 from .value_expression import ValueExpression
 
 
+_operators: dict[str, Callable[[Any, Any], Any]] = {
+    "**": operator.pow,
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "@": operator.matmul,
+    "|": operator.or_,
+    "&": operator.and_,
+    "^": operator.xor,
+    "<<": operator.lshift,
+    ">>": operator.rshift,
+    "in": lambda lhs, rhs: lhs in rhs,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<=": operator.le,
+    "<": operator.lt,
+    ">=": operator.ge,
+    ">": operator.gt,
+    "not in": lambda lhs, rhs: lhs not in rhs,
+    "and": lambda lhs, rhs: lhs and rhs,
+    "or": lambda lhs, rhs: lhs or rhs,
+}
+
+
 @dataclass(frozen=True, kw_only=True)
 class BinOpExpression(ExpressionImpl):
     """Binary operator expression"""
@@ -42,9 +70,20 @@ class BinOpExpression(ExpressionImpl):
     rhs: Expression
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
         return self.lhs.unresolved_identifiers() | self.rhs.unresolved_identifiers()
 
+    @override
+    def _is_simplified(self) -> bool:
+        return (
+            self.lhs._simplified
+            and self.rhs._simplified
+            and not (
+                isinstance(self.lhs, ValueExpression)
+                and isinstance(self.rhs, ValueExpression)
+            )
+        )
+
     @override
     def simplify(
         self,
@@ -52,106 +91,37 @@ class BinOpExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         lhs = self.lhs.simplify(variables, renderers=renderers)
         rhs = self.rhs.simplify(variables, renderers=renderers)
         if isinstance(lhs, ValueExpression) and isinstance(rhs, ValueExpression):
-            try:
-                match self.op:
-                    case "**":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value**rhs.value
-                        )
-                    case "+":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value + rhs.value
-                        )
-                    case "-":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value - rhs.value
-                        )
-                    case "*":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value * rhs.value
-                        )
-                    case "/":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value / rhs.value
-                        )
-                    case "//":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value // rhs.value
-                        )
-                    case "%":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value % rhs.value
-                        )
-                    case "@":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value @ rhs.value
-                        )
-                    case "<<":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value << rhs.value
-                        )
-                    case ">>":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value >> rhs.value
-                        )
-                    case "&":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value & rhs.value
-                        )
-                    case "^":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value ^ rhs.value
-                        )
-                    case "|":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value | rhs.value
-                        )
-                    case "==":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value == rhs.value
-                        )
-                    case "!=":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value != rhs.value
-                        )
-                    case "<=":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value <= rhs.value
-                        )
-                    case "<":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value < rhs.value
-                        )
-                    case ">=":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value >= rhs.value
-                        )
-                    case ">":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value > rhs.value
-                        )
-                    case "in":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value in rhs.value
-                        )
-                    case "not in":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value not in rhs.value
-                        )
-                    case "and":
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value and rhs.value
-                        )
-                    case "or":  # pragma: no branch
-                        return ValueExpression(
-                            origin=self.origin, value=lhs.value or rhs.value
-                        )
-            except Exception as ex:
-                raise TypeError(
-                    f"{self.origin}: Invalid binary operator {self.op} for values {lhs.value} of type {type(lhs.value)} and {rhs.value} of type {type(rhs.value)}"
-                ) from ex
-        else:
-            return BinOpExpression(origin=self.origin, op=self.op, lhs=lhs, rhs=rhs)
+            return ValueExpression(
+                origin=self.origin, value=self.apply(lhs.value, rhs.value)
+            )
+        return BinOpExpression(origin=self.origin, op=self.op, lhs=lhs, rhs=rhs)
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        lhs = self.lhs.evaluate(variables, renderers=renderers)
+        rhs = self.rhs.evaluate(variables, renderers=renderers)
+        return self.apply(lhs, rhs)
+
+    def apply(self, lhs: Any, rhs: Any) -> Any:
+        """Applies the operation to evaluated operands, raising the error of this expression if it fails"""
+        try:
+            return _operators[self.op](lhs, rhs)
+        except Exception as ex:
+            raise self.error(lhs, rhs) from ex
+
+    def error(self, lhs: Any, rhs: Any) -> TypeError:
+        """Creates the error raised if the operation fails for the given operands"""
+        return TypeError(
+            f"{self.origin}: Invalid binary operator {self.op} for values {lhs} of type {type(lhs)} and {rhs} of type {type(rhs)}"
+        )
@@ -16,13 +16,24 @@ class CallExpression(ExpressionImpl):
     kw_arguments: tuple[tuple[str, Expression], ...]
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
         return (
             self.callee.unresolved_identifiers()
             .union(*[arg.unresolved_identifiers() for arg in self.arguments])
             .union(*[arg.unresolved_identifiers() for _, arg in self.kw_arguments])
         )
 
+    @override
+    def _is_simplified(self) -> bool:
+        operands = (
+            self.callee,
+            *self.arguments,
+            *(arg for _, arg in self.kw_arguments),
+        )
+        return all(e._simplified for e in operands) and not all(
+            isinstance(e, ValueExpression) for e in operands
+        )
+
     @override
     def simplify(
         self,
@@ -30,6 +41,9 @@ class CallExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         callee = self.callee.simplify(variables, renderers=renderers)
         arguments = tuple(
             arg.simplify(variables, renderers=renderers) for arg in self.arguments
@@ -48,15 +62,9 @@ class CallExpression(ExpressionImpl):
             kwargs = {
                 iden: cast(ValueExpression, arg).value for iden, arg in kw_arguments
             }
-            try:
-                return ValueExpression(
-                    origin=self.origin,
-                    value=callee.value(*args, **kwargs),
-                )
-            except Exception as ex:
-                raise TypeError(
-                    f"{self.origin}: Invalid call expression for callee {callee.value} of type {type(callee.value)} with args {args} and kwargs {kwargs}"
-                ) from ex
+            return ValueExpression(
+                origin=self.origin, value=self.apply(callee.value, args, kwargs)
+            )
 
         return CallExpression(
             origin=self.origin,
@@ -64,3 +72,35 @@ class CallExpression(ExpressionImpl):
             arguments=arguments,
             kw_arguments=kw_arguments,
         )
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        callee = self.callee.evaluate(variables, renderers=renderers)
+        args = tuple(
+            arg.evaluate(variables, renderers=renderers) for arg in self.arguments
+        )
+        kwargs = {
+            iden: arg.evaluate(variables, renderers=renderers)
+            for iden, arg in self.kw_arguments
+        }
+        return self.apply(callee, args, kwargs)
+
+    def apply(self, callee: Any, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        """Applies the operation to evaluated operands, raising the error of this expression if it fails"""
+        try:
+            return callee(*args, **kwargs)
+        except Exception as ex:
+            raise self.error(callee, args, kwargs) from ex
+
+    def error(
+        self, callee: Any, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> TypeError:
+        """Creates the error raised if the operation fails for the given operands"""
+        return TypeError(
+            f"{self.origin}: Invalid call expression for callee {callee} of type {type(callee)} with args {args} and kwargs {kwargs}"
+        )
@@ -14,12 +14,19 @@ class DictExpression(ExpressionImpl):
     elements: tuple[tuple[Expression, Expression], ...]
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
-        return set[str]().union(
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset[str]().union(
             *(e[0].unresolved_identifiers() for e in self.elements),
             *(e[1].unresolved_identifiers() for e in self.elements),
         )
 
+    @override
+    def _is_simplified(self) -> bool:
+        elements = [e for kv in self.elements for e in kv]
+        return all(e._simplified for e in elements) and not all(
+            isinstance(e, ValueExpression) for e in elements
+        )
+
     @override
     def simplify(
         self,
@@ -27,6 +34,9 @@ class DictExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         _elements = tuple(
             (
                 k.simplify(variables, renderers=renderers),
@@ -48,3 +58,17 @@ class DictExpression(ExpressionImpl):
             )
 
         return DictExpression(origin=self.origin, elements=_elements)
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        return {
+            k.evaluate(variables, renderers=renderers): v.evaluate(
+                variables, renderers=renderers
+            )
+            for k, v in self.elements
+        }
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from collections.abc import Sequence, Callable
 from dataclasses import dataclass
-from typing import Any
+from functools import cached_property
+from typing import Any, ClassVar
 
 from ..origin import Origin
 
@@ -12,8 +13,39 @@ class Expression(ABC):
 
     origin: Origin
 
+    passes_on_value: ClassVar[bool] = False
+    """Whether the value of the expression can be the value of a sub-expression, see evaluate_with_origin()"""
+
+    def unresolved_identifiers(self) -> frozenset[str]:
+        """Provides the identifiers that need to be substituted to evaluate the expression
+
+        The identifiers are collected on first use and stored with the expression, so every node collects them once.
+        """
+        return self._unresolved_identifiers
+
+    @cached_property
+    def _unresolved_identifiers(self) -> frozenset[str]:
+        return self._collect_unresolved_identifiers()
+
     @abstractmethod
-    def unresolved_identifiers(self) -> set[str]: ...
+    def _collect_unresolved_identifiers(self) -> frozenset[str]: ...
+
+    @cached_property
+    def _simplified(self) -> bool:
+        return self._is_simplified()
+
+    def _is_simplified(self) -> bool:
+        """Whether simplify() returns an equal expression, as long as none of the unresolved identifiers is substituted
+
+        Determined from the stored results of the sub-expressions. The default is the safe answer, False.
+        """
+        return False
+
+    def _unaffected_by(self, variables: dict[str, Any]) -> bool:
+        """Whether simplifying the expression with the variables returns an equal expression, so it can be skipped"""
+        return self._simplified and variables.keys().isdisjoint(
+            self._unresolved_identifiers
+        )
 
     @abstractmethod
     def simplify(
@@ -30,3 +62,17 @@ class Expression(ABC):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Any: ...
+
+    def evaluate_with_origin(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> tuple[Any, Origin]:
+        """Evaluates the expression, and provides the origin of the expression that produced the value
+
+        Expressions that pass on the value of a sub-expression provide the origin of that sub-expression, like
+        simplify() does, so that values that cannot be rendered are reported where they are produced. Only needs to be
+        called for expressions that pass on values.
+        """
+        return self.evaluate(variables, renderers=renderers), self.origin
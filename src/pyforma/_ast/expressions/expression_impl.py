@@ -9,7 +9,11 @@ from .value_expression import ValueExpression
 
 @dataclass(frozen=True, kw_only=True)
 class ExpressionImpl(Expression, ABC):
-    """Expression base class with default implementations"""
+    """Expression base class with default implementations
+
+    The default evaluation substitutes the variables and unwraps the resulting value. Expressions override it to
+    evaluate directly, without building intermediate expressions.
+    """
 
     @override
     def evaluate(
@@ -19,9 +19,18 @@ class ForExpression(ExpressionImpl):
     expr: Expression
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
         return self.iter_expr.unresolved_identifiers().union(
-            self.expr.unresolved_identifiers() - set(self.var_names)
+            self.expr.unresolved_identifiers().difference(self.var_names)
+        )
+
+    @override
+    def _is_simplified(self) -> bool:
+        # Loops over known values are unrolled
+        return (
+            self.iter_expr._simplified
+            and not isinstance(self.iter_expr, ValueExpression)
+            and self.expr._simplified
         )
 
     @override
@@ -31,6 +40,9 @@ class ForExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         _iter_expr = self.iter_expr.simplify(variables, renderers=renderers)
         _expr = self.expr.simplify(
             {k: v for k, v in variables.items() if k not in self.var_names},
@@ -64,3 +76,18 @@ class ForExpression(ExpressionImpl):
             iter_expr=_iter_expr,
             expr=_expr,
         )
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        iterable = self.iter_expr.evaluate(variables, renderers=renderers)
+        scope = variables.copy()  # Reused by all iterations
+        elements: list[Any] = []
+        for value in iterable:
+            scope.update(destructure_value(self.var_names, value))
+            elements.append(self.expr.evaluate(scope, renderers=renderers))
+        return elements
@@ -14,8 +14,12 @@ class IdentifierExpression(ExpressionImpl):
     identifier: str
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
-        return {self.identifier}
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset((self.identifier,))
+
+    @override
+    def _is_simplified(self) -> bool:
+        return True
 
     @override
     def simplify(
@@ -27,3 +31,14 @@ class IdentifierExpression(ExpressionImpl):
         if self.identifier in variables:
             return ValueExpression(origin=self.origin, value=variables[self.identifier])
         return self
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        if self.identifier in variables:
+            return variables[self.identifier]
+        return super().evaluate(variables, renderers=renderers)
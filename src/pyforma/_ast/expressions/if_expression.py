@@ -1,10 +1,11 @@
 from collections.abc import Sequence, Callable
 from dataclasses import dataclass
-from typing import override, Any
+from typing import ClassVar, override, Any
 
 from .expression import Expression
 from .expression_impl import ExpressionImpl
 from .value_expression import ValueExpression
+from ..origin import Origin
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -13,14 +14,25 @@ class IfExpression(ExpressionImpl):
 
     cases: tuple[tuple[Expression, Expression], ...]  # Condition -> expression
 
+    passes_on_value: ClassVar[bool] = True
+
     @override
-    def unresolved_identifiers(self) -> set[str]:
-        return set[str]().union(
-            id
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset[str]().union(
+            *(condition.unresolved_identifiers() for condition, _ in self.cases),
+            *(expr.unresolved_identifiers() for _, expr in self.cases),
+        )
+
+    @override
+    def _is_simplified(self) -> bool:
+        # A leading case with a known condition resolves the expression, and later ones are dropped if they are false
+        if len(self.cases) == 0 or isinstance(self.cases[0][0], ValueExpression):
+            return False
+        return all(
+            condition._simplified
+            and expr._simplified
+            and (not isinstance(condition, ValueExpression) or bool(condition.value))
             for condition, expr in self.cases
-            for id in condition.unresolved_identifiers().union(
-                expr.unresolved_identifiers()
-            )
         )
 
     @override
@@ -30,6 +42,9 @@ class IfExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         _cases: list[tuple[Expression, Expression]] = []
         for condition, expr in self.cases:
             _condition = condition.simplify(variables, renderers=renderers)
@@ -47,3 +62,27 @@ class IfExpression(ExpressionImpl):
             return ValueExpression(origin=self.origin, value=None)
 
         return IfExpression(origin=self.origin, cases=tuple(_cases))
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        for condition, expr in self.cases:
+            if condition.evaluate(variables, renderers=renderers):
+                return expr.evaluate(variables, renderers=renderers)
+        return None
+
+    @override
+    def evaluate_with_origin(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> tuple[Any, Origin]:
+        for condition, expr in self.cases:
+            if condition.evaluate(variables, renderers=renderers):
+                return expr.evaluate_with_origin(variables, renderers=renderers)
+        return None, self.origin
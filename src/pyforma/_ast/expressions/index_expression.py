@@ -15,12 +15,23 @@ class IndexExpression(ExpressionImpl):
     index: Expression
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
         return (
             self.expression.unresolved_identifiers()
             | self.index.unresolved_identifiers()
         )
 
+    @override
+    def _is_simplified(self) -> bool:
+        return (
+            self.expression._simplified
+            and self.index._simplified
+            and not (
+                isinstance(self.expression, ValueExpression)
+                and isinstance(self.index, ValueExpression)
+            )
+        )
+
     @override
     def simplify(
         self,
@@ -28,16 +39,39 @@ class IndexExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         expression = self.expression.simplify(variables, renderers=renderers)
         index = self.index.simplify(variables, renderers=renderers)
         if isinstance(expression, ValueExpression) and isinstance(
             index, ValueExpression
         ):
-            try:
-                value = expression.value[index.value]
-            except Exception as ex:
-                raise TypeError(
-                    f"{self.origin}: Invalid indexing expression for value {expression.value} of type {type(expression.value)} and index {index.value} of type {type(index.value)}"
-                ) from ex
-            return ValueExpression(origin=self.origin, value=value)
+            return ValueExpression(
+                origin=self.origin, value=self.apply(expression.value, index.value)
+            )
         return IndexExpression(origin=self.origin, expression=expression, index=index)
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        expression = self.expression.evaluate(variables, renderers=renderers)
+        index = self.index.evaluate(variables, renderers=renderers)
+        return self.apply(expression, index)
+
+    def apply(self, expression: Any, index: Any) -> Any:
+        """Applies the operation to evaluated operands, raising the error of this expression if it fails"""
+        try:
+            return expression[index]
+        except Exception as ex:
+            raise self.error(expression, index) from ex
+
+    def error(self, expression: Any, index: Any) -> TypeError:
+        """Creates the error raised if the operation fails for the given operands"""
+        return TypeError(
+            f"{self.origin}: Invalid indexing expression for value {expression} of type {type(expression)} and index {index} of type {type(index)}"
+        )
@@ -1,6 +1,6 @@
 from collections.abc import Sequence, Callable
 from dataclasses import dataclass
-from typing import override, Any
+from typing import final, override, Any
 
 from .expression import Expression
 from .expression_impl import ExpressionImpl
@@ -15,8 +15,13 @@ class LambdaExpression(ExpressionImpl):
     return_value: Expression
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
-        return self.return_value.unresolved_identifiers() - set(self.parameters)
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return self.return_value.unresolved_identifiers().difference(self.parameters)
+
+    @override
+    def _is_simplified(self) -> bool:
+        # Lambdas without unresolved identifiers become functions
+        return self.return_value._simplified and len(self.unresolved_identifiers()) > 0
 
     @override
     def simplify(
@@ -25,35 +30,89 @@ class LambdaExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         value = self.return_value.simplify(
             {k: v for k, v in variables.items() if k not in self.parameters},
             renderers=renderers,
         )
 
         if value.unresolved_identifiers().issubset(self.parameters):
+            function = LambdaFunction(
+                lambda_expression=self, body=value, closure={}, renderers=renderers
+            )
+            return ValueExpression(origin=self.origin, value=function)
 
-            def fn(*args: Any, **kwargs: Any) -> Any:
-                msg = f"{self.origin}: Invalid call of lambda expression with arguments {args} and {kwargs}"
+        return LambdaExpression(
+            origin=self.origin,
+            parameters=self.parameters,
+            return_value=value,
+        )
 
-                args_mapped = {k: v for k, v in zip(self.parameters, args)}
-                if any(k in kwargs for k in args_mapped):
-                    raise TypeError("")
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        if not self.unresolved_identifiers() <= variables.keys():
+            return super().evaluate(variables, renderers=renderers)
 
-                kwargs |= args_mapped
+        # The body is simplified once, when the function is created, like by simplify(), so that errors in its
+        # constant parts are raised right away and the function doesn't see later changes of the variables
+        body = self.return_value.simplify(
+            {k: variables[k] for k in self.unresolved_identifiers()},
+            renderers=renderers,
+        )
+        return LambdaFunction(
+            lambda_expression=self, body=body, closure={}, renderers=renderers
+        )
 
-                try:
-                    result = value.simplify(kwargs, renderers=renderers)
-                    if isinstance(result, ValueExpression):
-                        return result.value
-                except Exception as ex:
-                    raise TypeError(msg) from ex
 
-                raise TypeError(msg)
+class _FunctionType(type):
+    """Type of lambda functions, which presents itself like the type of Python functions in error messages"""
 
-            return ValueExpression(origin=self.origin, value=fn)
+    @override
+    def __repr__(cls) -> str:
+        return "<class 'function'>"
 
-        return LambdaExpression(
-            origin=self.origin,
-            parameters=self.parameters,
-            return_value=value,
-        )
+
+@final
+@dataclass(frozen=True, kw_only=True, eq=False, repr=False)
+class LambdaFunction(metaclass=_FunctionType):
+    """Function that a lambda expression evaluates to
+
+    Unlike a closure, it can be pickled if its closure and renderers can, so that it can be sent to other processes.
+    Error messages show it like a Python function.
+    """
+
+    lambda_expression: (
+        LambdaExpression  # The lambda expression the function was created from
+    )
+    body: Expression  # The return value, possibly with some identifiers substituted
+    closure: dict[
+        str, Any
+    ]  # Values of the identifiers in the body that aren't parameters
+    renderers: Sequence[tuple[type, Callable[[Any], str]]]
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        origin = self.lambda_expression.origin
+        msg = f"{origin}: Invalid call of lambda expression with arguments {args} and {kwargs}"
+
+        args_mapped = {k: v for k, v in zip(self.lambda_expression.parameters, args)}
+        if any(k in kwargs for k in args_mapped):
+            raise TypeError("")
+
+        kwargs |= args_mapped
+
+        try:
+            return self.body.evaluate(kwargs | self.closure, renderers=self.renderers)
+        except Exception as ex:
+            raise TypeError(msg) from ex
+
+    @override
+    def __repr__(self) -> str:
+        # Like the closures that lambda expressions evaluated to before they could be pickled
+        return f"<function LambdaExpression.simplify.<locals>.fn at {id(self):#x}>"
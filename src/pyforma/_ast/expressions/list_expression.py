@@ -14,8 +14,16 @@ class ListExpression(ExpressionImpl):
     elements: tuple[Expression, ...]
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
-        return set[str]().union(*(e.unresolved_identifiers() for e in self.elements))
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset[str]().union(
+            *(e.unresolved_identifiers() for e in self.elements)
+        )
+
+    @override
+    def _is_simplified(self) -> bool:
+        return all(e._simplified for e in self.elements) and not all(
+            isinstance(e, ValueExpression) for e in self.elements
+        )
 
     @override
     def simplify(
@@ -24,6 +32,9 @@ class ListExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         _elements = tuple(
             e.simplify(variables, renderers=renderers) for e in self.elements
         )
@@ -35,3 +46,12 @@ class ListExpression(ExpressionImpl):
             )
 
         return ListExpression(origin=self.origin, elements=_elements)
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        return [e.evaluate(variables, renderers=renderers) for e in self.elements]
@@ -1,22 +1,29 @@
 from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from typing import override, Any
+from functools import cached_property
+from typing import cast, override, Any
 
 from .expression import Expression
 from .expression_impl import ExpressionImpl
+from ..origin import Origin
+from ..renderers import RendererRegistry
+from ..source_text import SourceText
 from .value_expression import ValueExpression
 
 
 def render(
-    expr: ValueExpression,
-    renderers: tuple[tuple[type, Callable[[Any], str]], ...],
+    value: Any,
+    origin: Origin,
+    renderers: Sequence[tuple[type, Callable[[Any], str]]],
 ) -> str:
-    v = expr.value
+    if isinstance(renderers, RendererRegistry):
+        return renderers.render(value, origin)
+
     for t, r in renderers:
-        if isinstance(v, t):
-            return r(v)
+        if isinstance(value, t):
+            return r(value)
 
-    raise ValueError(f"{expr.origin}: No renderer for value of type {type(v)}")
+    raise ValueError(f"{origin}: No renderer for value of type {type(value)}")
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -26,8 +33,110 @@ class TemplateExpression(ExpressionImpl):
     content: tuple[Expression, ...]
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
-        return set[str]().union(*[arg.unresolved_identifiers() for arg in self.content])
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset[str]().union(
+            *(arg.unresolved_identifiers() for arg in self.content)
+        )
+
+    def join_parts(self, parts: Sequence[str | SourceText | Expression]) -> str:
+        """Joins the evaluated parts of this template, like evaluate() does.
+
+        Mapped text and expressions among the parts are inserted into the template like by simplify(), see
+        check_parts().
+
+        Args:
+            parts: The parts of the template, as rendered or mapped text or the inserted expressions, one for every
+                part of its content
+
+        Returns:
+            The rendered template
+
+        Raises:
+            ValueError: If the expressions cannot be inserted as text
+            TypeError: If a renderer didn't render a value to text, like simplify()
+        """
+        try:
+            return "".join(cast("Sequence[str]", parts))
+        except TypeError:  # Mapped text or expressions to be inserted
+            pass
+
+        pieces: list[str] = []
+        for part in parts:
+            match part:
+                case SourceText():
+                    pieces.append(str(part))
+                case ValueExpression():
+                    pieces.append(str(part.value))
+                case Expression():  # Raises the error below
+                    pass
+                case _:
+                    pieces.append(part)
+        # Raises TypeError for values that renderers didn't render to text, like simplify()
+        text = "".join(pieces)
+        self.check_parts(parts)
+        return text
+
+    def check_parts(self, parts: Sequence[str | SourceText | Expression]) -> None:
+        """Checks whether expressions can be inserted into this template as text.
+
+        Expressions are inserted into the template like by simplify(), and the template can be evaluated if that
+        results in text: inserted text is joined to the text that follows it, and mapped text, also inserted one, is
+        joined to all other text.
+
+        Args:
+            parts: The parts of the template, as rendered or mapped text or the inserted expressions, one for every
+                part of its content. Only their types are checked.
+
+        Raises:
+            ValueError: If the expressions cannot be inserted as text, the error of evaluating the template
+        """
+        texts = 0  # Number of texts the content of the simplified template consists of
+        mapped = False
+        joined = False  # Whether the next part is joined to the preceding text
+        for part in parts:
+            match part:
+                case SourceText() | ValueExpression(value=SourceText()):
+                    texts += 1
+                    mapped = True
+                    joined = False
+                case ValueExpression(value=str()):
+                    texts += 1
+                    joined = True
+                case Expression():  # Not text
+                    raise self._evaluation_error()
+                case _:
+                    texts += 0 if joined else 1
+                    joined = True
+        if texts > 1 and not mapped:
+            raise self._evaluation_error()
+
+    def _evaluation_error(self) -> ValueError:
+        return ValueError(f"{self.origin}: Failed to evaluate expression {self}")
+
+    @cached_property
+    def _parts(self) -> tuple[tuple[Expression, bool], ...]:
+        """The content, and whether the origins of the values of each part need to be tracked when evaluating it"""
+        return tuple((e, e.passes_on_value) for e in self.content)
+
+    @override
+    def _is_simplified(self) -> bool:
+        # Values other than text are rendered, adjacent strings are joined, and templates of text only are replaced by
+        # their text
+        if all(isinstance(e, ValueExpression) for e in self.content):
+            return False
+        previous_is_str = False
+        for e in self.content:
+            if isinstance(e, ValueExpression):
+                if not isinstance(e.value, str | SourceText) or (
+                    previous_is_str and isinstance(e.value, str)
+                ):
+                    return False
+                previous_is_str = isinstance(e.value, str)
+            elif not e._simplified:
+                return False
+            else:
+                previous_is_str = False
+        return True
 
     @override
     def simplify(
@@ -36,36 +145,66 @@ class TemplateExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         _content: list[Expression] = []
+        # Adjacent strings are collected and joined once, at the end of their run
+        _text: list[str] = []
+        _text_origin = self.origin
+
+        def end_text() -> None:
+            if _text:
+                _content.append(
+                    ValueExpression(origin=_text_origin, value="".join(_text))
+                )
+                _text.clear()
 
         for e in self.content:
             _expr = e.simplify(variables, renderers=renderers)
 
             if isinstance(_expr, ValueExpression):
                 match _expr.value:
-                    case Expression():
-                        _content.append(_expr.value)
+                    case Expression() as inserted:
+                        end_text()
+                        if isinstance(inserted, ValueExpression) and isinstance(
+                            inserted.value, str
+                        ):  # Following strings are joined to it
+                            _text.append(inserted.value)
+                            _text_origin = inserted.origin
+                        else:
+                            _content.append(inserted)
+                        continue
+                    case SourceText():  # Kept as reference until the whole template is resolved
+                        end_text()
+                        _content.append(_expr)
                         continue
                     case str() as s:
                         pass
                     case _:
-                        s = render(_expr, renderers=tuple(renderers))
-
-                if len(_content) > 0:
-                    prev = _content[-1]
-                    if isinstance(prev, ValueExpression) and isinstance(
-                        prev.value, str
-                    ):
-                        _content[-1] = ValueExpression(
-                            origin=prev.origin,
-                            value=prev.value + s,
-                        )
-                        continue
+                        s = render(_expr.value, _expr.origin, renderers)
 
-                _content.append(ValueExpression(origin=_expr.origin, value=s))
+                if not _text:
+                    _text_origin = _expr.origin
+                _text.append(s)
                 continue
 
+            end_text()
             _content.append(_expr)
+        end_text()
+
+        # Mapped text is only decoded once all of it can be joined to a single string
+        texts = [
+            e.value
+            for e in _content
+            if isinstance(e, ValueExpression) and isinstance(e.value, str | SourceText)
+        ]
+        if len(texts) == len(_content) and any(
+            isinstance(t, SourceText) for t in texts
+        ):
+            return ValueExpression(
+                origin=_content[0].origin, value="".join(str(t) for t in texts)
+            )
 
         if len(_content) == 1 and isinstance(_content[0], ValueExpression):
             return _content[0]
@@ -74,3 +213,27 @@ class TemplateExpression(ExpressionImpl):
             return ValueExpression(origin=self.origin, value="")
 
         return TemplateExpression(origin=self.origin, content=tuple(_content))
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        parts: list[str | SourceText | Expression] = []
+        for e, passes_on_value in self._parts:
+            if passes_on_value:
+                value, origin = e.evaluate_with_origin(variables, renderers=renderers)
+            else:
+                value = e.evaluate(variables, renderers=renderers)
+                origin = None
+            match value:
+                case str():
+                    parts.append(value)
+                case SourceText() | Expression():
+                    # Expressions are inserted into the template, as by simplify(), once all parts are evaluated
+                    parts.append(value)
+                case _:
+                    parts.append(render(value, origin or e.origin, renderers))
+        return self.join_parts(parts)
@@ -1,3 +1,4 @@
+import operator
 from collections.abc import Sequence, Callable
 from dataclasses import dataclass
 from typing import Literal, override, Any
@@ -7,6 +8,14 @@ from .expression_impl import ExpressionImpl
 from .value_expression import ValueExpression
 
 
+_operators: dict[str, Callable[[Any], Any]] = {
+    "+": operator.pos,
+    "-": operator.neg,
+    "~": operator.invert,
+    "not": operator.not_,
+}
+
+
 @dataclass(frozen=True, kw_only=True)
 class UnOpExpression(ExpressionImpl):
     """Unary operator expression"""
@@ -15,9 +24,15 @@ class UnOpExpression(ExpressionImpl):
     operand: Expression
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
         return self.operand.unresolved_identifiers()
 
+    @override
+    def _is_simplified(self) -> bool:
+        return self.operand._simplified and not isinstance(
+            self.operand, ValueExpression
+        )
+
     @override
     def simplify(
         self,
@@ -25,23 +40,32 @@ class UnOpExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         operand = self.operand.simplify(variables, renderers=renderers)
         if isinstance(operand, ValueExpression):
-            try:
-                match self.op:
-                    case "+":
-                        return ValueExpression(origin=self.origin, value=+operand.value)
-                    case "-":
-                        return ValueExpression(origin=self.origin, value=-operand.value)
-                    case "~":
-                        return ValueExpression(origin=self.origin, value=~operand.value)
-                    case "not":  # pragma: no branch
-                        return ValueExpression(
-                            origin=self.origin, value=not operand.value
-                        )
-            except Exception as ex:
-                raise TypeError(
-                    f"{self.origin}: Invalid unary operator {self.op} for value {operand.value} of type {type(operand.value)}"
-                ) from ex
-
+            return ValueExpression(origin=self.origin, value=self.apply(operand.value))
         return UnOpExpression(origin=self.origin, op=self.op, operand=operand)
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        return self.apply(self.operand.evaluate(variables, renderers=renderers))
+
+    def apply(self, operand: Any) -> Any:
+        """Applies the operation to evaluated operands, raising the error of this expression if it fails"""
+        try:
+            return _operators[self.op](operand)
+        except Exception as ex:
+            raise self.error(operand) from ex
+
+    def error(self, operand: Any) -> TypeError:
+        """Creates the error raised if the operation fails for the given operands"""
+        return TypeError(
+            f"{self.origin}: Invalid unary operator {self.op} for value {operand} of type {type(operand)}"
+        )
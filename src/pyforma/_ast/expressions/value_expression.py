@@ -12,8 +12,12 @@ class ValueExpression(Expression):
     value: Any
 
     @override
-    def unresolved_identifiers(self) -> set[str]:
-        return set()
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset()
+
+    @override
+    def _is_simplified(self) -> bool:
+        return True
 
     @override
     def simplify(
@@ -1,12 +1,13 @@
 from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from typing import override, Any
+from typing import ClassVar, override, Any
 
 from pyforma._util import destructure_value
 
 from .expression import Expression
 from .expression_impl import ExpressionImpl
 from .value_expression import ValueExpression
+from ..origin import Origin
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -21,12 +22,28 @@ class WithExpression(ExpressionImpl):
         if len(names) != len(set(names)):
             raise ValueError(f"With-expression contains duplicate names: {names}")
 
+    passes_on_value: ClassVar[bool] = True
+
     @override
-    def unresolved_identifiers(self) -> set[str]:
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
         names = {n for ns, _ in self.bindings for n in ns}
-        return set[str]().union(
-            id for _, expr in self.bindings for id in expr.unresolved_identifiers()
-        ) | (self.expr.unresolved_identifiers() - names)
+        return frozenset[str]().union(
+            *(expr.unresolved_identifiers() for _, expr in self.bindings),
+            self.expr.unresolved_identifiers() - names,
+        )
+
+    @override
+    def _is_simplified(self) -> bool:
+        # Known values are substituted, and bodies without unresolved identifiers replace the expression
+        return (
+            len(self.bindings) > 0
+            and all(
+                binding._simplified and not isinstance(binding, ValueExpression)
+                for _, binding in self.bindings
+            )
+            and self.expr._simplified
+            and len(self.expr.unresolved_identifiers()) > 0
+        )
 
     @override
     def simplify(
@@ -35,6 +52,9 @@ class WithExpression(ExpressionImpl):
         *,
         renderers: Sequence[tuple[type, Callable[[Any], str]]],
     ) -> Expression:
+        if self._unaffected_by(variables):
+            return self
+
         names = {n for ns, _ in self.bindings for n in ns}
         _bindings = tuple(
             (n, e.simplify(variables, renderers=renderers)) for n, e in self.bindings
@@ -58,3 +78,37 @@ class WithExpression(ExpressionImpl):
             return _expr
 
         return WithExpression(origin=self.origin, bindings=_bindings, expr=_expr)
+
+    @override
+    def evaluate(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> Any:
+        return self.expr.evaluate(
+            self._scope(variables, renderers), renderers=renderers
+        )
+
+    @override
+    def evaluate_with_origin(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> tuple[Any, Origin]:
+        return self.expr.evaluate_with_origin(
+            self._scope(variables, renderers), renderers=renderers
+        )
+
+    def _scope(
+        self,
+        variables: dict[str, Any],
+        renderers: Sequence[tuple[type, Callable[[Any], str]]],
+    ) -> dict[str, Any]:
+        """Binds the values of the bindings in addition to the variables"""
+        scope = variables.copy()
+        for names, binding in self.bindings:
+            value = binding.evaluate(variables, renderers=renderers)
+            scope.update(destructure_value(names, value))
+        return scope
@@ -0,0 +1,65 @@
+from collections.abc import Callable, Iterable
+from typing import Any, final, override
+
+from .origin import Origin
+
+
+@final
+class RendererRegistry(tuple[tuple[type, Callable[[Any], str]], ...]):
+    """Renderers, with the renderer of every type looked up once.
+
+    A registry is a tuple of renderers and can be used wherever renderers are expected. The renderer of a value is the
+    first renderer whose type the value is an instance of. It is looked up once for each concrete type and cached, so
+    rendering a value is a dictionary lookup and a call of its renderer. For str, int and float values, that renderer is
+    str itself unless other renderers precede it. Registries are immutable, so their cache never needs to be
+    invalidated: changing the renderers creates a new registry.
+    """
+
+    def __init__(self, renderers: Iterable[tuple[type, Callable[[Any], str]]] = (), /):
+        """Initialize a registry
+
+        Args:
+            renderers: The renderers, in the order of their priority
+        """
+        super().__init__()
+        # Type -> its renderer, or None if it has none
+        self._resolved: dict[type, Callable[[Any], str] | None] = {}
+
+    @override
+    def __reduce__(self) -> tuple[Any, ...]:
+        return RendererRegistry, (tuple(self),)  # The cache is rebuilt on demand
+
+    def renderer(self, t: type) -> Callable[[Any], str] | None:
+        """Looks up the renderer of the values of a type.
+
+        Args:
+            t: The type of the values
+
+        Returns:
+            The renderer, or None if no renderer applies
+        """
+        try:
+            return self._resolved[t]
+        except KeyError:
+            pass
+        renderer = next((r for rt, r in self if issubclass(t, rt)), None)
+        self._resolved[t] = renderer
+        return renderer
+
+    def render(self, value: Any, origin: Origin) -> str:
+        """Renders a value.
+
+        Args:
+            value: The value to render
+            origin: Origin of the expression that produced the value, for the error message
+
+        Returns:
+            The rendered value
+
+        Raises:
+            ValueError: If no renderer applies to the value
+        """
+        renderer = self.renderer(value.__class__)
+        if renderer is None:
+            raise ValueError(f"{origin}: No renderer for value of type {type(value)}")
+        return renderer(value)
@@ -0,0 +1,379 @@
+import importlib
+import marshal
+import types
+import zlib
+from typing import Any, cast, final
+
+from .expressions import (
+    AttributeExpression,
+    BinOpExpression,
+    CallExpression,
+    DictExpression,
+    Expression,
+    ForExpression,
+    IdentifierExpression,
+    IfExpression,
+    IndexExpression,
+    LambdaExpression,
+    ListExpression,
+    TemplateExpression,
+    UnOpExpression,
+    ValueExpression,
+    WithExpression,
+)
+from .expressions.lambda_expression import LambdaFunction
+from .origin import Origin
+from .source_text import SourceText
+
+# Serialized templates start with the magic bytes and the format version. The version must be increased whenever the
+# encoding changes.
+_magic = b"pyforma\x00"
+_version = 1
+
+
+@final
+class _Kind:
+    """Node kinds. Every node is encoded as a tuple of its kind, its origin and its fields."""
+
+    VALUE = 0
+    IDENTIFIER = 1
+    UNOP = 2
+    BINOP = 3
+    INDEX = 4
+    CALL = 5
+    ATTRIBUTE = 6
+    LIST = 7
+    DICT = 8
+    LAMBDA = 9
+    IF = 10
+    FOR = 11
+    WITH = 12
+    TEMPLATE = 13
+
+
+@final
+class _Tag:
+    """Value tags. Every value is encoded as a tuple of its tag and its data."""
+
+    PLAIN = 0  # Data that marshal encodes exactly
+    GLOBAL = 1  # Object that can be imported by its module and qualified name
+    MODULE = 2
+    EXPRESSION = 3
+    FUNCTION = 4  # Function created by a lambda expression
+    TUPLE = 5  # Containers of values that aren't plain data
+    LIST = 6
+    DICT = 7
+
+
+_plain_types = (type(None), bool, int, float, complex, str, bytes)
+_plain_containers = (tuple, list, set, frozenset)
+
+
+def _is_plain(value: Any) -> bool:
+    """Checks whether a value consists of data that marshal encodes exactly"""
+    if type(value) in _plain_types:
+        return True
+    if type(value) in _plain_containers:
+        return all(_is_plain(element) for element in value)
+    if type(value) is dict:
+        items = cast(dict[Any, Any], value)
+        return all(_is_plain(k) and _is_plain(v) for k, v in items.items())
+    return False
+
+
+def _resolve_global(module: str, qualname: str) -> Any:
+    obj: Any = importlib.import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+@final
+class _Encoder:
+    """Encodes an expression tree as nested tuples of data that marshal can encode"""
+
+    def __init__(self):
+        # Source id -> index into the table of source ids
+        self.source_ids: dict[str, int] = {}
+
+    def expression(self, e: Expression) -> tuple[Any, ...]:
+        origin = e.origin
+        source_id = self.source_ids.setdefault(origin.source_id, len(self.source_ids))
+        line, column = origin.position
+        match e:
+            case ValueExpression():
+                fields: tuple[Any, ...] = (self.value(e.value, origin),)
+                kind = _Kind.VALUE
+            case IdentifierExpression():
+                kind, fields = _Kind.IDENTIFIER, (e.identifier,)
+            case UnOpExpression():
+                kind, fields = _Kind.UNOP, (e.op, self.expression(e.operand))
+            case BinOpExpression():
+                kind = _Kind.BINOP
+                fields = (e.op, self.expression(e.lhs), self.expression(e.rhs))
+            case IndexExpression():
+                kind = _Kind.INDEX
+                fields = (self.expression(e.expression), self.expression(e.index))
+            case CallExpression():
+                kind = _Kind.CALL
+                fields = (
+                    self.expression(e.callee),
+                    tuple(self.expression(arg) for arg in e.arguments),
+                    tuple((iden, self.expression(arg)) for iden, arg in e.kw_arguments),
+                )
+            case AttributeExpression():
+                kind, fields = _Kind.ATTRIBUTE, (self.expression(e.object), e.attribute)
+            case ListExpression():
+                kind = _Kind.LIST
+                fields = (tuple(self.expression(element) for element in e.elements),)
+            case DictExpression():
+                kind = _Kind.DICT
+                fields = (
+                    tuple(
+                        (self.expression(k), self.expression(v)) for k, v in e.elements
+                    ),
+                )
+            case LambdaExpression():
+                kind = _Kind.LAMBDA
+                fields = (e.parameters, self.expression(e.return_value))
+            case IfExpression():
+                kind = _Kind.IF
+                fields = (
+                    tuple((self.expression(c), self.expression(x)) for c, x in e.cases),
+                )
+            case ForExpression():
+                kind = _Kind.FOR
+                fields = (
+                    e.var_names,
+                    self.expression(e.iter_expr),
+                    self.expression(e.expr),
+                )
+            case WithExpression():
+                kind = _Kind.WITH
+                fields = (
+                    tuple((names, self.expression(b)) for names, b in e.bindings),
+                    self.expression(e.expr),
+                )
+            case TemplateExpression():
+                kind = _Kind.TEMPLATE
+                fields = (tuple(self.expression(content) for content in e.content),)
+            case _:
+                raise ValueError(
+                    f"{origin}: Expression of type {type(e).__qualname__} cannot be serialized"
+                )
+        return (kind, line, column, source_id, *fields)
+
+    def value(self, value: Any, origin: Origin) -> tuple[Any, ...]:
+        if _is_plain(value):
+            return (_Tag.PLAIN, value)
+        match value:
+            case SourceText():
+                return (_Tag.PLAIN, str(value))
+            case Expression():
+                return (_Tag.EXPRESSION, self.expression(value))
+            case LambdaFunction():
+                return (
+                    _Tag.FUNCTION,
+                    self.expression(value.lambda_expression),
+                    self.expression(value.body),
+                    tuple((k, self.value(v, origin)) for k, v in value.closure.items()),
+                    tuple(
+                        (self.value(t, origin), self.value(r, origin))
+                        for t, r in value.renderers
+                    ),
+                )
+            case types.ModuleType():
+                return (_Tag.MODULE, value.__name__)
+            case tuple():
+                return (_Tag.TUPLE, tuple(self.value(v, origin) for v in value))  # pyright: ignore[reportUnknownVariableType]
+            case list():
+                return (_Tag.LIST, tuple(self.value(v, origin) for v in value))  # pyright: ignore[reportUnknownVariableType]
+            case dict():
+                return (
+                    _Tag.DICT,
+                    tuple(
+                        (self.value(k, origin), self.value(v, origin))
+                        for k, v in value.items()  # pyright: ignore[reportUnknownVariableType]
+                    ),
+                )
+            case _:
+                pass
+
+        module = getattr(value, "__module__", None)
+        qualname = getattr(value, "__qualname__", None)
+        if isinstance(module, str) and isinstance(qualname, str):
+            try:
+                resolved = _resolve_global(module, qualname)
+            except Exception:
+                resolved = None
+            if resolved is value:
+                return (_Tag.GLOBAL, module, qualname)
+
+        raise ValueError(
+            f"{origin}: Value of type {type(value).__qualname__} cannot be serialized"
+        )
+
+
+@final
+class _Decoder:
+    """Decodes an expression tree encoded by _Encoder"""
+
+    def __init__(self, source_ids: tuple[str, ...]):
+        self._source_ids = source_ids
+
+    def expression(self, data: tuple[Any, ...]) -> Expression:
+        kind, line, column, source_id, *fields = data
+        source_index: int = source_id
+        o = Origin(position=(line, column), source_id=self._source_ids[source_index])
+        match kind, *fields:
+            case _Kind.VALUE, value:
+                return ValueExpression(origin=o, value=self.value(value))
+            case _Kind.IDENTIFIER, identifier:
+                return IdentifierExpression(origin=o, identifier=identifier)
+            case _Kind.UNOP, op, operand:
+                return UnOpExpression(origin=o, op=op, operand=self.expression(operand))
+            case _Kind.BINOP, op, lhs, rhs:
+                return BinOpExpression(
+                    origin=o, op=op, lhs=self.expression(lhs), rhs=self.expression(rhs)
+                )
+            case _Kind.INDEX, expression, index:
+                return IndexExpression(
+                    origin=o,
+                    expression=self.expression(expression),
+                    index=self.expression(index),
+                )
+            case _Kind.CALL, callee, arguments, kw_arguments:
+                return CallExpression(
+                    origin=o,
+                    callee=self.expression(callee),
+                    arguments=self.expressions(arguments),
+                    kw_arguments=tuple(
+                        (iden, self.expression(arg)) for iden, arg in kw_arguments
+                    ),
+                )
+            case _Kind.ATTRIBUTE, obj, attribute:
+                return AttributeExpression(
+                    origin=o, object=self.expression(obj), attribute=attribute
+                )
+            case _Kind.LIST, elements:
+                return ListExpression(origin=o, elements=self.expressions(elements))
+            case _Kind.DICT, elements:
+                return DictExpression(origin=o, elements=self.pairs(elements))
+            case _Kind.LAMBDA, parameters, return_value:
+                return LambdaExpression(
+                    origin=o,
+                    parameters=parameters,
+                    return_value=self.expression(return_value),
+                )
+            case _Kind.IF, cases:
+                return IfExpression(origin=o, cases=self.pairs(cases))
+            case _Kind.FOR, var_names, iter_expr, expr:
+                return ForExpression(
+                    origin=o,
+                    var_names=var_names,
+                    iter_expr=self.expression(iter_expr),
+                    expr=self.expression(expr),
+                )
+            case _Kind.WITH, bindings, expr:
+                return WithExpression(
+                    origin=o,
+                    bindings=tuple(
+                        (names, self.expression(binding)) for names, binding in bindings
+                    ),
+                    expr=self.expression(expr),
+                )
+            case _Kind.TEMPLATE, content:
+                return TemplateExpression(origin=o, content=self.expressions(content))
+            case _:
+                raise ValueError(f"Invalid expression of kind {kind}")
+
+    def expressions(self, data: tuple[Any, ...]) -> tuple[Expression, ...]:
+        return tuple(self.expression(e) for e in data)
+
+    def pairs(self, data: tuple[Any, ...]) -> tuple[tuple[Expression, Expression], ...]:
+        return tuple((self.expression(a), self.expression(b)) for a, b in data)
+
+    def value(self, data: tuple[Any, ...]) -> Any:
+        match data:
+            case _Tag.PLAIN, value:
+                return value
+            case _Tag.GLOBAL, module, qualname:
+                return _resolve_global(module, qualname)
+            case _Tag.MODULE, name:
+                return importlib.import_module(name)
+            case _Tag.EXPRESSION, expression:
+                return self.expression(expression)
+            case _Tag.FUNCTION, lambda_expression, body, closure, renderers:
+                lambda_expression = self.expression(lambda_expression)
+                if not isinstance(lambda_expression, LambdaExpression):
+                    raise ValueError("Invalid function")
+                return LambdaFunction(
+                    lambda_expression=lambda_expression,
+                    body=self.expression(body),
+                    closure={k: self.value(v) for k, v in closure},
+                    renderers=tuple(
+                        (self.value(t), self.value(r)) for t, r in renderers
+                    ),
+                )
+            case _Tag.TUPLE, values:
+                return tuple(self.value(v) for v in values)
+            case _Tag.LIST, values:
+                return [self.value(v) for v in values]
+            case _Tag.DICT, items:
+                return {self.value(k): self.value(v) for k, v in items}
+            case _:
+                raise ValueError(f"Invalid value {data!r}")
+
+
+def serialize(template: TemplateExpression) -> bytes:
+    """Serializes a template to a compact, versioned binary encoding.
+
+    The encoding keeps the origins of all expressions. Values must be plain data (None, bool, int, float, complex,
+    str, bytes, and tuples, lists, sets, frozensets and dicts of them), importable objects such as functions and
+    classes defined at module level, modules, expressions, functions created by lambda expressions, or containers of
+    such values. Mapped text is encoded as str.
+
+    Args:
+        template: The template to serialize
+
+    Returns:
+        The serialized template
+
+    Raises:
+        ValueError: If the template contains a value that cannot be serialized
+    """
+    encoder = _Encoder()
+    root = encoder.expression(template)
+    body = marshal.dumps((tuple(encoder.source_ids), root))
+    return _magic + bytes((_version,)) + zlib.compress(body)
+
+
+def deserialize(data: bytes) -> TemplateExpression:
+    """Deserializes a template serialized by serialize().
+
+    Importable objects are imported by name, so only data from trusted sources must be deserialized.
+
+    Args:
+        data: The serialized template
+
+    Returns:
+        The template
+
+    Raises:
+        ValueError: If the data is not a serialized template, or was serialized with an unsupported format version
+    """
+    if not data.startswith(_magic):
+        raise ValueError("Data is not a serialized template")
+    version = data[len(_magic) : len(_magic) + 1]
+    if version != bytes((_version,)):
+        raise ValueError(
+            f"Unsupported serialization format version {int.from_bytes(version)}, expected {_version}"
+        )
+    try:
+        source_ids, root = marshal.loads(zlib.decompress(data[len(_magic) + 1 :]))
+        template = _Decoder(source_ids).expression(root)
+    except Exception as ex:
+        raise ValueError("Invalid serialized template") from ex
+    if not isinstance(template, TemplateExpression):
+        raise ValueError("Invalid serialized template")
+    return template
@@ -0,0 +1,134 @@
+import mmap
+import re
+from bisect import bisect_right
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, final, override
+
+
+_non_ascii = re.compile(rb"[\x80-\xff]")
+
+
+@final
+class MappedSource:
+    """A UTF-8 encoded file mapped into memory.
+
+    Indices into the decoded text are translated to byte offsets into the mapping. For pure ASCII files, both are the
+    same. Otherwise, the character offset of every chunk of the file is collected once, on first use, and only the
+    chunk containing an index is decoded to translate it.
+    """
+
+    _chunk_size = 1 << 16
+
+    def __init__(self, path: Path):
+        """Maps a file into memory
+
+        Args:
+            path: The file to map
+
+        Raises:
+            OSError: If the file cannot be opened or mapped
+        """
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+            # Empty files cannot be mapped
+            self._buffer: mmap.mmap | bytes = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+        self._ascii: bool = _non_ascii.search(self._buffer) is None
+        self._chunks: list[tuple[int, int]] | None = None  # (index, offset) pairs
+
+    def decode(self) -> str:
+        """Decodes the complete file
+
+        Raises:
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        return str(self._buffer, "utf-8")
+
+    def text(self, start: int, stop: int) -> str:
+        """Decodes a part of the file
+
+        Args:
+            start: Byte offset of the first byte
+            stop: Byte offset after the last byte
+
+        Returns:
+            The decoded text
+        """
+        return str(self._buffer[start:stop], "utf-8")
+
+    def chunks(self, start: int, stop: int) -> Iterator[str]:
+        """Decodes a part of the file chunk by chunk
+
+        Args:
+            start: Byte offset of the first byte
+            stop: Byte offset after the last byte
+
+        Returns:
+            An iterator over the decoded chunks
+        """
+        for chunk_start, chunk_stop in self._chunk_bounds(start, stop):
+            yield self.text(chunk_start, chunk_stop)
+
+    def offset(self, index: int) -> int:
+        """Translates an index into the decoded text to a byte offset
+
+        Args:
+            index: Index into the decoded text
+
+        Returns:
+            The byte offset of the character at the index
+        """
+        if self._ascii:
+            return index
+
+        if self._chunks is None:
+            self._chunks = []
+            index_of_chunk = 0
+            for start, stop in self._chunk_bounds(0, len(self._buffer)):
+                self._chunks.append((index_of_chunk, start))
+                index_of_chunk += len(self.text(start, stop))
+
+        chunk = bisect_right(self._chunks, index, key=lambda c: c[0]) - 1
+        index_of_chunk, start = self._chunks[chunk]
+        stop = start + self._chunk_size + 3  # A chunk ends at most 3 bytes late
+        prefix = self._buffer[start:stop].decode("utf-8", "ignore")
+        return start + len(prefix[: index - index_of_chunk].encode("utf-8"))
+
+    def _chunk_bounds(self, start: int, stop: int) -> list[tuple[int, int]]:
+        """Splits a part of the file into chunks that end at character boundaries"""
+        bounds: list[tuple[int, int]] = []
+        while start < stop:
+            chunk_stop = min(start + self._chunk_size, stop)
+            while chunk_stop < stop and self._buffer[chunk_stop] & 0xC0 == 0x80:
+                chunk_stop += 1  # Continuation byte
+            bounds.append((start, chunk_stop))
+            start = chunk_stop
+        return bounds
+
+
+@final
+@dataclass(frozen=True)
+class SourceText:
+    """Reference to static text in a memory-mapped template file.
+
+    The text is only decoded when it is needed. Pickling a reference stores the decoded text.
+    """
+
+    source: MappedSource
+    start: int  # Byte offset of the text
+    stop: int  # Byte offset after the text
+
+    @override
+    def __str__(self) -> str:
+        return self.source.text(self.start, self.stop)
+
+    def chunks(self) -> Iterator[str]:
+        """Decodes the text chunk by chunk, so that it never needs to be held in memory at once"""
+        return self.source.chunks(self.start, self.stop)
+
+    @override
+    def __reduce__(self) -> tuple[Any, ...]:
+        return str, (str(self),)
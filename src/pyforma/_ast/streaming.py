@@ -0,0 +1,128 @@
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any
+
+from pyforma._util import destructure_value, join
+
+from .expressions import (
+    CallExpression,
+    Expression,
+    ForExpression,
+    IfExpression,
+    TemplateExpression,
+    ValueExpression,
+    WithExpression,
+)
+from .expressions.template_expression import render
+from .source_text import SourceText
+
+
+def stream(
+    template: TemplateExpression,
+    variables: dict[str, Any],
+    renderers: Sequence[tuple[type, Callable[[Any], str]]],
+) -> Iterator[str]:
+    """Renders a template piece by piece.
+
+    The pieces join to the same text as TemplateExpression.evaluate returns. Environments are streamed as well: the
+    bodies of for-environments are rendered one iteration at a time, only the taken branch of if-environments is
+    rendered, and mapped text is decoded in chunks. All other expressions are evaluated as a whole. All identifiers that
+    the template leaves unresolved must be bound by the variables.
+
+    Args:
+        template: The template to render
+        variables: The variables to substitute
+        renderers: Renderers to use for rendering values into the template
+
+    Returns:
+        An iterator over the rendered pieces
+    """
+    # Once an expression is to be inserted, the rest of the template is collected until it is known whether the
+    # expressions can be inserted as text. The text streamed before only matters as kind of part.
+    parts: list[str | SourceText | Expression] = []
+    inserting = False
+    rest: list[str] = []
+    for e in template.content:
+        part: str | SourceText | Expression = ""
+        for piece in _stream_part(e, variables, renderers):
+            match piece:
+                case Expression():
+                    part = piece
+                    inserting = True
+                    if isinstance(piece, ValueExpression):
+                        rest.append(str(piece.value))
+                case SourceText():
+                    part = piece
+                    if inserting:
+                        rest.append(str(piece))
+                    else:
+                        yield from piece.chunks()
+                case _:
+                    if inserting:
+                        rest.append(piece)
+                    else:
+                        yield piece
+        parts.append(part)
+    if inserting:
+        text = "".join(
+            rest
+        )  # Raises TypeError for values that renderers didn't render to text
+        template.check_parts(parts)
+        yield text
+
+
+def _stream_part(
+    e: Expression,
+    variables: dict[str, Any],
+    renderers: Sequence[tuple[type, Callable[[Any], str]]],
+) -> Iterator[str | SourceText | Expression]:
+    """Renders a part of a template piece by piece, or yields mapped text or an expression to be inserted into it"""
+    match e:
+        case ValueExpression(value=str() as value):
+            yield value
+            return
+        case TemplateExpression():
+            yield from stream(e, variables, renderers)
+            return
+        case CallExpression(
+            callee=ValueExpression(value=callee),
+            arguments=(
+                ValueExpression(value=str() as separator),
+                ForExpression(expr=TemplateExpression() as body) as loop,
+            ),
+            kw_arguments=(),
+        ) if callee is join:  # For-environment
+            iterable = loop.iter_expr.evaluate(variables, renderers=renderers)
+            scope = variables.copy()  # Reused by all iterations
+            for n, value in enumerate(iterable):
+                if n > 0 and separator:
+                    yield separator
+                scope.update(destructure_value(loop.var_names, value))
+                yield from stream(body, scope, renderers)
+            return
+        case IfExpression():
+            for condition, expr in e.cases:
+                if condition.evaluate(variables, renderers=renderers):
+                    if isinstance(expr, TemplateExpression):
+                        yield from stream(expr, variables, renderers)
+                        return
+                    value, origin = expr.evaluate_with_origin(
+                        variables, renderers=renderers
+                    )
+                    break
+            else:
+                value, origin = None, e.origin
+        case WithExpression(expr=TemplateExpression() as body):
+            scope = variables.copy()
+            for names, binding in e.bindings:
+                value = binding.evaluate(variables, renderers=renderers)
+                scope.update(destructure_value(names, value))
+            yield from stream(body, scope, renderers)
+            return
+        case _:
+            value, origin = e.evaluate_with_origin(variables, renderers=renderers)
+
+    match value:
+        case str() | SourceText() | Expression():
+            yield value
+        case _:
+            yield render(value, origin, renderers)
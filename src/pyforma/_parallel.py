@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import batched
+from typing import Any
+
+type BatchRenderer = Callable[[list[dict[str, Any]]], list[str]]
+"""Renders a template once for every set of variables in a batch"""
+
+_batch_renderer: BatchRenderer | None = None  # The renderer of the worker process
+
+
+def _initialize_worker(renderer: BatchRenderer) -> None:
+    global _batch_renderer
+    _batch_renderer = renderer
+
+
+def _render_batch(variables: list[dict[str, Any]]) -> list[str]:
+    assert _batch_renderer is not None  # Set by _initialize_worker
+    return _batch_renderer(variables)
+
+
+def render_in_processes(
+    renderer: BatchRenderer,
+    variables: Iterable[dict[str, Any]],
+    *,
+    workers: int | None,
+    chunksize: int,
+) -> Iterator[str]:
+    """Renders batches of variables in a pool of worker processes.
+
+    The renderer is sent to every worker once, when the worker starts, so it must be picklable, as must be the
+    variables and the results. The variables are consumed lazily, in chunks. Only a few chunks per worker are in flight
+    at any time, so the memory use doesn't grow with the number of variables. Workers are started with the forkserver
+    or spawn method, so that they don't inherit locks held by threads of this process.
+
+    Args:
+        renderer: Renders a chunk of variables
+        variables: The variables to render, one dictionary per render
+        workers: Number of worker processes, or None for one per CPU
+        chunksize: Number of sets of variables sent to a worker at once
+
+    Returns:
+        An iterator over the rendered templates, in the order of the variables
+
+    Raises:
+        ValueError: If workers or chunksize is not positive
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be positive")
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive")
+
+    if workers is None:
+        workers = os.process_cpu_count() or 1
+    method = (
+        "forkserver"
+        if "forkserver" in multiprocessing.get_all_start_methods()
+        else "spawn"
+    )
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(method),
+        initializer=_initialize_worker,
+        initargs=(renderer,),
+    )
+    try:
+        pending: deque[Future[list[str]]] = deque()
+        for chunk in batched(variables, chunksize):
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(_render_batch, list(chunk)))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,160 @@
+import functools
+import hashlib
+import importlib.metadata
+import os
+import pickle
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import final
+
+from pyforma._ast.expressions.template_expression import TemplateExpression
+from pyforma._parser import TemplateSyntaxConfig
+
+
+@functools.cache
+def _version() -> str:
+    """The version of pyforma that parsed templates are keyed by.
+
+    Without installed package metadata, e.g. when pyforma is imported from a source checkout, the version is derived
+    from the package's source files instead, so that changes to the parser still invalidate the cache.
+    """
+    try:
+        return importlib.metadata.version("pyforma")
+    except importlib.metadata.PackageNotFoundError:
+        package = Path(__file__).parent
+        digest = hashlib.sha256()
+        for path in sorted(package.rglob("*.py")):
+            digest.update(
+                str(path.relative_to(package)).encode("utf-8", "surrogatepass")
+            )
+            digest.update(path.read_bytes())
+        return f"source-{digest.hexdigest()}"
+
+
+@final
+@dataclass(frozen=True)
+class ParseCacheStatistics:
+    """Usage statistics of a parse cache"""
+
+    hits: int = 0  # Number of templates loaded from the cache
+    misses: int = 0  # Number of templates not found in the cache
+    load_time: float = 0.0  # Total seconds spent loading templates from the cache
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@final
+class ParseCache:
+    """Persistent cache of parsed templates.
+
+    Parsed templates are stored in a directory, one compressed pickle file per template. Entries are keyed by a hash
+    of the template source, its source id, the syntax configuration and the pyforma version, so a changed file or an
+    update of pyforma never returns a stale tree. Several processes can share a cache directory: entries are written to
+    a temporary file and then atomically moved into place, and unreadable entries are treated as missing.
+
+    Since entries are unpickled, the cache directory must not be writable by untrusted users.
+    """
+
+    def __init__(self, directory: Path):
+        """Creates a cache in the given directory
+
+        Args:
+            directory: Directory to keep the cache entries in. It is created if it doesn't exist.
+        """
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._statistics = ParseCacheStatistics()
+        directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def directory(self) -> Path:
+        """The cache directory"""
+        return self._directory
+
+    @property
+    def statistics(self) -> ParseCacheStatistics:
+        """Usage statistics of this cache object"""
+        return self._statistics
+
+    def load(
+        self,
+        source: str,
+        *,
+        source_id: str,
+        syntax: TemplateSyntaxConfig,
+    ) -> TemplateExpression | None:
+        """Loads a parsed template from the cache
+
+        Args:
+            source: The template source
+            source_id: The source id the template was parsed with
+            syntax: The syntax the template was parsed with
+
+        Returns:
+            The parsed template, or None if the cache has no valid entry for it
+        """
+        start = time.perf_counter()
+        try:
+            data = self._path(source, source_id, syntax).read_bytes()
+            template = pickle.loads(zlib.decompress(data))
+        except Exception:  # Missing, corrupt and incompatible entries are all misses
+            template = None
+        if not isinstance(template, TemplateExpression):
+            self._record(misses=1)
+            return None
+        self._record(hits=1, load_time=time.perf_counter() - start)
+        return template
+
+    def store(
+        self,
+        source: str,
+        template: TemplateExpression,
+        *,
+        source_id: str,
+        syntax: TemplateSyntaxConfig,
+    ) -> None:
+        """Stores a parsed template in the cache
+
+        Args:
+            source: The template source
+            template: The parsed template
+            source_id: The source id the template was parsed with
+            syntax: The syntax the template was parsed with
+
+        Raises:
+            OSError: If the entry cannot be written
+        """
+        data = zlib.compress(pickle.dumps(template, pickle.HIGHEST_PROTOCOL))
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                _ = file.write(data)
+            os.replace(temp_path, self._path(source, source_id, syntax))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _path(self, source: str, source_id: str, syntax: TemplateSyntaxConfig) -> Path:
+        key = hashlib.sha256()
+        for part in (_version(), repr(syntax), source_id, source):
+            encoded = part.encode("utf-8", "surrogatepass")
+            key.update(len(encoded).to_bytes(8, "little"))
+            key.update(encoded)
+        return self._directory / f"{key.hexdigest()}.ast"
+
+    def _record(self, *, hits: int = 0, misses: int = 0, load_time: float = 0.0):
+        with self._lock:
+            s = self._statistics
+            self._statistics = ParseCacheStatistics(
+                hits=s.hits + hits,
+                misses=s.misses + misses,
+                load_time=s.load_time + load_time,
+            )
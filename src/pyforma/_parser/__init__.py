@@ -1,4 +1,6 @@
 from .parse_context import ParseContext as ParseContext
+from .parse_memo import ParseMemo as ParseMemo
+from .parse_memo import ParseStatistics as ParseStatistics
 from .parse_result import ParseResult as ParseResult
 from .parse_result import ParseSuccess as ParseSuccess
 from .parse_result import ParseFailure as ParseFailure
@@ -6,6 +8,8 @@ from .parser import parser as parser
 from .parser import Parser as Parser
 from .parser import ParserDecorator as ParserDecorator
 from .munch import munch as munch
+from .munch import munch_chars as munch_chars
+from .pattern import pattern as pattern
 from .whitespace import whitespace as whitespace
 from .digits import digits as digits
 from .digits import hexdigits as hexdigits
@@ -38,3 +42,4 @@ from .negative_lookahead import negative_lookahead as negative_lookahead
 from .indirect import indirect as indirect
 from .switch import switch as switch
 from .nothing import nothing as nothing
+from .compiler import compiled as compiled
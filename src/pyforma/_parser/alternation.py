@@ -3,7 +3,7 @@ from typing import overload, NoReturn
 
 from .parse_context import ParseContext
 from .parse_result import ParseResult
-from .parser import Parser, parser
+from .parser import Definition, Parser, parser, any_first
 from pyforma._util import defaulted
 
 
@@ -115,17 +115,13 @@ def alternation[T1, T2, T3, T4, T5, T6, T7, T8](
 def alternation(*parsers: Parser, name: str | None = None) -> Parser: ...
 
 
-def _farthest_parse(parse_result: ParseResult) -> int:
-    while parse_result.is_failure and parse_result.failure.cause is not None:
-        parse_result = parse_result.failure.cause
-
-    return parse_result.context.index
-
-
 @cache
 def alternation(*parsers: Parser, name: str | None = None) -> Parser:
     """Create a parser that runs the provided parsers in sequence until one matches, then returns that result.
 
+    Unless failures are diagnosed, alternatives whose first-character predicate rules out the next character are
+    skipped. Alternatives without predicate are always tried.
+
     Args:
         *parsers: Parsers to try one after another.
         name: Parser name.
@@ -136,16 +132,36 @@ def alternation(*parsers: Parser, name: str | None = None) -> Parser:
 
     name = defaulted(name, f"alternation({', '.join(p.name for p in parsers)})")
 
-    @parser(name=name)
+    # Viable alternatives by next character, in their original order
+    viable: dict[str, tuple[Parser, ...]] = {}
+
+    def viable_parsers(c: str) -> tuple[Parser, ...]:
+        v = viable.get(c)
+        if v is None:
+            v = tuple(p for p in parsers if p.first is None or (c and p.first(c)))
+            viable[c] = v
+        return v
+
+    @parser(
+        name=name,
+        first=any_first(*(p.first for p in parsers)),
+        definition=Definition("alternation", parsers),
+    )
     def parse_alternations(context: ParseContext) -> ParseResult:
         cause: ParseResult | None = None
-        for p in parsers:
+        candidates = (
+            parsers  # All alternatives may contribute to the reported failure
+            if context.diagnostics
+            else viable_parsers(context.source[context.index : context.index + 1])
+        )
+        for p in candidates:
             result = p(context)
             if result.is_success:
                 return result
+            elif not context.diagnostics:
+                continue
             elif cause is None or (
-                result.failure.cause
-                and _farthest_parse(cause) < _farthest_parse(result)
+                result.failure.cause and cause.farthest_index < result.farthest_index
             ):
                 cause = result
         return ParseResult.make_failure(expected=name, context=context, cause=cause)
@@ -0,0 +1,259 @@
+from functools import cache
+from typing import Any, final
+
+from .parse_context import ParseContext
+from .parse_result import ParseResult, ParseSuccess
+from .parser import Parser, parser
+
+compilation_enabled: bool = True
+"""Whether compiled parsers run their generated code. If disabled, they run the parsers they were compiled from."""
+
+
+def _context_at(context: ParseContext, index: int) -> ParseContext:
+    """Returns the context of the same parse at the given index"""
+    if index == context.index:
+        return context
+    return context.consume(index - context.index)
+
+
+@final
+class _ModuleBuilder:
+    """Generates one function per parser in a parser graph.
+
+    Every generated function takes the parse context, the source string and an index, and returns a tuple of the
+    parse result and the end index on success or None on failure. Parsers without definition are called as they are.
+    """
+
+    def __init__(self) -> None:
+        self.namespace: dict[str, Any] = {
+            "_context_at": _context_at,
+            "_ParseSuccess": ParseSuccess,
+        }
+        self._functions: dict[Parser[Any], str] = {}
+        self._pending: list[tuple[str, Parser[Any]]] = []
+        self._lines: list[str] = []
+
+    def build(self, root: Parser[Any]) -> str:
+        """Generates the module source. The function for the root parser is called "parse"."""
+        self._functions[root] = "parse"
+        self._pending.append(("parse", root))
+        while self._pending:
+            name, p = self._pending.pop()
+            self._lines.append(f"def {name}(ctx, source, i):")
+            self._lines.extend(f"    {line}" for line in self._body(p))
+            self._lines.append("")
+        return f"# Generated from parser {root.name}\n\n" + "\n".join(self._lines)
+
+    def _constant(self, value: Any) -> str:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def _function(self, p: Parser[Any]) -> str:
+        name = self._functions.get(p)
+        if name is None:
+            name = f"_p{len(self._functions)}"
+            self._functions[p] = name
+            self._pending.append((name, p))
+        return name
+
+    def _step(self, p: Parser[Any], var: str) -> list[str]:
+        """Code that parses p at i, stores its result in var and advances i, or returns on failure"""
+        definition = p.definition
+        if definition is not None and definition.combinator == "pattern":
+            regex = self._constant(definition.arguments[0])
+            return [
+                f"m = {regex}.match(source, i)",
+                "e = i if m is None else m.end()",
+                f"{var} = source[i:e]",
+                "i = e",
+            ]
+        return [
+            f"r = {self._function(p)}(ctx, source, i)",
+            "if r is None:",
+            "    return None",
+            f"{var}, i = r",
+        ]
+
+    def _body(self, p: Parser[Any]) -> list[str]:
+        definition = p.definition
+        if definition is None:
+            return self._external(p)
+
+        match definition.combinator:
+            case "literal":
+                s: str = definition.arguments[0]
+                return [
+                    f"if source.startswith({s!r}, i):",
+                    f"    return ({s!r}, i + {len(s)})",
+                    "return None",
+                ]
+            case "pattern":
+                return [*self._step(p, "v"), "return (v, i)"]
+            case "sequence":
+                return self._sequence(definition.parsers)
+            case "alternation":
+                return self._alternation(definition.parsers)
+            case "option":
+                child = self._function(definition.parsers[0])
+                return [
+                    f"r = {child}(ctx, source, i)",
+                    "return (None, i) if r is None else r",
+                ]
+            case "repetition":
+                child = self._function(definition.parsers[0])
+                return [
+                    "vs = []",
+                    "n = len(source)",
+                    "while i < n:",
+                    f"    r = {child}(ctx, source, i)",
+                    "    if r is None:",
+                    "        break",
+                    "    vs.append(r[0])",
+                    "    i = r[1]",
+                    "return (tuple(vs), i)",
+                ]
+            case "non_empty":
+                child = self._function(definition.parsers[0])
+                return [
+                    f"r = {child}(ctx, source, i)",
+                    "return None if r is None or r[1] == i else r",
+                ]
+            case "lookahead":
+                child = self._function(definition.parsers[0])
+                return [
+                    f"return None if {child}(ctx, source, i) is None else (None, i)"
+                ]
+            case "negative_lookahead":
+                child = self._function(definition.parsers[0])
+                return [
+                    f"return (None, i) if {child}(ctx, source, i) is None else None"
+                ]
+            case "transform_success" | "transform_consumed" as combinator:
+                child = self._function(definition.parsers[0])
+                transform, takes_context = definition.arguments
+                value = (
+                    "r[0]" if combinator == "transform_success" else "source[i : r[1]]"
+                )
+                context = ", _context_at(ctx, i)" if takes_context else ""
+                return [
+                    f"r = {child}(ctx, source, i)",
+                    "if r is None:",
+                    "    return None",
+                    f"return ({self._constant(transform)}({value}{context}), r[1])",
+                ]
+            case _:
+                return self._external(p)
+
+    def _external(self, p: Parser[Any]) -> list[str]:
+        return [
+            f"r = {self._constant(p)}(_context_at(ctx, i))",
+            "v = r.value",
+            "if v.__class__ is _ParseSuccess:",
+            "    return (v.result, r.context.index)",
+            "return None",
+        ]
+
+    def _sequence(self, parsers: tuple[Parser[Any], ...]) -> list[str]:
+        lines: list[str] = []
+        variables = [f"v{n}" for n in range(len(parsers))]
+        n = 0
+        while n < len(parsers):
+            # Adjacent literals are matched at once
+            literals: list[str] = []
+            while n + len(literals) < len(parsers):
+                definition = parsers[n + len(literals)].definition
+                if definition is None or definition.combinator != "literal":
+                    break
+                literals.append(definition.arguments[0])
+            if literals:
+                fused = "".join(literals)
+                lines += [f"if not source.startswith({fused!r}, i):", "    return None"]
+                lines += [f"{variables[n + k]} = {s!r}" for k, s in enumerate(literals)]
+                lines.append(f"i += {len(fused)}")
+                n += len(literals)
+            else:
+                lines += self._step(parsers[n], variables[n])
+                n += 1
+        result = "".join(f"{v}, " for v in variables)
+        lines.append(f"return (({result}), i)")
+        return lines
+
+    def _alternation(self, parsers: tuple[Parser[Any], ...]) -> list[str]:
+        lines: list[str] = ["c = source[i : i + 1]"]
+        for p in parsers:
+            definition = p.definition
+            if definition is not None and definition.combinator == "literal":
+                s: str = definition.arguments[0]
+                lines += [
+                    f"if source.startswith({s!r}, i):",
+                    f"    return ({s!r}, i + {len(s)})",
+                ]
+                continue
+
+            call = [f"r = {self._function(p)}(ctx, source, i)", "if r is not None:"]
+            if p.first is None:
+                lines += [*call, "    return r"]
+            else:  # Skip alternatives that cannot match
+                lines += [
+                    f"if c and {self._constant(p.first)}(c):",
+                    *(f"    {line}" for line in call),
+                    "        return r",
+                ]
+        lines.append("return None")
+        return lines
+
+
+def generate_source(root: Parser[Any]) -> tuple[str, dict[str, Any]]:
+    """Generates the source code of a Python module that implements a parser graph.
+
+    Args:
+        root: The parser to compile
+
+    Returns:
+        The module source and the namespace it must be executed in. The namespace holds the parsers, transformations
+        and patterns the module refers to.
+    """
+    builder = _ModuleBuilder()
+    source = builder.build(root)
+    return source, builder.namespace
+
+
+@cache
+def compiled[T](root: Parser[T]) -> Parser[T]:
+    """Compiles a parser graph into a specialized parser.
+
+    The graph is walked along the definitions of its parsers, and Python code is generated for all parsers built by
+    compilable combinators. Adjacent literals in sequences are matched at once, patterns are inlined, and no parse
+    results or contexts are created between the generated functions. Parsers without definition are called as they
+    are.
+
+    The compiled parser accepts the same input and produces the same results as the original parser. On failure, the
+    original parser runs again if the failure needs to be diagnosed, so that it reports the same failure.
+
+    Args:
+        root: The parser to compile
+
+    Returns:
+        The compiled parser
+    """
+
+    source, namespace = generate_source(root)
+    exec(compile(source, f"<compiled {root.name}>", "exec"), namespace)
+    entry = namespace["parse"]
+
+    @parser(name=root.name, first=root.first)
+    def parse_compiled(context: ParseContext) -> ParseResult[T]:
+        if not compilation_enabled:
+            return root(context)
+
+        r = entry(context, context.source, context.index)
+        if r is not None:
+            return ParseResult.make_success(
+                result=r[0], context=_context_at(context, r[1])
+            )
+        if context.diagnostics:
+            return root(context)
+        return ParseResult.make_failure(context=context, expected=root.name)
+
+    return parse_compiled
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from functools import cache
-from typing import LiteralString, cast
+from typing import Literal, LiteralString, cast
 
 from pyforma._ast.expressions import (
     Expression,
@@ -35,12 +35,25 @@ from pyforma._ast.origin import Origin
 from .parse_result import ParseResult
 from .parser import Parser, parser
 from .alternation import alternation
+from .compiler import compiled
+from .operator_expression import operator_expression
 from .identifier_expression import identifier_expression
 from .string_literal_expression import string_literal_expression
 from .integer_literal_expression import integer_literal_expression
 from .floating_point_literal_expression import floating_point_literal_expression
 
 
+type ExpressionEngine = Literal["precedence-climbing", "combinators"]
+
+expression_engine: ExpressionEngine = "precedence-climbing"
+"""The engine used to parse operator expressions.
+
+"precedence-climbing" parses all operator levels in a single loop, "combinators" nests one combinator per precedence
+level. Both produce the same expressions; failures are always reported by the combinators, since they describe what
+was expected on every level.
+"""
+
+
 @cache
 def expression(
     template_parser: Parser[TemplateExpression],
@@ -54,43 +67,17 @@ def expression(
                 context=context, expected=parse_expression.name
             )
 
-        power_expression: Parser[Expression] = _binop_expression(
-            primary_expression(template_parser), "**"
-        )
-        factor_expression: Parser[Expression] = _unop_expression(
-            power_expression, "+", "-", "~"
-        )
-        term_expression: Parser[Expression] = _binop_expression(
-            factor_expression, "*", "//", "/", "%", "@"
-        )
-        sum_expression: Parser[Expression] = _binop_expression(
-            term_expression, "+", "-"
-        )
-        shift_expression: Parser[Expression] = _binop_expression(
-            sum_expression, "<<", ">>"
-        )
-        bw_and_expression: Parser[Expression] = _binop_expression(shift_expression, "&")
-        bw_xor_expression: Parser[Expression] = _binop_expression(
-            bw_and_expression, "^"
-        )
-        bw_or_expression: Parser[Expression] = _binop_expression(bw_xor_expression, "|")
-        in_expression: Parser[Expression] = _binop_expression(
-            bw_or_expression, "in", "not in"
-        )
-        comparison_expression: Parser[Expression] = _comparison_expression(
-            in_expression
-        )
-        inversion_expression: Parser[Expression] = _unop_expression(
-            comparison_expression, "not"
-        )
-        conjunction_expression: Parser[Expression] = _binop_expression(
-            inversion_expression, "and"
-        )
-        disjunction_expression: Parser[Expression] = _binop_expression(
-            conjunction_expression, "or"
-        )
+        if expression_engine == "precedence-climbing":
+            r = operator_expression(primary_expression(template_parser))(context)
+            if r.is_success or not context.diagnostics:
+                return r
 
-        r = disjunction_expression(context)
+        r = _disjunction_expression(template_parser)(context)
+        if r.is_success and expression_engine == "precedence-climbing":
+            # The diagnostics would describe a failure that didn't happen
+            raise AssertionError(
+                f"{context.origin()}: The precedence-climbing engine failed to parse an expression that the combinators engine parsed"
+            )
         if r.is_failure:
             return ParseResult.make_failure(
                 expected=parse_expression.name,
@@ -102,6 +89,42 @@ def expression(
     return parse_expression
 
 
+@cache
+def _disjunction_expression(
+    template_parser: Parser[TemplateExpression],
+) -> Parser[Expression]:
+    """Builds the operator expression parser out of one combinator per precedence level"""
+
+    power_expression: Parser[Expression] = _binop_expression(
+        primary_expression(template_parser), "**"
+    )
+    factor_expression: Parser[Expression] = _unop_expression(
+        power_expression, "+", "-", "~"
+    )
+    term_expression: Parser[Expression] = _binop_expression(
+        factor_expression, "*", "//", "/", "%", "@"
+    )
+    sum_expression: Parser[Expression] = _binop_expression(term_expression, "+", "-")
+    shift_expression: Parser[Expression] = _binop_expression(sum_expression, "<<", ">>")
+    bw_and_expression: Parser[Expression] = _binop_expression(shift_expression, "&")
+    bw_xor_expression: Parser[Expression] = _binop_expression(bw_and_expression, "^")
+    bw_or_expression: Parser[Expression] = _binop_expression(bw_xor_expression, "|")
+    in_expression: Parser[Expression] = _binop_expression(
+        bw_or_expression, "in", "not in"
+    )
+    comparison_expression: Parser[Expression] = _comparison_expression(in_expression)
+    inversion_expression: Parser[Expression] = _unop_expression(
+        comparison_expression, "not"
+    )
+    conjunction_expression: Parser[Expression] = _binop_expression(
+        inversion_expression, "and"
+    )
+    disjunction_expression: Parser[Expression] = _binop_expression(
+        conjunction_expression, "or"
+    )
+    return disjunction_expression
+
+
 @cache
 def paren_expression(
     template_parser: Parser[TemplateExpression],
@@ -591,22 +614,24 @@ def primary_expression(
     template_parser: Parser[TemplateExpression],
 ) -> Parser[Expression]:
     primary_expression = transform_result(
-        transform_success(
-            sequence(
-                simple_expression(template_parser),
-                repetition(
-                    sequence(
-                        whitespace,
-                        alternation(
-                            _indexing(template_parser),
-                            _call(template_parser),
-                            _attribute,
-                        ),
-                    )
+        compiled(
+            transform_success(
+                sequence(
+                    simple_expression(template_parser),
+                    repetition(
+                        sequence(
+                            whitespace,
+                            alternation(
+                                _indexing(template_parser),
+                                _call(template_parser),
+                                _attribute,
+                            ),
+                        )
+                    ),
+                    name="primary-expression",
                 ),
-                name="primary-expression",
-            ),
-            transform=lambda s: (s[0], tuple(e[1] for e in s[1])),
+                transform=lambda s: (s[0], tuple(e[1] for e in s[1])),
+            )
         ),
         transform=_transform_primary_expression,
     )
@@ -773,24 +798,10 @@ def template_expression(
     @parser
     def template_expr_parser(context: ParseContext) -> ParseResult[TemplateExpression]:
         was_in_template_expr = context.in_template_expr
-        result = template_parser(
-            ParseContext(
-                source=context.source,
-                index=context.index,
-                position=context.position,
-                source_id=context.source_id,
-                in_template_expr=True,
-            )
-        )
+        result = template_parser(replace(context, in_template_expr=True))
         return ParseResult(
             result.value,
-            context=ParseContext(
-                source=result.context.source,
-                index=result.context.index,
-                position=result.context.position,
-                source_id=result.context.source_id,
-                in_template_expr=was_in_template_expr,
-            ),
+            context=replace(result.context, in_template_expr=was_in_template_expr),
         )
 
     parse = transform_success(
@@ -6,6 +6,7 @@ from .whitespace import whitespace
 from .literal import literal
 from .sequence import sequence
 from .parser import Parser
+from .compiler import compiled
 from .expression import expression
 from .template_syntax_config import TemplateSyntaxConfig
 from pyforma._ast.expressions import Expression, TemplateExpression
@@ -26,14 +27,16 @@ def expression_block(
         The expression block parser.
     """
 
-    return transform_success(
-        sequence(
-            literal(syntax.expression.open),
-            whitespace,
-            expression(template_parser),
-            whitespace,
-            literal(syntax.expression.close),
-            name="expression-block",
-        ),
-        transform=lambda result: result[2],
+    return compiled(
+        transform_success(
+            sequence(
+                literal(syntax.expression.open),
+                whitespace,
+                expression(template_parser),
+                whitespace,
+                literal(syntax.expression.close),
+                name="expression-block",
+            ),
+            transform=lambda result: result[2],
+        )
     )
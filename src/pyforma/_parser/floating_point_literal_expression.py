@@ -11,7 +11,8 @@ from .literal import literal
 from pyforma._ast import ValueExpression
 
 _dec = sequence(
-    non_empty(digits), repetition(sequence(literal("_"), non_empty(digits)))
+    non_empty(digits, first=str.isdigit),
+    repetition(sequence(literal("_"), non_empty(digits))),
 )
 
 floating_point_literal_expression = transform_consumed(
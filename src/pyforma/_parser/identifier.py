@@ -1,6 +1,18 @@
 from .non_empty import non_empty
-from .munch import munch
+from .munch import munch_chars
 
 
-identifier = non_empty(munch(str.isidentifier), name="identifier")
+def _is_identifier_start(c: str) -> bool:
+    return c.isidentifier()
+
+
+def _is_identifier_continue(c: str) -> bool:
+    return ("_" + c).isidentifier()
+
+
+identifier = non_empty(
+    munch_chars(_is_identifier_continue, first=_is_identifier_start),
+    name="identifier",
+    first=_is_identifier_start,
+)
 """Parses an identifier."""
@@ -6,7 +6,7 @@ from .parse_result import ParseResult
 from pyforma._ast import IdentifierExpression, Expression
 
 
-@parser
+@parser(first=identifier.first)
 def identifier_expression(context: ParseContext) -> ParseResult[Expression]:
     """Parse an identifier expression."""
 
@@ -28,7 +28,7 @@ _hex_int = sequence(
     repetition(sequence(literal("_"), non_empty(hexdigits))),
 )
 _dec_int = sequence(
-    non_empty(digits),
+    non_empty(digits, first=str.isdigit),
     repetition(sequence(literal("_"), non_empty(digits))),
 )
 
@@ -5,7 +5,7 @@ from pyforma._util.find_mismatch import find_mismatch
 
 from .parse_context import ParseContext
 from .parse_result import ParseResult
-from .parser import Parser, parser
+from .parser import Definition, FirstPredicate, Parser, parser
 
 
 @overload
@@ -28,12 +28,16 @@ def literal(s: str, /) -> Parser[str]:
     """
 
     name = f'"{s}"'
+    first: FirstPredicate | None = (lambda c: c == s[0]) if s else None
 
-    @parser(name=name)
+    @parser(name=name, first=first, definition=Definition("literal", arguments=(s,)))
     def literal_parser(context: ParseContext) -> ParseResult[str]:
-        if context[: len(s)] == s:
+        if context.startswith(s):
             return ParseResult.make_success(context=context.consume(len(s)), result=s)
 
+        if not context.diagnostics:
+            return ParseResult.make_failure(context=context, expected=name)
+
         idx = find_mismatch(s, context[: len(s)])
         return ParseResult.make_failure(
             context=context,
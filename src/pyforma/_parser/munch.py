@@ -4,6 +4,15 @@ from functools import cache
 from .parse_context import ParseContext
 from .parse_result import ParseResult
 from .parser import Parser, parser
+from pyforma._util import defaulted
+
+
+def _predicate_name(predicate: Callable[[str], bool]) -> str:
+    if hasattr(predicate, "__name__"):
+        return predicate.__name__
+    elif hasattr(predicate, "__class__"):
+        return predicate.__class__.__name__
+    return "munch"
 
 
 @cache
@@ -24,12 +33,7 @@ def munch(
         non-empty prefixes. If no non-empty prefix passes the predicate, the parser returns an empty match.
     """
 
-    if name is None:
-        name = "munch"
-        if hasattr(predicate, "__name__"):
-            name = predicate.__name__
-        elif hasattr(predicate, "__class__"):
-            name = predicate.__class__.__name__
+    name = defaulted(name, _predicate_name(predicate))
 
     @parser(name=name)
     def parse_munching(context: ParseContext) -> ParseResult[str]:
@@ -42,12 +46,52 @@ def _munch_impl(
     source: ParseContext,
     predicate: Callable[[str], bool],
 ) -> ParseResult[str]:
-    remaining = source
     offset = 0
-    while not remaining.at_eof():
-        if predicate(source.peek(offset + 1)):
-            offset += 1
-            remaining = remaining.consume()
-        else:
-            break
-    return ParseResult.make_success(context=remaining, result=source.peek(offset))
+    while offset < len(source) and predicate(source.peek(offset + 1)):
+        offset += 1
+    return ParseResult.make_success(
+        context=source.consume(offset),
+        result=source.peek(offset),
+    )
+
+
+@cache
+def munch_chars(
+    predicate: Callable[[str], bool],
+    /,
+    *,
+    first: Callable[[str], bool] | None = None,
+    name: str | None = None,
+) -> Parser[str]:
+    """Creates a parser that consumes the maximal prefix of characters which all satisfy the predicate
+
+    Unlike munch(), the predicate is called once per character rather than on the whole prefix, so the parser runs in
+    time linear in the length of the match.
+
+    Args:
+        predicate: Predicate that determines whether a character is part of the parsed prefix
+        first: Optional predicate for the first character. If None, the predicate is used for all characters.
+        name: Optional name for the parser
+
+    Returns:
+        A parser that consumes the maximal prefix of characters that pass the predicate. If not even the first
+        character passes, the parser returns an empty match.
+    """
+
+    name = defaulted(name, f"munch-chars({_predicate_name(predicate)})")
+    first = defaulted(first, predicate)
+
+    @parser(name=name)
+    def parse_munching(context: ParseContext) -> ParseResult[str]:
+        source = context.source
+        end = context.index
+        if end < len(source) and first(source[end]):
+            end += 1
+            while end < len(source) and predicate(source[end]):
+                end += 1
+        return ParseResult.make_success(
+            context=context.consume(end - context.index),
+            result=source[context.index : end],
+        )
+
+    return parse_munching
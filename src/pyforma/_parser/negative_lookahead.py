@@ -1,5 +1,5 @@
 from functools import cache
-from .parser import Parser, parser
+from .parser import Definition, Parser, parser
 from .parse_result import ParseResult
 from .parse_context import ParseContext
 from pyforma._util import defaulted
@@ -7,7 +7,7 @@ from pyforma._util import defaulted
 
 @cache
 def _negative_lookahead[T](in_parser: Parser[T], /, *, name: str) -> Parser[None]:
-    @parser(name=name)
+    @parser(name=name, definition=Definition("negative_lookahead", (in_parser,)))
     def parse_negative(context: ParseContext) -> ParseResult[None]:
         r = in_parser(context)
         if r.is_failure:
@@ -1,28 +1,42 @@
 from functools import cache
-from .parser import Parser, parser
+from .parser import Definition, FirstPredicate, Parser, parser
 from .parse_result import ParseResult
 from .parse_context import ParseContext
 from pyforma._util import defaulted
 
 
 @cache
-def _non_empty[T](in_parser: Parser[T], /, *, name: str) -> Parser[T]:
-    @parser(name=name)
+def _non_empty[T](
+    in_parser: Parser[T],
+    /,
+    *,
+    name: str,
+    first: FirstPredicate | None,
+) -> Parser[T]:
+    @parser(name=name, first=first, definition=Definition("non_empty", (in_parser,)))
     def parse_non_empty(context: ParseContext) -> ParseResult[T]:
         r = in_parser(context)
-        if r.context == context:
+        if r.context.index == context.index:
             return ParseResult.make_failure(expected=name, context=context)
         return r
 
     return parse_non_empty
 
 
-def non_empty[T](in_parser: Parser[T], /, *, name: str | None = None) -> Parser[T]:
+def non_empty[T](
+    in_parser: Parser[T],
+    /,
+    *,
+    name: str | None = None,
+    first: FirstPredicate | None = None,
+) -> Parser[T]:
     """Creates a parser that behaves like the provided parser but fails on empty matches
 
     Args:
         in_parser: The base parser
         name: Optionally, the name of the parser
+        first: Optionally, a predicate the first character of any non-empty match of the base parser passes. Defaults
+               to the predicate of the base parser.
 
     Returns:
         Composed parser
@@ -30,4 +44,5 @@ def non_empty[T](in_parser: Parser[T], /, *, name: str | None = None) -> Parser[
 
     name = defaulted(name, f"non-empty({in_parser.name})")
 
-    return _non_empty(in_parser, name=name)
+    first = defaulted(first, in_parser.first)
+    return _non_empty(in_parser, name=name, first=first)
@@ -0,0 +1,184 @@
+import re
+from functools import cache
+from typing import Literal, cast
+
+from pyforma._ast.expressions import Expression, UnOpExpression, BinOpExpression
+from .parse_context import ParseContext
+from .parse_result import ParseResult
+from .parser import Parser, parser
+
+# Operator precedence levels, from the tightest binding level to the loosest one. Within a level, operators are tried
+# in order, so an operator must come before any other operator of the same level that it starts with.
+_levels: tuple[
+    tuple[Literal["unary", "binary", "comparison"], tuple[str, ...]], ...
+] = (
+    ("binary", ("**",)),
+    ("unary", ("+", "-", "~")),
+    ("binary", ("*", "//", "/", "%", "@")),
+    ("binary", ("+", "-")),
+    ("binary", ("<<", ">>")),
+    ("binary", ("&",)),
+    ("binary", ("^",)),
+    ("binary", ("|",)),
+    ("binary", ("in", "not in")),
+    ("comparison", ("==", "!=", "<=", "<", ">=", ">")),
+    ("unary", ("not",)),
+    ("binary", ("and",)),
+    ("binary", ("or",)),
+)
+
+_loosest_level = len(_levels) - 1
+_comparison_level = next(
+    i for i, (kind, _) in enumerate(_levels) if kind == "comparison"
+)
+
+
+def _alternatives(operators: tuple[str, ...]) -> str:
+    return "|".join(re.escape(op) for op in operators)
+
+
+# Prefix operators of each unary level, followed by whitespace
+_prefix_operators = {
+    level: re.compile(rf"(?P<op>{_alternatives(ops)})\s*")
+    for level, (kind, ops) in enumerate(_levels)
+    if kind == "unary"
+}
+
+# Unary levels from the loosest to the tightest one
+_prefix_levels = sorted(_prefix_operators, reverse=True)
+
+# For each level, the infix operators of that level and all looser levels, surrounded by whitespace. Each level has
+# its own named group, so the first alternative that matches identifies the tightest binding level of the operator.
+_infix_operators = tuple(
+    re.compile(
+        r"\s*(?:"
+        + "|".join(
+            rf"(?P<l{level}>{_alternatives(ops)})"
+            for level, (kind, ops) in enumerate(_levels)
+            if level >= lowest and kind != "unary"
+        )
+        + r")\s*"
+    )
+    for lowest in range(len(_levels))
+)
+
+
+@cache
+def operator_expression(operand: Parser[Expression]) -> Parser[Expression]:
+    """Creates a parser for expressions with unary and binary operators using precedence climbing.
+
+    Operators are recognized by precompiled regular expressions, operands are parsed by the given parser. The resulting
+    expressions are identical to those built by nesting one combinator per precedence level, including the
+    backtracking behavior: if the right-hand side of an operator cannot be parsed, the operator is left unconsumed and
+    only looser operators are considered at that position.
+
+    Args:
+        operand: Parser for the operands
+
+    Returns:
+        The operator expression parser. On failure, it does not provide a cause.
+    """
+
+    def parse_level(
+        context: ParseContext,
+        level: int,
+    ) -> tuple[Expression, ParseContext] | None:
+        """Parses an expression with operators up to the given level (-1 for a plain operand)."""
+
+        lhs: Expression | None = None
+        rest = context
+        lowest = 0
+
+        for prefix_level in _prefix_levels:
+            if prefix_level > level:
+                continue
+            match = _prefix_operators[prefix_level].match(context.source, context.index)
+            if match is None:
+                continue
+            result = parse_level(
+                context.consume(match.end() - context.index), prefix_level
+            )
+            if result is not None:
+                lhs = UnOpExpression(
+                    origin=context.origin(),
+                    op=cast(Literal["+", "-", "~", "not"], match["op"]),
+                    operand=result[0],
+                )
+                rest = result[1]
+                lowest = prefix_level + 1
+                break
+
+        if lhs is None:
+            r = operand(context)
+            if r.is_failure:
+                return None
+            lhs = r.success.result
+            rest = r.context
+
+        comparisons: list[BinOpExpression] = []
+        while lowest <= level:
+            match = _infix_operators[lowest].match(context.source, rest.index)
+            if match is None:
+                break
+            group = cast(str, match.lastgroup)
+            op_level = int(group[1:])
+            if op_level > level:
+                break
+
+            result = parse_level(rest.consume(match.end() - rest.index), op_level - 1)
+            if result is None:
+                lowest = op_level + 1
+                continue
+
+            op = cast(BinOpExpression.OpType, match[group])
+            if op_level == _comparison_level:
+                comparisons.append(
+                    BinOpExpression(
+                        origin=context.origin(),
+                        op=op,
+                        lhs=comparisons[-1].rhs if comparisons else lhs,
+                        rhs=result[0],
+                    )
+                )
+            else:
+                lhs = _conjunction(context, lhs, comparisons)
+                comparisons = []
+                lhs = BinOpExpression(
+                    origin=context.origin(), op=op, lhs=lhs, rhs=result[0]
+                )
+            rest = result[1]
+            lowest = op_level
+
+        return _conjunction(context, lhs, comparisons), rest
+
+    @parser(name="operator-expression")
+    def parse_operator_expression(context: ParseContext) -> ParseResult[Expression]:
+        """Parse an operator expression."""
+
+        result = parse_level(context, _loosest_level)
+        if result is None:
+            return ParseResult.make_failure(
+                expected=parse_operator_expression.name,
+                context=context,
+            )
+        return ParseResult.make_success(result=result[0], context=result[1])
+
+    return parse_operator_expression
+
+
+def _conjunction(
+    context: ParseContext,
+    lhs: Expression,
+    comparisons: list[BinOpExpression],
+) -> Expression:
+    """Joins a chain of comparisons with "and", or returns lhs if there is no chain."""
+
+    if not comparisons:
+        return lhs
+
+    result: Expression = comparisons[0]
+    for expr in comparisons[1:]:
+        result = BinOpExpression(
+            origin=context.origin(), op="and", lhs=result, rhs=expr
+        )
+    return result
@@ -2,13 +2,13 @@ from functools import cache
 
 from .parse_result import ParseResult
 from .parse_context import ParseContext
-from .parser import Parser, parser
+from .parser import Definition, Parser, parser
 from pyforma._util import defaulted
 
 
 @cache
 def _option[T](in_parser: Parser[T], /, *, name: str) -> Parser[T | None]:
-    @parser(name=name)
+    @parser(name=name, definition=Definition("option", (in_parser,)))
     def parse_option(context: ParseContext) -> ParseResult[T | None]:
         r = in_parser(context)
         if r.is_failure:
@@ -1,26 +1,44 @@
+import itertools
+import operator
+import re
+from bisect import bisect_left
 from collections.abc import Iterator
-from dataclasses import dataclass
-from typing import override
+from dataclasses import dataclass, field
+from typing import final, override
 
 from pyforma._ast.origin import Origin
+from pyforma._ast.source_text import MappedSource, SourceText
 
+from .parse_memo import ParseMemo
 
-def _line_and_column(
-    source: str,
-    index: int,
-    base_index: int = 0,
-    base_pos: tuple[int, int] = (1, 1),
-) -> tuple[int, int]:
-    """Computes the 1-based line and column of the current index in the input string"""
-    line = base_pos[0]
-    column = base_pos[1]
-    for char in source[base_index:index]:
-        if char == "\n":
-            line += 1
-            column = 1
-        else:
-            column += 1
-    return line, column
+
+@final
+class LineIndex:
+    """Resolves indices into a source string to 1-based line and column numbers.
+
+    The offsets of all line breaks are collected once, on first use, and every lookup after that is a binary search.
+    """
+
+    def __init__(self, source: str):
+        self._source: str = source
+        self._newlines: list[int] | None = None
+
+    def line_and_column(self, index: int) -> tuple[int, int]:
+        """Computes the 1-based line and column of the given index
+
+        Args:
+            index: Index into the source string
+
+        Returns:
+            Line and column of the index
+        """
+        if self._newlines is None:
+            self._newlines = [m.start() for m in re.finditer("\n", self._source)]
+
+        line = bisect_left(self._newlines, index)
+        if line == 0:
+            return 1, index + 1
+        return line + 1, index - self._newlines[line - 1]
 
 
 @dataclass(frozen=True)
@@ -29,9 +47,22 @@ class ParseContext:
 
     source: str  # Complete input string
     index: int = 0  # Index of the next character to consume
-    position: tuple[int, int] = (0, 0)  # 1-based; default means auto-compute.
     source_id: str = ""
     in_template_expr: bool = False
+    diagnostics: bool = True  # Whether failures describe what was expected and why
+    line_index: LineIndex = field(
+        default=None,  # pyright: ignore[reportAssignmentType] # Created on construction if not provided
+        compare=False,
+        repr=False,
+    )  # Shared by all contexts derived from this one
+    memo: ParseMemo = field(
+        default=None,  # pyright: ignore[reportAssignmentType] # Created on construction if not provided
+        compare=False,
+        repr=False,
+    )  # Shared by all contexts derived from this one
+    mapped_source: MappedSource | None = field(
+        default=None, compare=False, repr=False
+    )  # The mapped file the source was decoded from, if any
 
     def __post_init__(self):
         """Makes sure that the index is valid"""
@@ -40,14 +71,32 @@ class ParseContext:
                 f"index {self.index} out of range 0 ... {len(self.source)}"
             )
 
-        if self.position[0] <= 0 or self.position[1] <= 0:
-            object.__setattr__(
-                self, "position", _line_and_column(self.source, self.index)
-            )
+        if self.line_index is None:  # pyright: ignore[reportUnnecessaryComparison]
+            object.__setattr__(self, "line_index", LineIndex(self.source))
+
+        if self.memo is None:  # pyright: ignore[reportUnnecessaryComparison]
+            object.__setattr__(self, "memo", ParseMemo())
 
     def __getitem__(self, item: int | slice) -> str:
-        """Provides indexing and slicing of the remaining input"""
-        return self.source[self.index :].__getitem__(item)
+        """Provides indexing and slicing of the remaining input
+
+        Indices are translated to offsets into the complete input, so the remaining input is never copied.
+        """
+        length = self.__len__()
+        if isinstance(item, slice):
+            start, stop, step = item.indices(length)
+            start += self.index
+            stop += self.index
+            if stop < 0:  # Reverse slice running up to and including index 0
+                return self.source[start::step]
+            return self.source[start:stop:step]
+
+        item = operator.index(item)
+        if item < -length or item >= length:
+            raise IndexError("index out of range")
+        if item < 0:
+            item += length
+        return self.source[self.index + item]
 
     def __len__(self) -> int:
         """Provides the length of the remaining input"""
@@ -55,8 +104,7 @@ class ParseContext:
 
     def __iter__(self) -> Iterator[str]:
         """Provides an iterator over the remaining input"""
-        for i in range(self.__len__()):
-            yield self.__getitem__(i)
+        return itertools.islice(self.source, self.index, None)
 
     @override
     def __str__(self) -> str:
@@ -80,6 +128,30 @@ class ParseContext:
             )
         return self.source[self.index : self.index + count]
 
+    def startswith(self, prefix: str) -> bool:
+        """Checks if the remaining input starts with the given prefix, without copying any input.
+
+        Args:
+            prefix: The prefix to check for
+        """
+        return self.source.startswith(prefix, self.index)
+
+    def source_text(self, stop: int) -> str | SourceText:
+        """Provides the input from the current index up to the given index.
+
+        If the source was decoded from a mapped file, the input is not copied, but referenced in the mapping.
+
+        Args:
+            stop: Index after the last character
+        """
+        if self.mapped_source is None:
+            return self.source[self.index : stop]
+        return SourceText(
+            self.mapped_source,
+            self.mapped_source.offset(self.index),
+            self.mapped_source.offset(stop),
+        )
+
     def consume(self, count: int = 1) -> "ParseContext":
         """Consumes some of the remaining input.
 
@@ -95,20 +167,12 @@ class ParseContext:
             raise ValueError(
                 f"remaining input too short: requested {count} but is {self.__len__()}"
             )
-        index = index = self.index + count
-        pos = _line_and_column(
-            self.source,
-            index,
-            base_index=self.index,
-            base_pos=self.position,
-        )
-        return ParseContext(
-            self.source,
-            index=index,
-            position=pos,
-            source_id=self.source_id,
-            in_template_expr=self.in_template_expr,
-        )
+        # Copies the fields instead of constructing the context, as the index is known to be valid
+        consumed = object.__new__(type(self))
+        fields = consumed.__dict__
+        fields.update(self.__dict__)
+        fields["index"] = self.index + count
+        return consumed
 
     def at_eof(self) -> bool:
         """Checks if no remaining input is left."""
@@ -118,6 +182,11 @@ class ParseContext:
         """Checks if no input has been consumed yet."""
         return self.index == 0
 
+    @property
+    def position(self) -> tuple[int, int]:
+        """The 1-based line and column of the current index in the input string"""
+        return self.line_index.line_and_column(self.index)
+
     def line_and_column(self) -> tuple[int, int]:
         """Returns the 1-based line and column of the current index in the input string"""
         return self.position
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from typing import Any, final
+
+
+@final
+@dataclass(frozen=True)
+class ParseStatistics:
+    """Statistics of the packrat memo of a parse"""
+
+    memo_hits: int = 0  # Parser calls answered from the memo
+    memo_misses: int = 0  # Parser calls that ran the parser function
+    memo_entries: int = 0  # Number of results memoized by the parse
+
+    @property
+    def memo_hit_rate(self) -> float:
+        """Fraction of parser calls that were answered from the memo"""
+        calls = self.memo_hits + self.memo_misses
+        return self.memo_hits / calls if calls else 0.0
+
+
+@final
+class ParseMemo:
+    """Packrat memo table shared by all contexts of a single parse
+
+    Results are keyed by parser function, input offset and whether the parse is inside a template expression. The
+    table lives exactly as long as the parse it belongs to.
+    """
+
+    def __init__(self):
+        self.table: dict[tuple[Any, int, bool], Any] = {}  # Values are ParseResults
+        self.hits: int = 0  # Parser calls answered from the table
+        self.misses: int = 0  # Parser calls that ran the parser function
+
+    def __len__(self) -> int:
+        """Provides the number of memoized results"""
+        return len(self.table)
+
+    @property
+    def statistics(self) -> ParseStatistics:
+        """Statistics of the memo. The number of entries is only meaningful before it is cleared."""
+        return ParseStatistics(
+            memo_hits=self.hits, memo_misses=self.misses, memo_entries=len(self.table)
+        )
+
+    def clear(self) -> None:
+        """Drops all memoized results. The hit and miss counters are kept."""
+        self.table.clear()
@@ -31,6 +31,12 @@ class ParseResult(Generic[T]):
     ):
         self._value = value
         self._context = context
+        # Track the innermost failure as failures are wrapped, rather than walking the cause chain when it's needed
+        self._farthest_index = (
+            value.cause.farthest_index
+            if isinstance(value, ParseFailure) and value.cause is not None
+            else context.index
+        )
 
     @staticmethod
     def make_success(
@@ -47,6 +53,9 @@ class ParseResult(Generic[T]):
         expected: str,
         cause: "ParseResult|None" = None,
     ) -> "ParseResult[U]":
+        # Without diagnostics, failures only drive backtracking and don't need to be described
+        if not context.diagnostics:
+            return ParseResult(_undiagnosed, context=context)
         return ParseResult(
             ParseFailure(expected=expected, cause=cause),
             context=context,
@@ -56,6 +65,11 @@ class ParseResult(Generic[T]):
     def context(self) -> ParseContext:
         return self._context
 
+    @property
+    def farthest_index(self) -> int:
+        """Index of the innermost failure in the chain of causes, or of the context if there is no cause"""
+        return self._farthest_index
+
     @property
     def value(self) -> ParseSuccess[T] | ParseFailure:
         return self._value
@@ -93,3 +107,6 @@ class ParseResult(Generic[T]):
     @override
     def __hash__(self) -> int:
         return hash(self.value)
+
+
+_undiagnosed = ParseFailure(expected="<not diagnosed>")
@@ -1,7 +1,6 @@
 from collections.abc import Callable
-from dataclasses import dataclass
-from functools import lru_cache
-from typing import overload, Any, Annotated, TypeVar, Generic
+from dataclasses import dataclass, field
+from typing import overload, Any, Annotated, TypeVar, Generic, final
 
 from annotated_types import MinLen
 
@@ -10,6 +9,19 @@ from .parse_context import ParseContext
 
 T = TypeVar("T", covariant=True, default=Any)
 
+type FirstPredicate = Callable[[str], bool]
+"""Predicate on the first character of the remaining input"""
+
+
+@final
+@dataclass(frozen=True)
+class Definition:
+    """Describes how a parser is composed out of other parsers, so that the parser graph can be compiled"""
+
+    combinator: str  # Name of the combinator, e.g. "sequence"
+    parsers: tuple["Parser[Any]", ...] = ()  # The parsers the combinator is applied to
+    arguments: tuple[Any, ...] = ()  # Further arguments of the combinator
+
 
 @dataclass(frozen=True)
 class Parser(Generic[T]):
@@ -17,17 +29,47 @@ class Parser(Generic[T]):
 
     parse: Callable[[ParseContext], ParseResult[T]]  # parser function
     name: Annotated[str, MinLen(1)]  # parser name
+    first: FirstPredicate | None = None  # If set, fails unless next char passes
+    definition: Definition | None = field(
+        default=None, compare=False, repr=False
+    )  # How the parser is composed, if it is built by a compilable combinator
 
     def __call__(self, context: ParseContext) -> ParseResult[T]:
         """Parses the provided input using the parser function.
 
+        Results are memoized in the memo table of the context, so that each parser runs at most once per input offset
+        of a parse.
+
         Args:
             context: The parse context.
 
         Returns:
             The parsed result.
         """
-        return self.parse(context)
+        memo = context.memo
+        key = (self.parse, context.index, context.in_template_expr)
+        result = memo.table.get(key)
+        if result is None:
+            memo.misses += 1
+            result = self.parse(context)
+            memo.table[key] = result
+        else:
+            memo.hits += 1
+        return result
+
+
+def any_first(*predicates: FirstPredicate | None) -> FirstPredicate | None:
+    """Combines the first-character predicates of alternative parsers.
+
+    Args:
+        predicates: The predicates of the alternatives
+
+    Returns:
+        A predicate that passes if any of the given predicates does, or None if any alternative has no predicate.
+    """
+    if any(p is None for p in predicates):
+        return None
+    return lambda c: any(p(c) for p in predicates if p is not None)
 
 
 type ParserDecorator[T = Any] = Callable[
@@ -42,12 +84,16 @@ def parser[T](
     /,
     *,
     name: str | None = None,
+    first: FirstPredicate | None = None,
+    definition: Definition | None = None,
 ) -> Parser[T]:
     """Decorator that turns a function into a parser.
 
     Args:
         function: The function to be turned into a parser.
         name: Optional name for the parser. If None, the name is taken from the function name.
+        first: Optional predicate that the next character must satisfy for the parser to succeed.
+        definition: Optional description of the parser's composition, for the parser compiler.
 
     Returns:
         The parser.
@@ -58,11 +104,18 @@ def parser[T](
 
 
 @overload
-def parser[T](*, name: str) -> ParserDecorator[T]:
+def parser[T](
+    *,
+    name: str | None = None,
+    first: FirstPredicate | None = None,
+    definition: Definition | None = None,
+) -> ParserDecorator[T]:
     """Factory for parser decorators generating parsers with a certain name.
 
     Args:
-        name: Name of the parser
+        name: Name of the parser. If None, the name is taken from the function name.
+        first: Optional predicate that the next character must satisfy for the parser to succeed.
+        definition: Optional description of the parser's composition, for the parser compiler.
 
     Returns:
         A parser decorator that, when applied to a function, will turn it into a parser with the provided name.
@@ -74,11 +127,15 @@ def parser[T](
     /,
     *,
     name: str | None = None,
+    first: FirstPredicate | None = None,
+    definition: Definition | None = None,
 ) -> Parser[T] | ParserDecorator[T]:
     """Parser decorator implementation"""
 
     if function is None:
-        return lambda func, n=name: parser(func, name=n)
+        return lambda func, n=name, f=first, d=definition: parser(
+            func, name=n, first=f, definition=d
+        )
 
     if name is None:
         if hasattr(function, "__name__"):
@@ -88,4 +145,4 @@ def parser[T](
         else:  # Pathological case. Have to deliberately be un-pythonic to reach this.
             raise TypeError(f"Function {function} has no name")
 
-    return Parser(lru_cache(function), name)
+    return Parser(function, name, first, definition)
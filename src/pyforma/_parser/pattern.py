@@ -0,0 +1,35 @@
+import re
+from functools import cache
+
+from .parse_context import ParseContext
+from .parse_result import ParseResult
+from .parser import Definition, Parser, parser
+from pyforma._util import defaulted
+
+
+@cache
+def pattern(regex: str, /, *, name: str | None = None) -> Parser[str]:
+    """Creates a parser that consumes the match of a regular expression at the current position
+
+    Args:
+        regex: The regular expression
+        name: Optional name for the parser
+
+    Returns:
+        A parser that consumes the match of the regular expression. If the expression doesn't match, the parser returns
+        an empty match.
+    """
+
+    name = defaulted(name, f"pattern({regex})")
+    compiled = re.compile(regex)
+
+    @parser(name=name, definition=Definition("pattern", arguments=(compiled,)))
+    def parse_pattern(context: ParseContext) -> ParseResult[str]:
+        match = compiled.match(context.source, context.index)
+        end = context.index if match is None else match.end()
+        return ParseResult.make_success(
+            context=context.consume(end - context.index),
+            result=context.source[context.index : end],
+        )
+
+    return parse_pattern
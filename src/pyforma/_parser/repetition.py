@@ -2,13 +2,13 @@ from functools import cache
 
 from .parse_context import ParseContext
 from .parse_result import ParseResult
-from .parser import Parser, parser
+from .parser import Definition, Parser, parser
 from pyforma._util import defaulted
 
 
 @cache
 def _repetition[T](in_parser: Parser[T], /, *, name: str) -> Parser[tuple[T, ...]]:
-    @parser(name=name)
+    @parser(name=name, definition=Definition("repetition", (in_parser,)))
     def parse_repetition(context: ParseContext) -> ParseResult[tuple[T, ...]]:
         cur_context = context
         results: list[T] = []
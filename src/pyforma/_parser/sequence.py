@@ -3,7 +3,7 @@ from typing import Any, overload
 
 from .parse_result import ParseResult
 from .parse_context import ParseContext
-from .parser import Parser, parser
+from .parser import Definition, Parser, parser
 from pyforma._util import defaulted
 
 
@@ -137,7 +137,11 @@ def sequence(
 
     name = defaulted(name, f"sequence({', '.join(p.name for p in in_parsers)})")
 
-    @parser(name=name)
+    @parser(
+        name=name,
+        first=in_parsers[0].first if in_parsers else None,
+        definition=Definition("sequence", in_parsers),
+    )
     def sequence_parser(context: ParseContext) -> ParseResult[tuple[Any, ...]]:
         cur_context = context
         results: list[Any] = []
@@ -1,7 +1,7 @@
 from functools import cache
 from typing import Any, overload
 
-from .parser import Parser, parser
+from .parser import Parser, parser, any_first
 from .parse_result import ParseResult
 from .parse_context import ParseContext
 from pyforma._util import defaulted
@@ -15,7 +15,12 @@ def _switch[T, U, V](
     default: Parser[V] | None,
     name: str,
 ) -> Parser[tuple[T, U] | V]:
-    @parser(name=name)
+    first = any_first(
+        *(sp.first for sp, _ in parser_map),
+        *(() if default is None else (default.first,)),
+    )
+
+    @parser(name=name, first=first)
     def parse_switch(context: ParseContext) -> ParseResult:
         for sp, cp in parser_map:
             switch_result = sp(context)
@@ -16,6 +16,14 @@ from .template_syntax_config import TemplateSyntaxConfig
 from pyforma._ast.expressions import Expression, ValueExpression, TemplateExpression
 
 
+@cache
+def _text_block(*end_strs: str) -> Parser[ValueExpression]:
+    return transform_success(
+        non_empty(text(*end_strs)),
+        transform=lambda s, c: ValueExpression(origin=c.origin(), value=s),
+    )
+
+
 @cache
 def inner_template(
     syntax: TemplateSyntaxConfig,
@@ -29,12 +37,16 @@ def inner_template(
         The template parser
     """
 
+    end_strs = (syntax.comment.open, syntax.expression.open, syntax.environment.open)
+    parse_text = _text_block(*end_strs)
+    parse_text_in_template_expr = _text_block(*end_strs, "```")
+
     @parser(name="template")
     def _template(context: ParseContext) -> ParseResult[TemplateExpression]:
         orig_context = context
         exprs: list[Expression] = []
         while not context.at_eof():
-            if context[: len(syntax.expression.open)] == syntax.expression.open:
+            if context.startswith(syntax.expression.open):
                 result = expression_block(syntax, _template)(context)
                 if result.is_failure:
                     return ParseResult.make_failure(
@@ -44,35 +56,27 @@ def inner_template(
                     )
                 exprs.append(result.success.result)
 
-            elif context[: len(syntax.environment.open)] == syntax.environment.open:
+            elif context.startswith(syntax.environment.open):
                 result = environment(syntax, _template)(context)
                 if result.is_failure:
                     break
                 exprs.append(result.success.result)
 
-            elif context[: len(syntax.comment.open)] == syntax.comment.open:
+            elif context.startswith(syntax.comment.open):
                 result = comment(syntax.comment)(context)
                 if result.is_failure:
                     return ParseResult.make_failure(
                         expected="comment block", context=result.context, cause=result
                     )
 
-            elif context.in_template_expr and context[:3] == "```":
+            elif context.in_template_expr and context.startswith("```"):
                 break
 
             else:
-                end_strs = [
-                    syntax.comment.open,
-                    syntax.expression.open,
-                    syntax.environment.open,
-                ]
                 if context.in_template_expr:
-                    end_strs.append("```")
-                _parse_text = transform_success(
-                    non_empty(text(*end_strs)),
-                    transform=lambda s, c: ValueExpression(origin=c.origin(), value=s),
-                )
-                result = _parse_text(context)
+                    result = parse_text_in_template_expr(context)
+                else:
+                    result = parse_text(context)
                 if result.is_failure:  # pragma: no cover # should never happen
                     return ParseResult.make_failure(
                         expected="text block", context=result.context, cause=result
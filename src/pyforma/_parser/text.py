@@ -1,15 +1,21 @@
+import re
 from functools import cache
 
-from .literal import literal
-from .until import not_in
-from .parser import Parser
+from .parse_context import ParseContext
+from .parse_result import ParseResult
+from .parser import Parser, parser
+from pyforma._ast.source_text import SourceText
 from pyforma._util import defaulted
 
 
 @cache
-def text(*end_strs: str, name: str | None = None) -> Parser[str]:
+def text(*end_strs: str, name: str | None = None) -> Parser[str | SourceText]:
     """Creates a parser of unstructured text
 
+    The parser searches for the next occurrence of any of the end strings in one pass, using a single compiled
+    pattern, rather than trying each of them at every position. If the input was decoded from a mapped file, the text
+    is returned as reference into the mapping.
+
     Args:
         end_strs: syntax indicators that end unstructured text
         name: Optional parser name
@@ -19,5 +25,17 @@ def text(*end_strs: str, name: str | None = None) -> Parser[str]:
     """
 
     name = defaulted(name, f"text({', '.join(end_strs)})")
+    pattern = re.compile("|".join(re.escape(s) for s in end_strs)) if end_strs else None
+
+    @parser(name=name)
+    def parse_text(context: ParseContext) -> ParseResult[str | SourceText]:
+        match = (
+            None if pattern is None else pattern.search(context.source, context.index)
+        )
+        end = len(context.source) if match is None else match.start()
+        return ParseResult.make_success(
+            context=context.consume(end - context.index),
+            result=context.source_text(end),
+        )
 
-    return not_in(*(literal(s) for s in end_strs), name=name)
+    return parse_text
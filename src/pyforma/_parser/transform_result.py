@@ -5,7 +5,7 @@ from typing import Any, overload
 
 from .parse_result import ParseResult
 from .parse_context import ParseContext
-from .parser import Parser, parser
+from .parser import Definition, FirstPredicate, Parser, parser
 from pyforma._util import defaulted
 
 
@@ -19,14 +19,18 @@ def _wrap_transform[T, R](
 ) -> Callable[[T, ParseContext], R]: ...
 
 
-def _wrap_transform(f: Callable[..., Any]) -> Callable[..., Any]:
+def _takes_context(f: Callable[..., Any]) -> bool:
     try:
         sig = inspect.signature(f)
         amount = len(sig.parameters)
     except ValueError:  # Workaround for built-in functions
         amount = 1
 
-    if amount == 2:
+    return amount == 2
+
+
+def _wrap_transform(f: Callable[..., Any]) -> Callable[..., Any]:
+    if _takes_context(f):
         return f
     return lambda p, _: f(p)  # pyright: ignore[reportUnknownLambdaType, reportUnknownVariableType]
 
@@ -39,10 +43,12 @@ def _transform_result[T, U](
     transform: Callable[[ParseResult[T]], ParseResult[U]]
     | Callable[[ParseResult[T], ParseContext], ParseResult[U]],
     name: str,
+    first: FirstPredicate | None = None,
+    definition: Definition | None = None,
 ) -> Parser[U]:
     transform = _wrap_transform(transform)
 
-    @parser(name=name)
+    @parser(name=name, first=first, definition=definition)
     def parse_transform(context: ParseContext) -> ParseResult[U]:
         r = in_parser(context)
         return transform(r, context)
@@ -93,6 +99,9 @@ def transform_success[T, U](
     """
 
     name = defaulted(name, f"transform_success({in_parser.name}, {transform.__name__})")
+    definition = Definition(
+        "transform_success", (in_parser,), (transform, _takes_context(transform))
+    )
     transform = _wrap_transform(transform)
 
     def _transform(result: ParseResult[T], context: ParseContext) -> ParseResult[U]:
@@ -101,7 +110,13 @@ def transform_success[T, U](
             return ParseResult.make_success(context=result.context, result=transformed)
         return ParseResult(result.failure, context=result.context)
 
-    return _transform_result(in_parser, transform=_transform, name=name)
+    return _transform_result(
+        in_parser,
+        transform=_transform,
+        name=name,
+        first=in_parser.first,
+        definition=definition,
+    )
 
 
 @cache
@@ -112,13 +127,16 @@ def _transform_consumed[T, U](
     transform: Callable[[str], U] | Callable[[str, ParseContext], U],
     name: str,
 ) -> Parser[U]:
+    definition = Definition(
+        "transform_consumed", (in_parser,), (transform, _takes_context(transform))
+    )
     transform = _wrap_transform(transform)
 
-    @parser(name=name)
+    @parser(name=name, first=in_parser.first, definition=definition)
     def parse_transform(context: ParseContext) -> ParseResult[U]:
         r = in_parser(context)
         if r.is_success:
-            consumed = context[: (r.context.index - context.index)]
+            consumed = context.source[context.index : r.context.index]
             transformed = transform(consumed, context)
             return ParseResult.make_success(context=r.context, result=transformed)
         return ParseResult(r.failure, context=r.context)
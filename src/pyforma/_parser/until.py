@@ -1,3 +1,4 @@
+import re
 from functools import cache
 
 from .alternation import alternation
@@ -7,10 +8,37 @@ from .parser import Parser, parser
 from pyforma._util import defaulted
 
 
+def _start_pattern(in_parser: Parser) -> str | None:
+    """Provides a regular expression that matches wherever the parser may match, if it can be derived from the parser
+
+    The parser can only match at the start of a match of the expression, but doesn't necessarily match there.
+    """
+    definition = in_parser.definition
+    if definition is None:
+        return None
+    match definition.combinator:
+        case "literal":
+            return re.escape(definition.arguments[0])
+        case "sequence" | "transform_success" | "transform_consumed" if (
+            definition.parsers
+        ):
+            return _start_pattern(definition.parsers[0])
+        case "alternation" if definition.parsers:
+            patterns = [_start_pattern(p) for p in definition.parsers]
+            if any(p is None for p in patterns):
+                return None
+            return "|".join(f"(?:{p})" for p in patterns)
+        case _:
+            return None
+
+
 @cache
 def until(in_parser: Parser, /, *, name: str | None = None) -> Parser[str]:
     """Creates a parser consuming all input until the provided parser matches
 
+    If the delimiter starts with a literal, or an alternation of them, the input is searched for it with a compiled
+    pattern, and the delimiter parser is only tried where the search finds it, rather than at every position.
+
     Args:
          in_parser: Parser matching the delimiter
          name: Optionally, the name of the parser
@@ -20,20 +48,34 @@ def until(in_parser: Parser, /, *, name: str | None = None) -> Parser[str]:
     """
 
     name = defaulted(name, f"until({in_parser.name})")
+    start_pattern = _start_pattern(in_parser)
+    candidates = None if start_pattern is None else re.compile(start_pattern)
 
     @parser(name=name)
     def parse(context: ParseContext) -> ParseResult[str]:
-        cur_context = context
-        result = ""
-        while not cur_context.at_eof():
-            r = in_parser(cur_context)
-            if r.is_success:
-                break
-
-            result += cur_context.peek()
-            cur_context = cur_context.consume()
-
-        return ParseResult.make_success(context=cur_context, result=result)
+        source = context.source
+        if candidates is None:
+            cur_context = context
+            while not cur_context.at_eof():
+                r = in_parser(cur_context)
+                if r.is_success:
+                    break
+                cur_context = cur_context.consume()
+            end = cur_context.index
+        else:
+            end = len(source)
+            index = context.index
+            while (match := candidates.search(source, index)) is not None:
+                candidate = match.start()
+                if in_parser(context.consume(candidate - context.index)).is_success:
+                    end = candidate
+                    break
+                index = candidate + 1
+
+        return ParseResult.make_success(
+            context=context.consume(end - context.index),
+            result=source[context.index : end],
+        )
 
     return parse
 
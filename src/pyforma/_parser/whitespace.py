@@ -1,5 +1,5 @@
-from .munch import munch
+from .pattern import pattern
 
 
-whitespace = munch(str.isspace, name="whitespace")
+whitespace = pattern(r"\s*", name="whitespace")
 """Parses zero or more whitespace characters."""
@@ -1,11 +1,24 @@
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import cached_property, lru_cache, partial
 from pathlib import Path
-from typing import final, Any
+from typing import Literal, TextIO, final, Any
 
 from pyforma._ast.expressions.template_expression import TemplateExpression
 
 from ._ast import Expression
-from ._parser import ParseContext, template, TemplateSyntaxConfig
+from ._ast.async_evaluation import evaluate_async
+from ._ast.compiler import compile_expression
+from ._ast.constant_folding import fold_constants
+from ._ast.expressions.expression_impl import ExpressionImpl
+from ._ast.renderers import RendererRegistry
+from ._ast.serialization import deserialize, serialize
+from ._ast.source_text import MappedSource
+from ._ast.streaming import stream
+from ._parallel import render_in_processes
+from ._parser import ParseContext, ParseStatistics, template, TemplateSyntaxConfig
+from ._parse_cache import ParseCache
+from ._template_cache import TemplateCache
+from ._tiering import ExecutionStatistics, TieredExecution, TieringPolicy
 
 
 @final
@@ -14,21 +27,39 @@ class Template(TemplateExpression):  # pyright: ignore[reportUninitializedInstan
 
     default_renderers = ((str, str), (int, str), (float, str))
 
+    template_cache: TemplateCache | None = TemplateCache()
+    """In-memory cache of parsed templates shared by all templates, or None to always parse"""
+
+    tiering_policy: TieringPolicy = TieringPolicy()
+    """Decides when frequently rendered templates are compiled"""
+
+    _parse_statistics: ParseStatistics = (
+        ParseStatistics()
+    )  # Replaced by the statistics of the parse, if parsed
+
     def __init__(
         self,
         content: str | Path | Expression,
         /,
         *,
         syntax: TemplateSyntaxConfig | None = None,
+        parse_cache: ParseCache | None = None,
+        memory_map: bool = False,
     ) -> None:
         """Initialize a templated text file
 
         Args:
             content: The contents of the template file as string, or a file path to read.
             syntax: Syntax configuration if the default syntax is not applicable.
+            parse_cache: Optional persistent cache to load the parsed template from, and to store it in. If the
+                template cannot be stored, it is still parsed.
+            memory_map: If a path is passed, map the file into memory instead of reading it. Static text is then kept
+                as reference into the mapping and only decoded when rendered, so that the template doesn't hold the
+                text of very large files. Parsing still decodes the whole file once, so it needs memory for its text
+                while it runs. The file must be UTF-8 encoded, and its line endings are not translated.
 
         Raises:
-            ValueError: If the contents cannot be parsed
+            ValueError: If the contents cannot be parsed or decoded
             OSError: If a path is passed and the file cannot be opened
         """
         match content:
@@ -40,17 +71,52 @@ class Template(TemplateExpression):  # pyright: ignore[reportUninitializedInstan
                 return
             case Path():
                 source_id = str(content)
-                content = content.read_text()
+                if memory_map:
+                    mapped_source = MappedSource(content)
+                    content = mapped_source.decode()
+                else:
+                    mapped_source = None
+                    content = content.read_text()
             case _:
                 source_id = ""
+                mapped_source = None
 
         if syntax is None:
             syntax = TemplateSyntaxConfig()
 
+        # Mapped templates reference their file, so they are not shared
+        template_cache = Template.template_cache if mapped_source is None else None
+
+        cached = None
+        if template_cache is not None:
+            cached = template_cache.load(content, source_id=source_id, syntax=syntax)
+        if cached is None and parse_cache is not None:
+            cached = parse_cache.load(content, source_id=source_id, syntax=syntax)
+            if cached is not None and template_cache is not None:
+                template_cache.store(
+                    content, cached, source_id=source_id, syntax=syntax
+                )
+        if cached is not None:
+            super().__init__(origin=cached.origin, content=cached.content)
+            return
+
         parse = template(syntax)
-        result = parse(ParseContext(source=content, source_id=source_id))
+        context = ParseContext(
+            source=content,
+            source_id=source_id,
+            diagnostics=False,
+            mapped_source=mapped_source,
+        )
+        result = parse(context)
+        parse_statistics = context.memo.statistics
+        context.memo.clear()  # The memo is specific to this parse, don't keep it alive
 
         if result.is_failure:
+            # Parse again, this time describing every failure, to report the syntax error
+            context = ParseContext(source=content, source_id=source_id)
+            result = parse(context)
+            context.memo.clear()
+
             exception_message = "Invalid template syntax"
             while result:
                 line, column = result.context.line_and_column()
@@ -60,10 +126,19 @@ class Template(TemplateExpression):  # pyright: ignore[reportUninitializedInstan
                 result = result.failure.cause
             raise ValueError(exception_message)
 
-        super().__init__(
-            origin=result.success.result.origin,
-            content=result.success.result.content,
-        )
+        # Constant expressions are evaluated once, here, instead of by every render
+        parsed = fold_constants(result.success.result)
+
+        if template_cache is not None:
+            template_cache.store(content, parsed, source_id=source_id, syntax=syntax)
+        if parse_cache is not None:
+            try:
+                parse_cache.store(content, parsed, source_id=source_id, syntax=syntax)
+            except OSError:  # The cache is only an optimization
+                pass
+
+        super().__init__(origin=parsed.origin, content=parsed.content)
+        object.__setattr__(self, "_parse_statistics", parse_statistics)
 
     def substitute(
         self,
@@ -85,10 +160,7 @@ class Template(TemplateExpression):  # pyright: ignore[reportUninitializedInstan
             TypeError: If variable substitution leads to an unsupported operation, such as an operator not supported for that type
         """
 
-        if renderers is None:
-            renderers = Template.default_renderers
-        else:
-            renderers = tuple(renderers) + Template.default_renderers
+        renderers = _registry(renderers)
 
         expr = super().simplify(variables, renderers=renderers)
         return Template(expr)
@@ -116,12 +188,316 @@ class Template(TemplateExpression):  # pyright: ignore[reportUninitializedInstan
         if variables is None:
             variables = {}
 
-        if renderers is None:
-            renderers = Template.default_renderers
+        renderers = _registry(renderers)
+
+        function = self._execution.function(
+            renderers, Template.tiering_policy, self._compile
+        )
+        if function is not None:
+            return function(variables)
+        return self._interpret(variables, renderers)
+
+    def render_many(
+        self,
+        variables: Iterable[dict[str, Any]],
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]] | None = None,
+        executor: Literal["inline", "process"] = "inline",
+        workers: int | None = None,
+        chunksize: int = 256,
+    ) -> Iterator[str]:
+        """Render the template once for every set of variables
+
+        The renderers are prepared and the template is compiled once for all renders, like by compile(). The compiled
+        template is kept, so later renders with the same renderers use it as well. The renders happen lazily, when the
+        results are retrieved.
+
+        With the process executor, the template is rendered in a pool of worker processes. The template and the
+        renderers are sent to every worker once, and the variables are sent in chunks. The template, the renderers and
+        the variables must be picklable.
+
+        Args:
+            variables: The variables to substitute, one dictionary per render
+            renderers: Renderers to use for substitution
+            executor: Whether to render in this process, or in a pool of worker processes
+            workers: Number of worker processes, or None for one per CPU
+            chunksize: Number of sets of variables sent to a worker process at once
+
+        Returns:
+            An iterator over the rendered templates, in the order of the variables
+
+        Raises:
+            ValueError: If some variables in the template remain unresolved after substitution
+            ValueError: If a variable cannot be substituted due to missing renderer
+            ValueError: If workers or chunksize is not positive
+            TypeError: If variable substitution leads to an unsupported operation, such as an operator not supported for that type
+        """
+        if executor == "process":
+            renderer = partial(_render_batch, self, renderers)
+            for result in render_in_processes(
+                renderer, variables, workers=workers, chunksize=chunksize
+            ):
+                self._execution.count()
+                yield result
+            return
+
+        renderers = _registry(renderers)
+
+        function = self._execution.prepare(
+            renderers, Template.tiering_policy, self._compile
+        )
+        for v in variables:
+            self._execution.count()
+            yield function(v)
+
+    async def render_async(
+        self,
+        variables: dict[str, Any] | None = None,
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]] | None = None,
+        max_concurrency: int | None = None,
+    ) -> str:
+        """Render the template to string, awaiting awaitable values
+
+        Calls and attributes that result in awaitables, such as calls of coroutine functions, are awaited. Independent
+        expressions, such as the elements of a list or the contents of a template, are evaluated concurrently. Lambdas
+        are evaluated synchronously, but awaitables returned from their calls are awaited. If the variables don't bind
+        all identifiers of the template, it is rendered like by render(), without awaiting awaitables.
+
+        Args:
+            variables: The variables to substitute
+            renderers: Renderers to use for substitution
+            max_concurrency: Maximum number of awaitables awaited at the same time, or None for no limit
+
+        Returns:
+            The rendered template as string
+
+        Raises:
+            ValueError: If some variables in the template remain unresolved after substitution
+            ValueError: If a variable cannot be substituted due to missing renderer
+            ValueError: If max_concurrency is not positive
+            TypeError: If variable substitution leads to an unsupported operation, such as an operator not supported for that type
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+
+        if variables is None:
+            variables = {}
+
+        renderers = _registry(renderers)
+
+        if not self.unresolved_identifiers() <= variables.keys():
+            # Substituted first, so that unused branches may refer to unbound identifiers and errors are reported alike
+            return self._interpret(variables, renderers)
+
+        value = await evaluate_async(self, variables, renderers, max_concurrency)
+        # TemplateExpression.evaluate always returns a str
+        assert isinstance(value, str)
+        return value
+
+    def render_iter(
+        self,
+        variables: dict[str, Any] | None = None,
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]] | None = None,
+    ) -> Iterator[str]:
+        """Render the template piece by piece
+
+        The pieces join to the text that render() returns. The bodies of for-environments are rendered one iteration
+        at a time, and mapped text is decoded in chunks, so the output never needs to be held in memory at once. Errors
+        are raised when the piece that causes them is rendered, after the preceding pieces have been yielded.
+
+        Args:
+            variables: The variables to substitute
+            renderers: Renderers to use for substitution
+
+        Returns:
+            An iterator over the rendered pieces
+
+        Raises:
+            ValueError: If some variables in the template remain unresolved after substitution
+            ValueError: If a variable cannot be substituted due to missing renderer
+            TypeError: If variable substitution leads to an unsupported operation, such as an operator not supported for that type
+        """
+        if variables is None:
+            variables = {}
+
+        renderers = _registry(renderers)
+
+        if self.unresolved_identifiers() <= variables.keys():
+            yield from stream(self, variables, renderers)
         else:
-            renderers = tuple(renderers) + Template.default_renderers
+            yield self._interpret(variables, renderers)
+
+    def render_to(
+        self,
+        file: TextIO,
+        variables: dict[str, Any] | None = None,
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]] | None = None,
+        buffer_size: int = 1 << 16,
+    ) -> None:
+        """Render the template into a file
+
+        The pieces rendered by render_iter() are collected until they reach the buffer size, and then written at once.
+
+        Args:
+            file: The file to write to
+            variables: The variables to substitute
+            renderers: Renderers to use for substitution
+            buffer_size: Number of characters to collect before writing them
+
+        Raises:
+            ValueError: If some variables in the template remain unresolved after substitution
+            ValueError: If a variable cannot be substituted due to missing renderer
+            TypeError: If variable substitution leads to an unsupported operation, such as an operator not supported for that type
+        """
+        buffer: list[str] = []
+        buffered = 0
+        for piece in self.render_iter(variables, renderers=renderers):
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= buffer_size:
+                _ = file.write("".join(buffer))
+                buffer.clear()
+                buffered = 0
+        if buffer:
+            _ = file.write("".join(buffer))
+
+    def compile(
+        self,
+        *,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]] | None = None,
+    ) -> Callable[[dict[str, Any] | None], str]:
+        """Compile the template into a Python function that renders it
+
+        Python source code is generated from the template and executed once, so that rendering doesn't need to walk
+        the template. The function renders like render() and raises the same errors. If not all identifiers of the
+        template are substituted, it falls back to the interpreter.
+
+        Frequently rendered templates are compiled automatically, see tiering_policy. Compiling explicitly avoids
+        waiting for the promotion.
+
+        Args:
+            renderers: Renderers to use for substitution
+
+        Returns:
+            A function that takes the variables to substitute and returns the rendered template as string
+        """
+        renderers = _registry(renderers)
 
-        value = self.evaluate(variables, renderers=renderers)
+        function = self._compile(renderers)
+
+        def render(variables: dict[str, Any] | None = None) -> str:
+            return function({} if variables is None else variables)
+
+        return render
+
+    def dumps(self) -> bytes:
+        """Serialize the template to a compact binary format
+
+        The format is versioned and keeps the origins of all expressions, so that errors raised by a loaded template
+        point to the original source. Substituted values must be plain data, importable objects such as functions and
+        classes defined at module level, modules, expressions, functions created by lambda expressions, or containers
+        of such values. Memory-mapped text is stored as text.
+
+        Returns:
+            The serialized template
+
+        Raises:
+            ValueError: If the template contains a value that cannot be serialized
+        """
+        return serialize(self)
+
+    @staticmethod
+    def loads(data: bytes) -> "Template":
+        """Load a template serialized by dumps()
+
+        Loading is much faster than parsing the template again. Importable objects are imported by name, so only data
+        from trusted sources must be loaded.
+
+        Args:
+            data: The serialized template
+
+        Returns:
+            The loaded template
+
+        Raises:
+            ValueError: If the data is not a serialized template, or was serialized with an unsupported format version
+        """
+        return Template(deserialize(data))
+
+    @property
+    def execution_statistics(self) -> ExecutionStatistics:
+        """Execution statistics of this template, including the tier it is rendered with"""
+        return self._execution.statistics
+
+    @property
+    def parse_statistics(self) -> ParseStatistics:
+        """Statistics of parsing this template. Templates that weren't parsed, like cached ones, report no parse."""
+        return self._parse_statistics
+
+    @cached_property
+    def _execution(self) -> TieredExecution:
+        return TieredExecution()
+
+    def _interpret(
+        self,
+        variables: dict[str, Any],
+        renderers: tuple[tuple[type, Callable[[Any], str]], ...],
+    ) -> str:
+        if self.unresolved_identifiers() <= variables.keys():
+            value = self.evaluate(variables, renderers=renderers)
+        else:
+            # Substitute first: unused branches may refer to unresolved identifiers, and errors are reported as usual
+            value = ExpressionImpl.evaluate(self, variables, renderers=renderers)
         # TemplateExpression.evaluate always returns a str
         assert isinstance(value, str)
         return value
+
+    def _compile(
+        self,
+        renderers: tuple[tuple[type, Callable[[Any], str]], ...],
+    ) -> Callable[[dict[str, Any]], str]:
+        evaluate = compile_expression(self, renderers)
+        unresolved = self.unresolved_identifiers()
+
+        def render(variables: dict[str, Any]) -> str:
+            if evaluate is not None and unresolved <= variables.keys():
+                return evaluate(variables)
+            return self._interpret(variables, renderers)
+
+        return render
+
+
+def _render_batch(
+    template: Template,
+    renderers: Sequence[tuple[type, Callable[[Any], str]]] | None,
+    variables: list[dict[str, Any]],
+) -> list[str]:
+    """Renders a template for a batch of variables in a worker process"""
+    return list(template.render_many(variables, renderers=renderers))
+
+
+@lru_cache(maxsize=64)
+def _shared_registry(
+    renderers: tuple[tuple[type, Callable[[Any], str]], ...],
+    default_renderers: tuple[tuple[type, Callable[[Any], str]], ...],
+) -> RendererRegistry:
+    return RendererRegistry(renderers + default_renderers)
+
+
+def _registry(
+    renderers: Sequence[tuple[type, Callable[[Any], str]]] | None,
+) -> RendererRegistry:
+    """Appends the default renderers to the given renderers.
+
+    Renders with the same renderers share their registry, so that the renderer of every type is only looked up once.
+    The default renderers are part of the key, so the registries are replaced when they change.
+    """
+    renderers = () if renderers is None else tuple(renderers)
+    default_renderers = tuple(Template.default_renderers)
+    try:
+        return _shared_registry(renderers, default_renderers)
+    except TypeError:  # Unhashable renderers cannot be shared
+        return RendererRegistry(renderers + default_renderers)
@@ -0,0 +1,194 @@
+import dataclasses
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, final
+
+from pyforma._ast.expressions.template_expression import TemplateExpression
+from pyforma._parser import TemplateSyntaxConfig
+
+
+@final
+@dataclass(frozen=True)
+class TemplateCacheStatistics:
+    """Usage statistics of a template cache"""
+
+    hits: int = 0  # Number of templates found in the cache
+    misses: int = 0  # Number of templates not found in the cache
+    evictions: int = 0  # Number of templates dropped to stay within the limits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_max_sampled = 256  # Number of parts of a template's content measured to approximate the size of its tree
+
+
+def _memory_size(source: str, template: TemplateExpression) -> int:
+    """Approximates the memory held by a cache entry: its source, and the tree of the parsed template.
+
+    The trees of at most _max_sampled evenly spaced parts of the template's content are measured, so that the cost of
+    storing a template doesn't grow with its length.
+    """
+    content = template.content
+    sampled = content[:: max(1, len(content) // _max_sampled)]
+    fields: dict[type, tuple[str, ...]] = {}
+    seen: set[int] = set()
+    pending: list[Any] = list(sampled)
+    tree_size = 0
+    while pending:
+        obj: object = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        tree_size += sys.getsizeof(obj)
+        match obj:
+            case str() | int() | float():
+                pass
+            case tuple() | list() | set() | frozenset():
+                pending.extend(obj)  # pyright: ignore[reportUnknownArgumentType]
+            case dict():
+                pending.extend(obj.keys())  # pyright: ignore[reportUnknownArgumentType]
+                pending.extend(obj.values())  # pyright: ignore[reportUnknownArgumentType]
+            case _:
+                t = type(obj)
+                if t not in fields:
+                    fields[t] = (
+                        tuple(f.name for f in dataclasses.fields(t))
+                        if dataclasses.is_dataclass(t)
+                        else ()
+                    )
+                pending.extend(getattr(obj, name) for name in fields[t])
+    if sampled:
+        tree_size = tree_size * len(content) // len(sampled)
+    return (
+        sys.getsizeof(source)
+        + sys.getsizeof(template)
+        + sys.getsizeof(content)
+        + tree_size
+    )
+
+
+@final
+class TemplateCache:
+    """Bounded in-memory cache of parsed templates.
+
+    Entries are keyed by the template source, its source id and the syntax configuration. If the cache exceeds its
+    limits, the least recently used entries are evicted. The size of an entry is approximated by the memory size of its
+    source and of the tree of the parsed template. Parsed templates are immutable, so they are shared by everyone who
+    loads them. All methods are thread-safe.
+    """
+
+    def __init__(
+        self, *, max_entries: int | None = 256, max_size: int | None = 64 * 2**20
+    ):
+        """Creates an empty cache
+
+        Args:
+            max_entries: Maximum number of entries, or None for no limit
+            max_size: Maximum total size of the entries in bytes, or None for no limit. Defaults to 64 MiB.
+        """
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[
+            tuple[str, str, TemplateSyntaxConfig], tuple[TemplateExpression, int]
+        ] = OrderedDict()
+        self._size = 0
+        self._statistics = TemplateCacheStatistics()
+
+    def __len__(self) -> int:
+        """Provides the number of cached templates"""
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total size of the entries in bytes"""
+        return self._size
+
+    @property
+    def statistics(self) -> TemplateCacheStatistics:
+        """Usage statistics of this cache"""
+        return self._statistics
+
+    def load(
+        self,
+        source: str,
+        *,
+        source_id: str,
+        syntax: TemplateSyntaxConfig,
+    ) -> TemplateExpression | None:
+        """Loads a parsed template from the cache
+
+        Args:
+            source: The template source
+            source_id: The source id the template was parsed with
+            syntax: The syntax the template was parsed with
+
+        Returns:
+            The parsed template, or None if it isn't cached
+        """
+        key = (source, source_id, syntax)
+        with self._lock:
+            entry = self._entries.get(key)
+            s = self._statistics
+            if entry is None:
+                self._statistics = TemplateCacheStatistics(
+                    hits=s.hits, misses=s.misses + 1, evictions=s.evictions
+                )
+                return None
+            self._entries.move_to_end(key)
+            self._statistics = TemplateCacheStatistics(
+                hits=s.hits + 1, misses=s.misses, evictions=s.evictions
+            )
+            return entry[0]
+
+    def store(
+        self,
+        source: str,
+        template: TemplateExpression,
+        *,
+        source_id: str,
+        syntax: TemplateSyntaxConfig,
+    ) -> None:
+        """Stores a parsed template in the cache, evicting the least recently used entries if necessary
+
+        Args:
+            source: The template source
+            template: The parsed template
+            source_id: The source id the template was parsed with
+            syntax: The syntax the template was parsed with
+        """
+        key = (source, source_id, syntax)
+        size = _memory_size(source, template)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = (template, size)
+            self._size += size
+
+            evictions = 0
+            while (
+                self._max_entries is not None and len(self._entries) > self._max_entries
+            ) or (self._max_size is not None and self._size > self._max_size):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                evictions += 1
+
+            if evictions:
+                s = self._statistics
+                self._statistics = TemplateCacheStatistics(
+                    hits=s.hits, misses=s.misses, evictions=s.evictions + evictions
+                )
+
+    def clear(self) -> None:
+        """Drops all entries. The statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -3,14 +3,15 @@ from itertools import chain, islice, product, starmap
 from math import hypot, sin, sqrt, log, cos, tan
 import re
 from collections import deque, namedtuple
-from collections.abc import Sequence, Callable
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from datetime import datetime, date, timedelta
 from functools import cache
 from pathlib import Path
 from statistics import mean, median, stdev
-from typing import Any
+from typing import Any, Literal
 
 from pyforma._parser import TemplateSyntaxConfig
+from pyforma._parse_cache import ParseCache
 from pyforma._template import Template
 from pyforma._util import defaulted
 
@@ -19,8 +20,9 @@ from pyforma._util import defaulted
 def _load(
     canonical_path: Path,
     syntax: TemplateSyntaxConfig | None = None,
+    parse_cache: ParseCache | None = None,
 ) -> Template:
-    return Template(canonical_path, syntax=syntax)
+    return Template(canonical_path, syntax=syntax, parse_cache=parse_cache)
 
 
 class TemplateContext:
@@ -32,6 +34,7 @@ class TemplateContext:
         default_variables: dict[str, Any] | None = None,
         default_renderers: Sequence[tuple[type, Callable[[Any], str]]] | None = None,
         base_path: Path | None = None,
+        parse_cache: ParseCache | None = None,
     ):
         """Constructs a new context
 
@@ -39,6 +42,7 @@ class TemplateContext:
             default_variables: Default variables to use for substitution and rendering
             default_renderers: Default renderers to use for substitution and rendering
             base_path: Base path for template loading
+            parse_cache: Optional persistent cache of parsed templates, used for template loading
         """
 
         self._variables: dict[str, Any] = defaulted(default_variables, dict[str, Any]())
@@ -46,6 +50,7 @@ class TemplateContext:
             defaulted(default_renderers, set[tuple[type, Callable[[Any], str]]]())
         )
         self._base_path: Path | None = base_path
+        self._parse_cache: ParseCache | None = parse_cache
 
     def load_template(
         self,
@@ -56,7 +61,8 @@ class TemplateContext:
     ) -> Template:
         """Load a template from file
 
-        The loaded files are cached; every unique file is only retrieved from disk and parsed once.
+        The loaded files are cached; every unique file is only retrieved from disk and parsed once. If the context has a
+        parse cache, files parsed by earlier processes are loaded from it instead of being parsed again.
 
         Args:
             path: Path to the template file
@@ -76,9 +82,9 @@ class TemplateContext:
             path = base_path / path
 
         path = path.resolve()
-        return _load(path, syntax)
+        return _load(path, syntax, self._parse_cache)
 
-    def unresolved_identifiers(self, template: Template) -> set[str]:
+    def unresolved_identifiers(self, template: Template) -> frozenset[str]:
         """Provides access to the set of unresolved identifiers in the template
 
         Args:
@@ -88,7 +94,7 @@ class TemplateContext:
             A set of unresolved identifiers in the template without identifiers set as variables in this context.
         """
 
-        return template.unresolved_identifiers() - self._variables.keys()
+        return template.unresolved_identifiers().difference(self._variables)
 
     def substitute(
         self,
@@ -141,6 +147,83 @@ class TemplateContext:
         _renderers = list({*defaulted(renderers, ()), *self._renderers})
         return template.render(_variables, renderers=_renderers)
 
+    def render_many(
+        self,
+        template: Template,
+        *,
+        variables: Iterable[dict[str, Any]],
+        renderers: Sequence[tuple[type, Callable[[Any], str]]] | None = None,
+        executor: Literal["inline", "process"] = "inline",
+        workers: int | None = None,
+        chunksize: int = 256,
+    ) -> Iterator[str]:
+        """Render the template once for every set of variables
+
+        The defaults are prepared once for all renders. See Template.render_many() for details.
+
+        Args:
+            template: The template to render
+            variables: The variables to substitute, one dictionary per render
+            renderers: Renderers to use for substitution
+            executor: Whether to render in this process, or in a pool of worker processes
+            workers: Number of worker processes, or None for one per CPU
+            chunksize: Number of sets of variables sent to a worker process at once
+
+        Returns:
+            An iterator over the rendered templates, in the order of the variables
+
+        Raises:
+            ValueError: If some variables in the template remain unresolved after substitution
+            ValueError: If a variable cannot be substituted due to missing renderer
+            ValueError: If workers or chunksize is not positive
+            TypeError: If variable substitution leads to an unsupported operation, such as an operator not supported for that type
+        """
+        # Only the defaults that the template refers to are merged into every set of variables
+        defaults = {
+            iden: self._variables[iden]
+            for iden in template.unresolved_identifiers()
+            if iden in self._variables
+        }
+        _renderers = list({*defaulted(renderers, ()), *self._renderers})
+        return template.render_many(
+            (defaults | v for v in variables),
+            renderers=_renderers,
+            executor=executor,
+            workers=workers,
+            chunksize=chunksize,
+        )
+
+    async def render_async(
+        self,
+        template: Template,
+        *,
+        variables: dict[str, Any] | None = None,
+        renderers: Sequence[tuple[type, Callable[[Any], str]]] | None = None,
+        max_concurrency: int | None = None,
+    ) -> str:
+        """Render the template to string, awaiting awaitable values
+
+        Args:
+            template: The template to render
+            variables: The variables to substitute
+            renderers: Renderers to use for substitution
+            max_concurrency: Maximum number of awaitables awaited at the same time, or None for no limit
+
+        Returns:
+            The rendered template as string
+
+        Raises:
+            ValueError: If some variables in the template remain unresolved after substitution
+            ValueError: If a variable cannot be substituted due to missing renderer
+            ValueError: If max_concurrency is not positive
+            TypeError: If variable substitution leads to an unsupported operation, such as an operator not supported for that type
+        """
+        _variables = self._variables | defaulted(variables, dict[str, Any]())
+        _renderers = list({*defaulted(renderers, ()), *self._renderers})
+        return await template.render_async(
+            _variables, renderers=_renderers, max_concurrency=max_concurrency
+        )
+
 
 def _make_var(fn: Callable[..., Any]) -> tuple[str, Any]:
     return (fn.__name__, fn)
@@ -239,6 +322,7 @@ class DefaultTemplateContext(TemplateContext):
         default_variables: dict[str, Any] | None = None,
         default_renderers: Sequence[tuple[type, Callable[[Any], str]]] | None = None,
         base_path: Path | None = None,
+        parse_cache: ParseCache | None = None,
     ):
         """Constructs a new context
 
@@ -246,6 +330,7 @@ class DefaultTemplateContext(TemplateContext):
             default_variables: Additional default variables to use for substitution and rendering
             default_renderers: Additional default renderers to use for substitution and rendering
             base_path: Base path for template loading
+            parse_cache: Optional persistent cache of parsed templates, used for template loading
         """
 
         _variables = DefaultTemplateContext._default_variables | defaulted(
@@ -261,4 +346,5 @@ class DefaultTemplateContext(TemplateContext):
             default_variables=_variables,
             default_renderers=_renderers,
             base_path=base_path,
+            parse_cache=parse_cache,
         )
@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Literal, final, override
+
+type ExecutionTier = Literal["interpreted", "compiling", "compiled"]
+"""How a template is rendered: interpreted, interpreted while being compiled, or compiled"""
+
+type _Renderers = tuple[tuple[type, Callable[[Any], str]], ...]
+type _RenderFunction = Callable[[dict[str, Any]], str]
+
+_max_counted = 64  # Number of sets of renderers whose renders are counted per template until they are compiled
+
+
+@final
+@dataclass(frozen=True)
+class TieringPolicy:
+    """Decides when templates are promoted from interpretation to compiled execution.
+
+    Compiling a template takes about as long as rendering it a few dozen times, so templates are interpreted until they
+    have been rendered often enough to pay off.
+    """
+
+    compile_threshold: int | None = (
+        100  # Render that triggers compilation, or None to never compile
+    )
+    background: bool = (
+        True  # Compile in a background thread instead of during the triggering render
+    )
+    max_compiled: int = 16  # Number of compiled functions kept per template, for different sets of renderers
+
+
+@final
+@dataclass(frozen=True)
+class ExecutionStatistics:
+    """Execution statistics of a template"""
+
+    renders: int = 0  # Number of renders
+    tier: ExecutionTier = "interpreted"  # How the template is currently rendered
+    compile_time: float = 0.0  # Total seconds spent compiling the template
+
+
+@cache
+def _executor() -> ThreadPoolExecutor:
+    """The thread that compiles templates in the background"""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyforma-compiler")
+
+
+@final
+class TieredExecution:
+    """Counts the renders of a template and promotes it to compiled execution according to a tiering policy.
+
+    A template is compiled separately for every set of renderers it is rendered with, once it has been rendered often
+    enough with that set. The least recently used compiled functions are dropped. All methods are thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._renders = 0
+        self._compile_time = 0.0
+        # Renders per set of renderers that is not compiled yet
+        self._counts: OrderedDict[_Renderers, int] = OrderedDict()
+        self._functions: OrderedDict[
+            _Renderers, _RenderFunction | Literal["compiling", "failed"]
+        ] = OrderedDict()
+
+    @override
+    def __reduce__(self) -> tuple[Any, ...]:
+        return TieredExecution, ()  # Execution state is not transferred
+
+    @property
+    def statistics(self) -> ExecutionStatistics:
+        """Execution statistics of the template"""
+        with self._lock:
+            functions = self._functions.values()
+            if any(callable(f) for f in functions):
+                tier: ExecutionTier = "compiled"
+            elif "compiling" in functions:
+                tier = "compiling"
+            else:
+                tier = "interpreted"
+            return ExecutionStatistics(
+                renders=self._renders, tier=tier, compile_time=self._compile_time
+            )
+
+    def function(
+        self,
+        renderers: _Renderers,
+        policy: TieringPolicy,
+        compile: Callable[[_Renderers], _RenderFunction],
+    ) -> _RenderFunction | None:
+        """Counts a render and provides the compiled function to run it with
+
+        Args:
+            renderers: The renderers of the render
+            policy: The tiering policy that decides whether the template is compiled
+            compile: Compiles the template for a set of renderers
+
+        Returns:
+            The compiled function, or None if the render needs to be interpreted
+        """
+        with self._lock:
+            self._renders += 1
+            try:
+                function = self._functions.get(renderers)
+            except TypeError:  # Renderers that cannot be hashed cannot be looked up
+                return None
+            if function is not None:
+                self._functions.move_to_end(renderers)
+                return function if callable(function) else None
+            threshold = policy.compile_threshold
+            if threshold is None:
+                return None
+            count = self._counts.pop(renderers, 0) + 1
+            if count < threshold:
+                self._counts[renderers] = count
+                if len(self._counts) > _max_counted:
+                    _ = self._counts.popitem(last=False)
+                return None
+            self._functions[renderers] = "compiling"
+
+        if policy.background:
+            _ = _executor().submit(self._promote, renderers, policy, compile)
+            return None
+        try:
+            return self._promote(renderers, policy, compile)
+        except Exception:  # Rendered by the interpreter instead
+            return None
+
+    def prepare(
+        self,
+        renderers: _Renderers,
+        policy: TieringPolicy,
+        compile: Callable[[_Renderers], _RenderFunction],
+    ) -> _RenderFunction:
+        """Provides the compiled function for a set of renderers, compiling it right away if necessary
+
+        Renders run with the function must be counted with count().
+
+        Args:
+            renderers: The renderers to compile the template for
+            policy: The tiering policy that limits the number of compiled functions
+            compile: Compiles the template for a set of renderers
+
+        Returns:
+            The compiled function
+        """
+        with self._lock:
+            try:
+                function = self._functions.get(renderers)
+            except TypeError:  # Renderers that cannot be hashed cannot be looked up
+                return compile(renderers)
+            if callable(function):
+                self._functions.move_to_end(renderers)
+                return function
+            self._functions[renderers] = "compiling"
+        return self._promote(renderers, policy, compile)
+
+    def count(self) -> None:
+        """Counts a render run with a function provided by prepare()"""
+        with self._lock:
+            self._renders += 1
+
+    def _promote(
+        self,
+        renderers: _Renderers,
+        policy: TieringPolicy,
+        compile: Callable[[_Renderers], _RenderFunction],
+    ) -> _RenderFunction:
+        start = time.perf_counter()
+        try:
+            function = compile(renderers)
+        except Exception:
+            # Not compiled again automatically, renders keep being interpreted
+            with self._lock:
+                self._functions[renderers] = "failed"
+                self._trim(policy)
+            raise
+        with self._lock:
+            self._functions[renderers] = function
+            self._functions.move_to_end(renderers)
+            self._trim(policy)
+            self._compile_time += time.perf_counter() - start
+        return function
+
+    def _trim(self, policy: TieringPolicy) -> None:
+        """Drops the least recently used compiled functions beyond the limit of the policy"""
+        while len(self._functions) > max(policy.max_compiled, 1):
+            _ = self._functions.popitem(last=False)
+
+
+def wait_for_background_compilation() -> None:
+    """Blocks until all templates whose compilation has started in the background are compiled"""
+    _ = _executor().submit(lambda: None).result()
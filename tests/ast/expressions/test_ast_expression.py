@@ -0,0 +1,198 @@
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, final, override
+
+import pytest
+
+from pyforma import Template, TemplateSyntaxConfig
+from pyforma._ast import (
+    BinOpExpression,
+    Expression,
+    ForExpression,
+    IdentifierExpression,
+    TemplateExpression,
+    ValueExpression,
+    WithExpression,
+)
+from pyforma._ast.expressions.expression_impl import ExpressionImpl
+from pyforma._ast.origin import Origin
+from pyforma._ast.source_text import MappedSource, SourceText
+from pyforma._parser import ParseContext, template
+
+_origin = Origin(position=(1, 1))
+
+
+def _mk_expr[T: Expression](cls: type[T], **kwargs: Any) -> T:
+    return cls(origin=_origin, **kwargs)
+
+
+def test_unresolved_identifiers_are_stored(monkeypatch: pytest.MonkeyPatch):
+    calls: list[Expression] = []
+    collect = IdentifierExpression._collect_unresolved_identifiers  # pyright: ignore[reportPrivateUsage]
+
+    def counting_collect(self: IdentifierExpression) -> frozenset[str]:
+        calls.append(self)
+        return collect(self)
+
+    monkeypatch.setattr(
+        IdentifierExpression, "_collect_unresolved_identifiers", counting_collect
+    )
+
+    foo = _mk_expr(IdentifierExpression, identifier="foo")
+    expr = _mk_expr(
+        WithExpression,
+        bindings=((("bar",), foo),),
+        expr=_mk_expr(
+            BinOpExpression,
+            op="+",
+            lhs=_mk_expr(IdentifierExpression, identifier="bar"),
+            rhs=foo,
+        ),
+    )
+    unresolved = expr.unresolved_identifiers()
+    assert unresolved == frozenset({"foo"})
+    assert isinstance(unresolved, frozenset)
+    assert expr.unresolved_identifiers() is unresolved
+    assert len(calls) == 2  # Once per distinct identifier node
+
+
+def test_stored_unresolved_identifiers_are_invisible():
+    expr = _mk_expr(IdentifierExpression, identifier="foo")
+    other = _mk_expr(IdentifierExpression, identifier="foo")
+    _ = expr.unresolved_identifiers()
+    assert expr == other
+    assert hash(expr) == hash(other)
+    assert repr(expr) == repr(other)
+
+    copy = pickle.loads(pickle.dumps(expr))
+    assert copy == expr
+    assert copy.unresolved_identifiers() == {"foo"}
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{{ -a }}",
+        "{{ a + 1 }}",
+        "{{ a.b }}",
+        "{{ a[1] }}",
+        "{{ f(1, x=a) }}",
+        "{{ [a, 1] }}",
+        "{{ {a: 1} }}",
+        "{% if a %}x{{ a }}{% elif b %}{{ b }}{% else %}{{ c }}{% endif %}",
+        "{% for x in a %}{{ x }}y{% endfor %}",
+        "{% with x = a; y = b %}{{ x }}{{ c }}{% endwith %}",
+        "{{ lambda x: x + a }}",
+        "{{```x{{ a }}y```}}",
+    ],
+)
+def test_simplify_skips_unaffected(source: str):
+    template = Template(source + "{{ z }}")
+    result = template.substitute({"z": "", "x": 1, "y": 2})
+    assert result.content[0] is template.content[0]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{{ -1 }}",
+        "{{ -(a + [1][0]) }}",
+        "{{ 1 + 1 }}",
+        "{{ (1).real }}",
+        "{{ (a + [1][0]).real }}",
+        "{{ [1][0] }}",
+        "{{ f(1) }}",
+        "{{ f([1]) }}",
+        "{{ f({1: 1}) }}",
+        "{% if 1 %}x{{ a }}{% endif %}",
+        "{% if a %}x{% endif %}",
+        "{% if a %}{{ a }}{% elif 0 %}{{ a }}{% endif %}",
+        "{% if a %}{{ a }}{% elif b %}x{% endif %}",
+        "{% for x in [1] %}{{ x }}{{ a }}{% endfor %}",
+        "{% with x = 1 %}{{ x }}{{ a }}{% endwith %}",
+        "{% with x = a %}y{% endwith %}",
+        "{{ f(lambda x: x) }}",
+        "{{ f(lambda x: x + a + [1][0]) }}",
+        "{{```x```}}",
+        "{{```{{ 1 }}{{ a }}```}}",
+        "{{```x{{ (1) }}{{ a }}```}}",
+        "{{```{{ a }}x{{ 'y' }}```}}",
+        "{{```{{ -1 }}{{ a }}```}}",
+    ],
+)
+def test_simplify_doesnt_skip_unsimplified(source: str):
+    # Templates fold constants when they are constructed, so the parse result is used as it is
+    parse = template(TemplateSyntaxConfig())
+    parsed = Template(parse(ParseContext(source=source + "{{ z }}")).success.result)
+    result = parsed.substitute({"z": "", "f": str})
+    assert result.content[0] is not parsed.content[0]
+
+
+def test_simplify_keeps_source_text(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("foo")
+    text = _mk_expr(ValueExpression, value=SourceText(MappedSource(path), 0, 3))
+    expr = _mk_expr(
+        TemplateExpression,
+        content=(
+            _mk_expr(ValueExpression, value="x"),
+            text,
+            _mk_expr(ValueExpression, value="y"),
+            _mk_expr(IdentifierExpression, identifier="a"),
+        ),
+    )
+    assert expr.simplify({"b": 1}, renderers=Template.default_renderers) is expr
+
+
+@final
+@dataclass(frozen=True, kw_only=True)
+class _Opaque(ExpressionImpl):
+    """Expression that doesn't report whether it is simplified"""
+
+    @override
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset()
+
+    @override
+    def simplify(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Any,
+    ) -> Expression:
+        return self
+
+
+def test_simplify_doesnt_skip_unknown_expressions():
+    expr = _mk_expr(
+        BinOpExpression,
+        op="+",
+        lhs=_mk_expr(_Opaque),
+        rhs=_mk_expr(IdentifierExpression, identifier="a"),
+    )
+    assert expr.simplify({}, renderers=Template.default_renderers) is not expr
+
+
+def test_simplify_skips_substituted():
+    template = Template("{% if a %}x{% endif %}{{ z }}").substitute({"z": ""})
+    result = template.substitute({"z": 1})
+    assert result.content[0] is template.content[0]
+
+
+def test_simplify_skips_unaffected_loop():
+    loop = _mk_expr(
+        ForExpression,
+        var_names=("x",),
+        iter_expr=_mk_expr(IdentifierExpression, identifier="a"),
+        expr=_mk_expr(IdentifierExpression, identifier="x"),
+    )
+    expr = _mk_expr(
+        BinOpExpression,
+        op="+",
+        lhs=loop,
+        rhs=_mk_expr(IdentifierExpression, identifier="z"),
+    )
+    result = expr.simplify({"z": [], "x": 1}, renderers=Template.default_renderers)
+    assert isinstance(result, BinOpExpression)
+    assert result.lhs is loop
@@ -1,3 +1,4 @@
+import pickle
 from collections.abc import Callable
 from contextlib import nullcontext
 from typing import ContextManager, Any
@@ -231,3 +232,79 @@ def test_evaluate(
     with validator as e:
         expr = _mk_expr(LambdaExpression, **kwargs)
         assert e(expr.evaluate(vars, renderers=Template.default_renderers))
+
+
+def test_evaluate_unresolved():
+    expr = _mk_expr(
+        LambdaExpression,
+        parameters=("foo",),
+        return_value=_mk_expr(IdentifierExpression, identifier="bar"),
+    )
+    with pytest.raises(ValueError):
+        _ = expr.evaluate({}, renderers=Template.default_renderers)
+
+
+def test_evaluate_invalid_call():
+    expr = _mk_expr(
+        LambdaExpression,
+        parameters=("foo",),
+        return_value=_mk_expr(IdentifierExpression, identifier="foo"),
+    )
+    fn = expr.evaluate({}, renderers=Template.default_renderers)
+    with pytest.raises(TypeError):
+        _ = fn()  # Missing argument
+    with pytest.raises(TypeError):
+        _ = fn(1, foo=2)  # Duplicate argument
+
+
+def test_evaluate_captures_variables():
+    expr = _mk_expr(
+        LambdaExpression,
+        parameters=(),
+        return_value=_mk_expr(IdentifierExpression, identifier="foo"),
+    )
+    vars = dict(foo=1)
+    fn = expr.evaluate(vars, renderers=Template.default_renderers)
+    vars["foo"] = 2
+    assert fn() == 1
+    assert fn(foo=3) == 1  # Only parameters can be passed
+
+
+@pytest.mark.parametrize("substitute", [False, True])
+def test_function_pickle(substitute: bool):
+    expr = _mk_expr(
+        LambdaExpression,
+        parameters=("x",),
+        return_value=_mk_expr(
+            BinOpExpression,
+            op="*",
+            lhs=_mk_expr(IdentifierExpression, identifier="x"),
+            rhs=_mk_expr(IdentifierExpression, identifier="foo"),
+        ),
+    )
+    variables = dict(foo=3, unused=lambda: None)  # Unused variables are not captured
+    if substitute:
+        value = expr.simplify(variables, renderers=Template.default_renderers)
+        assert isinstance(value, ValueExpression)
+        fn = value.value
+    else:
+        fn = expr.evaluate(variables, renderers=Template.default_renderers)
+    copy: object = pickle.loads(pickle.dumps(fn))
+    assert callable(copy)
+    assert copy(2) == fn(2) == 6
+    assert repr(fn).startswith("<function ")
+    assert repr(type(copy)) == repr(type(fn)) == "<class 'function'>"  # pyright: ignore[reportUnknownArgumentType]
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_constant_errors_raised_on_creation(compiled: bool):
+    # Like simplify(), evaluation simplifies the body when the function is created, not when it is called
+    template = Template("x{% if (lambda y: 0 or 0[2.5]) %}y{% endif %}")
+    render = template.compile() if compiled else template.render
+    with pytest.raises(TypeError, match=r"^:1:24: Invalid indexing expression"):
+        _ = render({})
+
+
+def test_error_messages():
+    with pytest.raises(TypeError, match=r"of type <class 'function'> and 1 of type"):
+        _ = Template("{{ (lambda y: y) + 1 }}").render()
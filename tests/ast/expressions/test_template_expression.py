@@ -1,15 +1,21 @@
+import itertools
+from collections.abc import Callable
 from contextlib import nullcontext
+from pathlib import Path
 from typing import ContextManager, Any
 
 import pytest
 
 from pyforma._ast import (
+    CallExpression,
     Expression,
     IdentifierExpression,
     TemplateExpression,
 )
+from pyforma._ast.expressions.expression_impl import ExpressionImpl
 from pyforma._ast.expressions.value_expression import ValueExpression
 from pyforma._ast.origin import Origin
+from pyforma._ast.source_text import MappedSource, SourceText
 from pyforma._template import Template
 
 _origin = Origin(position=(1, 1))
@@ -139,6 +145,31 @@ def test_simplify(
             dict(foo=42, bar="bar"),
             nullcontext("42bar"),
         ),
+        (
+            dict(content=(_mk_expr(IdentifierExpression, identifier="foo"),)),
+            dict(foo=None),
+            pytest.raises(ValueError, match="No renderer"),
+        ),
+        (
+            dict(content=(_mk_expr(IdentifierExpression, identifier="foo"),)),
+            {},
+            pytest.raises(ValueError, match="Failed to evaluate"),
+        ),
+        (  # Inserted expressions are evaluated like by simplify()
+            dict(content=(_mk_expr(IdentifierExpression, identifier="foo"),)),
+            dict(foo=_mk_expr(ValueExpression, value="bar")),
+            nullcontext("bar"),
+        ),
+        (
+            dict(
+                content=(
+                    _mk_expr(ValueExpression, value="foo"),
+                    _mk_expr(IdentifierExpression, identifier="foo"),
+                )
+            ),
+            dict(foo=_mk_expr(ValueExpression, value="bar")),
+            pytest.raises(ValueError, match="Failed to evaluate"),
+        ),
     ],
 )
 def test_evaluate(
@@ -149,3 +180,60 @@ def test_evaluate(
     with expected as e:
         expr = _mk_expr(TemplateExpression, **kwargs)
         assert expr.evaluate(vars, renderers=Template.default_renderers) == e
+
+
+def test_evaluate_inserted(tmp_path: Path):
+    # Templates with inserted expressions are evaluated like by simplify(), evaluating every part once
+    path = tmp_path / "text.txt"
+    _ = path.write_text("abc")
+    text = SourceText(MappedSource(path), 0, 3)
+    calls: list[int] = []
+
+    def f() -> int:
+        calls.append(1)
+        return 1
+
+    variables: dict[str, Any] = {
+        "s": "s",
+        "t": text,
+        "i": _mk_expr(ValueExpression, value="i"),
+        "m": _mk_expr(ValueExpression, value=text),
+        "n": _mk_expr(ValueExpression, value=None),
+        "e": _mk_expr(IdentifierExpression, identifier="x"),
+        "f": f,
+    }
+    parts = [
+        _mk_expr(ValueExpression, value="v"),
+        _mk_expr(ValueExpression, value=text),
+        *(_mk_expr(IdentifierExpression, identifier=iden) for iden in "stimne"),
+        _mk_expr(
+            CallExpression,
+            callee=_mk_expr(IdentifierExpression, identifier="f"),
+            arguments=(),
+            kw_arguments=(),
+        ),
+    ]
+    for n in range(4):
+        for content in itertools.product(parts, repeat=n):
+            expr = _mk_expr(TemplateExpression, content=content)
+
+            def outcome(evaluate: Callable[[], Any]) -> tuple[str, Any, int]:
+                calls.clear()
+                try:
+                    return "ok", evaluate(), len(calls)
+                except ValueError as ex:
+                    return "ValueError", str(ex), len(calls)
+
+            expected = outcome(
+                lambda: ExpressionImpl.evaluate(
+                    expr, variables, renderers=Template.default_renderers
+                )
+            )
+            actual = outcome(
+                lambda: expr.evaluate(variables, renderers=Template.default_renderers)
+            )
+            if expected[0] == "ok" and not isinstance(expected[1], str):
+                # Inserting a single value that isn't text doesn't result in text
+                assert actual[0] == "ValueError"
+            else:
+                assert actual == expected, content
@@ -0,0 +1,358 @@
+import itertools
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, final, override
+
+import pytest
+
+from pyforma import Template
+from pyforma._ast import (
+    AttributeExpression,
+    CallExpression,
+    Expression,
+    IdentifierExpression,
+    IfExpression,
+    TemplateExpression,
+    ValueExpression,
+)
+from pyforma._ast.compiler import (
+    compile_expression,
+    generate_source,
+)
+from pyforma._ast.origin import Origin
+from pyforma._ast.source_text import MappedSource, SourceText
+
+_origin = Origin(position=(1, 1))
+_renderers = Template.default_renderers
+
+
+def _mk_expr[T: Expression](cls: type[T], **kwargs: Any) -> T:
+    return cls(origin=_origin, **kwargs)
+
+
+def _outcome(fn: Callable[[], Any]) -> tuple[str, Any]:
+    try:
+        return "ok", fn()
+    except Exception as ex:
+        return type(ex).__name__, str(ex)
+
+
+def _arguments(*args: Any, **kwargs: Any) -> str:
+    return f"{args}{kwargs}"
+
+
+class _Text(str):
+    pass
+
+
+@final
+@dataclass(frozen=True, kw_only=True)
+class _Custom(Expression):
+    """Expression type the compiler doesn't know"""
+
+    @override
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset(("foo",))
+
+    @override
+    def simplify(
+        self,
+        variables: dict[str, Any],
+        *,
+        renderers: Any,
+    ) -> Expression:
+        return self  # pragma: no cover # not used
+
+    @override
+    def evaluate(self, variables: dict[str, Any], *, renderers: Any) -> Any:
+        return f"custom {variables['foo']}"
+
+
+@pytest.mark.parametrize(
+    "source,variables",
+    [
+        ("", {}),
+        ("foo", {}),
+        ("foo{{bar}}baz", {"bar": 42}),
+        ("foo{{bar}}baz", {"bar": 4.2}),
+        ("foo{{bar}}baz", {"bar": _Text("text")}),
+        ("{{bar}}", {"bar": None}),
+        ("{{bar}}", {"bar": [1]}),
+        ("{{ -a }}{{ +a }}{{ ~a }}{{ not a }}", {"a": 3}),
+        ("{{ -a }}", {"a": "x"}),
+        (
+            "{{ a ** b }}{{ a // b }}{{ a % b }}{{ a << b }}{{ a & b }}",
+            {"a": 7, "b": 2},
+        ),
+        (
+            "{{ a and b }}{{ a or b }}{{ a in c }}{{ a not in c }}",
+            {"a": 0, "b": 2, "c": [0]},
+        ),
+        ("{{ a < b }}{{ a == b }}{{ a != b }}", {"a": 1, "b": "1"}),
+        ("{{ a + b }}", {"a": 1, "b": "1"}),
+        ("{{ a[1] }}{{ a[-1] }}", {"a": [1, 2]}),
+        ("{{ a[5] }}", {"a": [1, 2]}),
+        ("{{ a.real }}{{ a.imag }}", {"a": 3}),
+        ("{{ a.nope }}", {"a": 3}),
+        ("{{ f(1, 2, x=3) }}", {"f": _arguments}),
+        ("{{ f(1) }}", {"f": 1}),
+        ("{{ [a, 1][0] }}{{ {a: 1}[a] }}", {"a": 2}),
+        ("{{ {[]: 1} }}", {}),
+        ("{% if a %}A{% elif b %}B{% else %}C{% endif %}", {"a": 0, "b": 1}),
+        ("{% if a %}A{% elif b %}B{% endif %}", {"a": 0, "b": 0}),
+        ("{% for x in xs %}[{{x}}]{% endfor %}", {"xs": range(4)}),
+        ("{% for x, y in xs %}[{{x}}{{y}}]{% endfor %}", {"xs": [(1, 2), "ab"]}),
+        ("{% for x, y in xs %}[{{x}}{{y}}]{% endfor %}", {"xs": [(1, 2, 3)]}),
+        (
+            "{% for x in xs %}{% for x in x %}{{x}}{% endfor %}{{x}}{% endfor %}",
+            {"xs": ["ab", "cd"]},
+        ),
+        ("{% for x in xs %}{% endfor %}", {"xs": 1}),
+        ("{% with a = b; b = a %}{{a}}{{b}}{% endwith %}", {"a": 1, "b": 2}),
+        ("{% with a, b = c %}{{a}}{{b}}{% endwith %}", {"c": [1, 2]}),
+        ("{{ with a, b = c: a + b }}", {"c": [1]}),
+        ("{{ (with a = c: a) + 1 }}", {"c": 1}),
+        (
+            "{% with m = lambda x: x + y %}{{ m(1) }}{{ m(x=2) }}{% endwith %}",
+            {"y": 40},
+        ),
+        (
+            "{% for y in ys %}{% with m = lambda x: x + y %}{{ m(1) }}{% endwith %}{% endfor %}",
+            {"ys": [1, 2]},
+        ),
+        ("{{ (lambda x: x)() }}", {}),
+        ("{{```a{{b}}c```}}", {"b": "z"}),
+        ("{{ t }}", {"t": Template("{{ a }}"), "a": 1}),
+        ("{{ t }}x", {"t": Template("{{ a }}"), "a": 1}),
+        ("{{ t }}", {"t": ValueExpression(origin=_origin, value="v")}),
+        ("{{ undefined }}", {}),
+        ("{% if x %}x{% else %}{{ undefined }}{% endif %}", {"x": True}),
+    ],
+)
+def test_compiled_template(source: str, variables: dict[str, Any]):
+    template = Template(source)
+    render = template.compile()
+    expected = _outcome(lambda: template.render(variables))
+    assert _outcome(lambda: render(variables)) == expected
+
+
+def test_compiled_template_without_variables():
+    assert Template("foo").compile()(None) == "foo"
+
+
+def test_compiled_template_with_renderers():
+    template = Template("{{ a }}{{ b }}")
+    renderers: list[tuple[type, Callable[[Any], Any]]] = [
+        (list, lambda v: ",".join(map(str, v))),
+        (dict, len),  # Doesn't return a str
+    ]
+    render = template.compile(renderers=renderers)
+    assert render({"a": [1, 2], "b": ""}) == "1,2"
+    expected = _outcome(
+        lambda: template.render({"a": [], "b": {}}, renderers=renderers)
+    )
+    assert _outcome(lambda: render({"a": [], "b": {}})) == expected
+
+
+def _hex(value: int) -> str:
+    return hex(value)
+
+
+@pytest.mark.parametrize(
+    "renderers,expected",
+    [
+        ((), "1 True 1.5"),
+        (((bool, str), (int, _hex)), "0x1 True 1.5"),
+        (((float, repr), (int, _hex)), "0x1 0x1 1.5"),
+    ],
+)
+def test_compiled_template_overriding_renderers(
+    renderers: tuple[tuple[type, Callable[[Any], str]], ...], expected: str
+):
+    # Values of type int and float are rendered by str, unless renderers for them precede the default renderers
+    template = Template("{{ a }} {{ b }} {{ c }}")
+    render = template.compile(renderers=renderers)
+    variables = {"a": 1, "b": True, "c": 1.5}
+    assert render(variables) == template.render(variables, renderers=renderers)
+    assert render(variables) == expected
+
+
+def test_compiled_memory_mapped_template(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("föo{{ bar }}baß")
+    template = Template(path, memory_map=True)
+    assert template.compile()({"bar": 1}) == "föo1baß"
+
+
+def test_compiled_source_text(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("föo")
+    text = SourceText(MappedSource(path), 0, 4)
+    expr = _mk_expr(
+        IfExpression,
+        cases=(
+            (
+                _mk_expr(IdentifierExpression, identifier="x"),
+                _mk_expr(ValueExpression, value=text),
+            ),
+        ),
+    )
+    evaluate = compile_expression(expr, _renderers)
+    assert evaluate is not None
+    # Like by the interpreter, the text is kept as reference until it is joined to a template
+    assert evaluate({"x": True}) is text
+    assert Template("{{ t }}").compile()({"t": text}) == "föo"
+
+
+def test_compiled_template_nested_too_deeply():
+    expr: Expression = _mk_expr(ValueExpression, value="x")
+    for _ in range(120):
+        expr = _mk_expr(
+            IfExpression,
+            cases=((_mk_expr(IdentifierExpression, identifier="x"), expr),),
+        )
+    template = Template(_mk_expr(TemplateExpression, content=(expr,)))
+    assert compile_expression(template, _renderers) is None
+    assert template.compile()({"x": True}) == "x"
+
+
+@pytest.mark.parametrize(
+    "expr,variables",
+    [
+        (_mk_expr(_Custom), {"foo": 1}),
+        (
+            _mk_expr(
+                TemplateExpression,
+                content=(_mk_expr(_Custom), _mk_expr(ValueExpression, value="x")),
+            ),
+            {"foo": 1},
+        ),
+        (
+            _mk_expr(
+                AttributeExpression,
+                object=_mk_expr(ValueExpression, value={}),
+                attribute="__class__",
+            ),
+            {},
+        ),
+        (
+            _mk_expr(
+                AttributeExpression,
+                object=_mk_expr(ValueExpression, value=Origin),
+                attribute="class",
+            ),
+            {},
+        ),
+        (
+            _mk_expr(
+                CallExpression,
+                callee=_mk_expr(ValueExpression, value=dict),
+                arguments=(),
+                kw_arguments=(
+                    ("class", _mk_expr(ValueExpression, value=1)),
+                    ("x y", _mk_expr(ValueExpression, value=2)),
+                ),
+            ),
+            {},
+        ),
+        (
+            _mk_expr(
+                CallExpression,
+                callee=_mk_expr(ValueExpression, value=dict),
+                arguments=(),
+                kw_arguments=(
+                    ("a", _mk_expr(ValueExpression, value=1)),
+                    ("a", _mk_expr(ValueExpression, value=2)),
+                ),
+            ),
+            {},
+        ),
+        (_mk_expr(IfExpression, cases=()), {}),
+        (
+            _mk_expr(
+                IfExpression,
+                cases=(
+                    (
+                        _mk_expr(ValueExpression, value=False),
+                        _mk_expr(ValueExpression, value=1),
+                    ),
+                    (
+                        _mk_expr(IdentifierExpression, identifier="foo"),
+                        _mk_expr(ValueExpression, value=2),
+                    ),
+                    (
+                        _mk_expr(ValueExpression, value=True),
+                        _mk_expr(ValueExpression, value=3),
+                    ),
+                ),
+            ),
+            {"foo": 0},
+        ),
+        (
+            _mk_expr(
+                TemplateExpression,
+                content=(_mk_expr(IdentifierExpression, identifier="foo"),),
+            ),
+            {"foo": 1},
+        ),
+    ],
+)
+def test_compiled_expression(expr: Expression, variables: dict[str, Any]):
+    evaluate = compile_expression(expr, _renderers)
+    assert evaluate is not None
+    expected = _outcome(lambda: expr.evaluate(variables, renderers=_renderers))
+    assert _outcome(lambda: evaluate(variables)) == expected
+
+
+def test_compiled_expression_inserting_expression(tmp_path: Path):
+    path = tmp_path / "text.txt"
+    _ = path.write_text("abc")
+    text = SourceText(MappedSource(path), 0, 3)
+    calls: list[int] = []
+
+    def f() -> int:
+        calls.append(1)
+        return 1
+
+    variables: dict[str, Any] = {
+        "s": "s",
+        "t": text,
+        "i": _mk_expr(ValueExpression, value="i"),
+        "m": _mk_expr(ValueExpression, value=text),
+        "e": _mk_expr(IdentifierExpression, identifier="x"),
+        "f": f,
+    }
+    parts = [
+        _mk_expr(ValueExpression, value="v"),
+        _mk_expr(ValueExpression, value=text),
+        *(_mk_expr(IdentifierExpression, identifier=iden) for iden in "stime"),
+        _mk_expr(
+            CallExpression,
+            callee=_mk_expr(IdentifierExpression, identifier="f"),
+            arguments=(),
+            kw_arguments=(),
+        ),
+    ]
+
+    def outcome(evaluate: Callable[[], Any]) -> tuple[tuple[str, Any], int]:
+        calls.clear()
+        return _outcome(evaluate), len(calls)
+
+    # Expressions are inserted like by the interpreter, without evaluating anything again
+    for n in range(4):
+        for content in itertools.product(parts, repeat=n):
+            expr = _mk_expr(TemplateExpression, content=content)
+            compiled = compile_expression(expr, _renderers)
+            assert compiled is not None
+            evaluate = compiled
+            expected = outcome(lambda: expr.evaluate(variables, renderers=_renderers))
+            assert outcome(lambda: evaluate(variables)) == expected
+
+
+def test_generate_source():
+    source, namespace = generate_source(Template("a{{ b }}c"), _renderers)
+    assert "def evaluate(variables):" in source
+    assert "variables['b']" in source
+    assert "a" in namespace.values()
+    assert namespace["_str_types"] == {int, float}
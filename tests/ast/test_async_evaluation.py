@@ -0,0 +1,252 @@
+import asyncio
+import itertools
+import re
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, final
+
+import pytest
+
+from pyforma import Template
+from pyforma._ast import (
+    CallExpression,
+    IdentifierExpression,
+    IfExpression,
+    TemplateExpression,
+    ValueExpression,
+)
+from pyforma._ast.async_evaluation import evaluate_async
+from pyforma._ast.origin import Origin
+from pyforma._ast.source_text import MappedSource, SourceText
+
+_origin = Origin(position=(1, 1))
+
+
+def _outcome(fn: Callable[[], Any]) -> tuple[str, Any]:
+    try:
+        return "ok", fn()
+    except Exception as ex:
+        return type(ex).__name__, re.sub(r"(_async)? at 0x[0-9a-f]+>", ">", str(ex))
+
+
+def _double(x: Any) -> Any:
+    return x * 2
+
+
+async def _double_async(x: Any) -> Any:
+    await asyncio.sleep(0)
+    return x * 2
+
+
+@final
+class _Loader:
+    """Object whose attributes are loaded either synchronously or asynchronously"""
+
+    def __init__(self, value: Any, awaitable: bool):
+        self._value: Any = value
+        self._awaitable = awaitable
+
+    @property
+    def value(self) -> Any:
+        if self._awaitable:
+            return _double_async(self._value // 2)
+        return self._value
+
+
+def _variables(awaitable: bool) -> dict[str, Any]:
+    return {
+        "f": _double_async if awaitable else _double,
+        "o": _Loader(4, awaitable),
+        "xs": [1, 2, 3],
+        "s": "ab",
+        "n": None,
+    }
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "",
+        "text",
+        "{{ f(1) }}",
+        "{{ f(x=1) }}",
+        "{{ o.value }}",
+        "{{ -f(1) }}",
+        "{{ f(1) + f(2) }}",
+        "{{ f(xs)[f(1)] }}",
+        "{{ [f(1), f(2), 3] }}",
+        "{{ len([f(1), f(2)]) }}",
+        "{{ {f(1): f(2)}[2] }}",
+        "{{ if f(0): 1 elif f(1): f(2) else: 3 }}",
+        "{{ for x in f(xs): f(x) }}",
+        "{% for x in xs %}[{{ f(x) }}]{% endfor %}",
+        "{% for x, y in [s, f(s)] %}{{ x }}{{ y }}{% endfor %}",
+        "{% if f(n) %}A{% else %}B{{ f(1) }}{% endif %}",
+        "{% if f(0) %}A{% elif f(1) %}B{{ f(1) }}{% endif %}",
+        "{% with a = f(1); b, c = f(s) %}{{ a }}{{ b }}{{ c }}{% endwith %}",
+        "{{ with a = f(1): a + 1 }}",
+        "{{ (lambda x: f(x))(2) }}",
+        "{{ f(s) }}{{ f(xs) }}{{ f(1) }}",
+        "{{ f(1) }}{{ f(n) }}{{ f(xs) }}",
+        "{{ f(1) }}{{ o.missing }}",
+        "{{ f(1) + n }}",
+        "{{ ~f(s) }}",
+        "{{ f(1)[s] }}",
+        "{{ if f(1): n }}",  # Values that cannot be rendered are reported where they are produced
+        "{{ if f(0): 1 }}",
+        "{{ with a = f(1): (if a: n) }}",
+    ],
+)
+def test_evaluate_async(source: str):
+    template = Template(source)
+    expected = _outcome(
+        lambda: template.render(_variables(awaitable=False) | {"len": len})
+    )
+    actual = _outcome(
+        lambda: asyncio.run(
+            template.render_async(_variables(awaitable=True) | {"len": len})
+        )
+    )
+    assert actual == expected
+
+
+def test_evaluate_async_if_not_taken():
+    expr = IfExpression(
+        origin=_origin,
+        cases=((ValueExpression(origin=_origin, value=False), Template("{{ f(1) }}")),),
+    )
+    value = asyncio.run(
+        evaluate_async(expr, _variables(True), Template.default_renderers, None)
+    )
+    assert value is None
+
+
+def test_evaluate_async_inserted_expression():
+    variables = _variables(True) | {"t": ValueExpression(origin=_origin, value="v")}
+    template = TemplateExpression(
+        origin=_origin, content=Template("{{ t }}{{ len(xs) }}").content
+    )
+    value = asyncio.run(
+        evaluate_async(
+            template, variables | {"len": len}, Template.default_renderers, None
+        )
+    )
+    assert value == "v3"
+
+
+def test_evaluate_async_inserted_expressions(tmp_path: Path):
+    path = tmp_path / "text.txt"
+    _ = path.write_text("abc")
+    text = SourceText(MappedSource(path), 0, 3)
+    calls: list[int] = []
+
+    async def f() -> int:
+        calls.append(1)
+        return 1
+
+    variables: dict[str, Any] = {
+        "s": "s",
+        "t": text,
+        "i": ValueExpression(origin=_origin, value="i"),
+        "m": ValueExpression(origin=_origin, value=text),
+        "e": IdentifierExpression(origin=_origin, identifier="x"),
+        "f": f,
+    }
+    call = CallExpression(
+        origin=_origin,
+        callee=IdentifierExpression(origin=_origin, identifier="f"),
+        arguments=(),
+        kw_arguments=(),
+    )
+    parts = [
+        ValueExpression(origin=_origin, value="v"),
+        ValueExpression(origin=_origin, value=text),
+        *(IdentifierExpression(origin=_origin, identifier=iden) for iden in "stime"),
+    ]
+
+    def outcome(evaluate: Callable[[], Any]) -> tuple[tuple[str, Any], int]:
+        calls.clear()
+        return _outcome(evaluate), len(calls)
+
+    # Expressions are inserted like by the interpreter, without evaluating anything again
+    for n in range(3):
+        for content in itertools.product(parts, repeat=n):
+            expr = TemplateExpression(origin=_origin, content=(call, *content))
+            expected = outcome(
+                lambda: expr.evaluate(
+                    variables | {"f": lambda: calls.append(1) or 1},
+                    renderers=Template.default_renderers,
+                )
+            )
+            actual = outcome(
+                lambda: asyncio.run(
+                    evaluate_async(expr, variables, Template.default_renderers, None)
+                )
+            )
+            assert actual == expected
+
+
+def test_evaluate_async_unresolved():
+    template = Template("{% if f(1) %}{{ f(1) }}{% else %}{{ undefined }}{% endif %}")
+    assert asyncio.run(template.render_async(_variables(False))) == "2"
+    assert (
+        asyncio.run(
+            evaluate_async(template, _variables(True), Template.default_renderers, None)
+        )
+        == "2"
+    )
+
+    # Reported like by render(), for the substituted template
+    template = Template("{{ f(1) }}{{ undefined }}{{ f(2) }}")
+    variables = _variables(False)
+    with pytest.raises(ValueError) as expected:
+        _ = template.render(variables)
+    with pytest.raises(ValueError) as actual:
+        _ = asyncio.run(template.render_async(variables))
+    assert str(actual.value) == str(expected.value)
+    assert str(actual.value).startswith(":1:1: Failed to evaluate expression Template(")
+
+
+def test_evaluate_async_errors():
+    async def fail() -> None:
+        raise RuntimeError("failed")
+
+    class Failing:
+        @property
+        def value(self) -> Any:
+            return fail()
+
+    with pytest.raises(TypeError, match="Invalid call expression"):
+        _ = asyncio.run(Template("{{ f() }}").render_async({"f": fail}))
+    with pytest.raises(TypeError, match="Invalid attribute expression"):
+        _ = asyncio.run(Template("{{ o.value }}").render_async({"o": Failing()}))
+
+
+@pytest.mark.parametrize("max_concurrency,expected", [(None, 4), (1, 1), (2, 2)])
+def test_evaluate_async_concurrency(max_concurrency: int | None, expected: int):
+    running = 0
+    max_running = 0
+
+    async def load(x: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return x
+
+    template = Template("{{ load(0) }}{% for x in xs %}{{ load(x) }}{% endfor %}")
+    result = asyncio.run(
+        template.render_async(
+            {"load": load, "xs": [1, 2, 3]}, max_concurrency=max_concurrency
+        )
+    )
+    assert result == "0123"
+    assert max_running == expected
+
+
+def test_evaluate_async_memory_mapped(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("föo{{ f(1) }}bar")
+    template = Template(path, memory_map=True)
+    assert asyncio.run(template.render_async(_variables(True))) == "föo2bar"
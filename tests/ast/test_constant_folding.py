@@ -0,0 +1,230 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, final, override
+
+import pytest
+
+from pyforma import Template
+from pyforma._ast import (
+    AttributeExpression,
+    CallExpression,
+    Expression,
+    ForExpression,
+    IndexExpression,
+    LambdaExpression,
+    ListExpression,
+    TemplateExpression,
+    ValueExpression,
+    WithExpression,
+)
+from pyforma._ast.constant_folding import fold_constants
+from pyforma._ast.origin import Origin
+from pyforma._ast.source_text import SourceText
+
+_origin = Origin(position=(1, 1))
+
+
+def _hex(value: int) -> str:
+    return hex(value)
+
+
+@final
+@dataclass(frozen=True, kw_only=True)
+class _Custom(Expression):
+    """Expression type the constant folding doesn't know"""
+
+    @override
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset()
+
+    @override
+    def simplify(self, variables: dict[str, Any], *, renderers: Any) -> Expression:
+        return self  # pragma: no cover # not used
+
+    @override
+    def evaluate(self, variables: dict[str, Any], *, renderers: Any) -> Any:
+        return None  # pragma: no cover # not used
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("", ()),
+        ("foo", ("foo",)),
+        ("a{{ 'b' }}c", ("abc",)),
+        ("a{# comment #}b", ("ab",)),
+        ("{{ 60 * 60 * 24 }}", (86400,)),
+        ("{{ -1.5 }}", (-1.5,)),
+        ("{{ 'ab' + 'c' }}x", ("abcx",)),
+        ("{{ ['a', 'b'][1] }}", ("b",)),
+        ("{{ {'a': 1}['a'] }}", (1,)),
+        ("{{ 'abc'[1:] }}", ("bc",)),
+        ("{{ if 1 < 2: 'yes' else: 'no' }}", ("yes",)),
+        ("{% if 1 < 2 %}yes{% else %}no{% endif %}", ("yes",)),
+        ("{% for x in ['a', 'b'] %}{{ x }},{% endfor %}", ("a,b,",)),
+        ("{% with x = 'a' * 2 %}{{ x }}{% endwith %}", ("aa",)),
+        ("{{ with x = 2: x + 3 }}", (5,)),
+        ("{{ 'ab' * 3 }}", ("ababab",)),
+        ("{{ 2 * 'ab' }}", ("abab",)),
+        ("{{ 2 ** 3 ** 2 }}", (64,)),
+        ("{{ 2 ** (-1) }}", (0.5,)),
+        ("{{ 1 << 3 }}", (8,)),
+        ("{{ 7 % 4 }}", (3,)),
+        ("{{ (for x in [1, 2]: x)[0] }}", (1,)),
+    ],
+)
+def test_folded(source: str, expected: tuple[Any, ...]):
+    template = Template(source)
+    assert all(isinstance(e, ValueExpression) for e in template.content)
+    values = tuple(e.value for e in template.content if isinstance(e, ValueExpression))
+    assert values == expected
+    assert all(type(v) is type(e) for v, e in zip(values, expected))
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{{ a }}",
+        "{{ a + 2 }}",
+        "{{ 1 / 0 }}",  # Raises the error when rendered
+        "{{ 'x'.upper() }}",  # Attributes may have side effects
+        "{{ (lambda x: x)(1) }}",
+        "{{ [1, 2] }}",  # Mutable
+        "{{ {1: 2} }}",
+        "{{ for x in [1, 2]: x }}",
+        "{% for x in [1, 2] %}{{ x }}{% endfor %}",  # Renders values other than str
+        "{% with x = 1 %}{{ x }}{% endwith %}",
+        # Values that are, or might be, too large to store with the template, or to compute while parsing
+        "{% if x %}{{ 'ab' * 300000000 == '' }}{% endif %}",
+        "{{ 300000000 * 'ab' }}",
+        "{{ ([0] * 10 ** 9)[0] }}",
+        "{{ 3 ** 100000 }}",
+        "{{ (1 << 100000) > 0 }}",
+        "{{ with x = 2: x * 3 }}",
+        "{{ '%01000000000d' % 1 }}",
+        "{{ 'a' * 4097 }}",
+        "{{ (2 ** 16000) * (2 ** 16000) }}",
+        "{% for x in ['a', 'b'] %}" + "c" * 3000 + "{% endfor %}",
+    ],
+)
+def test_not_folded(source: str):
+    template = Template(source)
+    assert not all(isinstance(e, ValueExpression) for e in template.content)
+
+
+def test_folded_sub_expressions():
+    template = Template("{{ (lambda x: x + 2 * 3)(a) }}{{ b[1:2] }}")
+    call, index = template.content
+    assert isinstance(call, CallExpression)
+    assert isinstance(call.callee, LambdaExpression)
+    assert call.callee.return_value.unresolved_identifiers() == {"x"}
+    assert isinstance(index, IndexExpression)
+    assert index.index == ValueExpression(
+        origin=index.index.origin, value=slice(1, 2, None)
+    )
+    assert template.render({"a": 1, "b": "xyz"}) == "7y"
+
+    template = Template("{% with x = 2 * 3; y = a %}{{ x }}{{ y }}{% endwith %}")
+    with_expression = template.content[0]
+    assert isinstance(with_expression, WithExpression)
+    assert isinstance(with_expression.bindings[0][1], ValueExpression)
+    assert template.render({"a": 1}) == "61"
+
+    template = Template("{{ (2 * 3).real }}")
+    (attribute,) = template.content
+    assert isinstance(attribute, AttributeExpression)
+    assert attribute.object == ValueExpression(origin=attribute.object.origin, value=6)
+    assert template.render({}) == "6"
+
+
+def test_iterated_lists():
+    template = Template("{% for x in [1, 2] %}{{ x }}{% endfor %}{{ f([1, 2]) }}")
+    join_call, call = template.content
+    assert isinstance(join_call, CallExpression)
+    loop = join_call.arguments[1]
+    assert isinstance(loop, ForExpression)
+    assert isinstance(loop.iter_expr, ValueExpression)
+    assert loop.iter_expr.value == (1, 2)
+
+    # Lists that the template passes on are created anew by every render
+    assert isinstance(call, CallExpression)
+    assert isinstance(call.arguments[0], ListExpression)
+
+    def append(xs: list[int]) -> int:
+        xs.append(3)
+        return len(xs)
+
+    assert template.render({"f": append}) == "123"
+    assert template.render({"f": append}) == "123"
+
+    template = Template(
+        "{% for x in [1, [2]] %}{{ x }}{% endfor %}{% for x in [a] %}{{ x }}{% endfor %}"
+    )
+    for e in template.content:
+        assert isinstance(e, CallExpression)
+        loop = e.arguments[1]
+        assert isinstance(loop, ForExpression)
+        assert isinstance(loop.iter_expr, ListExpression)
+
+
+def test_renderers():
+    # Values are rendered with the renderers of the render, not while folding
+    template = Template("{{ 60 * 60 }}{% if 1 %}{{ 2 }}{% endif %}{{ 0.5 + 1 }}")
+    assert template.render() == "36002" + "1.5"
+    renderers = ((int, _hex), (float, repr))
+    assert template.render(renderers=renderers) == "0xe100x21.5"
+
+
+def test_origins():
+    template = Template("x\n{{ 1 + 2 }}{{ if 1: 4 }}")
+    assert [e.origin for e in template.content] == [
+        Origin(position=(1, 1)),
+        Origin(position=(2, 4)),
+        Origin(position=(2, 21)),  # Of the value, like after substitution
+    ]
+    with pytest.raises(TypeError, match=":1:4: Invalid binary operator"):
+        _ = Template("{{ 1 // 0 }}").render()
+
+
+def test_memory_mapped(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("föo{{ 'a' }}{{ 1 + 1 }}bar")
+    template = Template(path, memory_map=True)
+    assert any(
+        isinstance(e, ValueExpression) and isinstance(e.value, SourceText)
+        for e in template.content
+    )
+    assert template.render() == "föoa2bar"
+
+
+def test_unknown_expression():
+    template = TemplateExpression(
+        origin=_origin,
+        content=(
+            ValueExpression(origin=_origin, value="a"),
+            ValueExpression(origin=_origin, value="b"),
+            _Custom(origin=_origin),
+        ),
+    )
+    assert fold_constants(template) == TemplateExpression(
+        origin=_origin,
+        content=(ValueExpression(origin=_origin, value="ab"), _Custom(origin=_origin)),
+    )
+
+
+@pytest.mark.parametrize(
+    "value,folded",
+    [
+        ((1, frozenset({2})), True),
+        ((1, [2]), False),  # Mutable values are not known to be constant
+    ],
+)
+def test_containers(value: Any, folded: bool):
+    index = IndexExpression(
+        origin=_origin,
+        expression=ValueExpression(origin=_origin, value=value),
+        index=ValueExpression(origin=_origin, value=0),
+    )
+    template = fold_constants(TemplateExpression(origin=_origin, content=(index,)))
+    expected = ValueExpression(origin=_origin, value=1) if folded else index
+    assert template.content == (expected,)
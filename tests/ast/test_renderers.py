@@ -0,0 +1,96 @@
+import pickle
+from collections.abc import Sized
+from typing import Any, override
+
+import pytest
+
+from pyforma._ast.expressions.template_expression import render
+from pyforma._ast.origin import Origin
+from pyforma._ast.renderers import RendererRegistry
+
+_origin = Origin(position=(1, 1))
+
+
+def _yes_no(value: bool) -> str:
+    return "yes" if value else "no"
+
+
+def _length(value: Sized) -> str:
+    return f"len {len(value)}"
+
+
+class _CountingMeta(type):
+    """Metaclass of classes that count how often a type is checked against them"""
+
+    checks: int = 0
+
+    @override
+    def __subclasscheck__(cls, subclass: type) -> bool:
+        _CountingMeta.checks += 1
+        return subclass is bytes
+
+
+class _Checked(metaclass=_CountingMeta):
+    pass
+
+
+_registry = RendererRegistry(
+    ((bool, _yes_no), (int, str), (float, str), (Sized, _length))
+)
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (True, "yes"),
+        (1, "1"),
+        (1.5, "1.5"),
+        ([1, 2], "len 2"),
+        ("abc", "len 3"),
+        (None, "ValueError"),
+        (1j, "ValueError"),
+    ],
+)
+def test_render(value: Any, expected: str):
+    def outcome(renderers: Any) -> str:
+        try:
+            return render(value, _origin, renderers)
+        except ValueError as ex:
+            assert str(ex) == f"{_origin}: No renderer for value of type {type(value)}"
+            return "ValueError"
+
+    # Registries render like the scan of a plain sequence of renderers
+    assert outcome(_registry) == outcome(tuple(_registry)) == expected
+
+
+def test_renderer_priority():
+    registry = RendererRegistry(((int, str), (bool, _yes_no)))
+    assert registry.renderer(bool) is str
+    assert registry.renderer(int) is str
+    assert registry.renderer(float) is None
+    assert RendererRegistry().renderer(int) is None
+
+
+def test_renderer_cache():
+    _CountingMeta.checks = 0
+    registry = RendererRegistry(((_Checked, _length),))
+    for _ in range(3):
+        assert registry.render(b"ab", _origin) == "len 2"
+        with pytest.raises(ValueError):
+            _ = registry.render(1, _origin)
+    assert _CountingMeta.checks == 2  # Once per type
+
+
+def test_registry_is_tuple():
+    assert _registry == tuple(_registry)
+    assert hash(_registry) == hash(tuple(_registry))
+    assert _registry[0] == (bool, _yes_no)
+    assert len(_registry) == 4
+
+
+def test_registry_pickle():
+    _ = _registry.render(True, _origin)
+    copy = pickle.loads(pickle.dumps(_registry))
+    assert isinstance(copy, RendererRegistry)
+    assert copy == _registry
+    assert copy.render(True, _origin) == "yes"
@@ -0,0 +1,205 @@
+import marshal
+import math
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, final, override
+
+import pytest
+
+from pyforma import Template
+from pyforma._ast import (
+    CallExpression,
+    Expression,
+    TemplateExpression,
+    ValueExpression,
+)
+from pyforma._ast.expressions.lambda_expression import LambdaFunction
+from pyforma._ast.origin import Origin
+from pyforma._ast.serialization import deserialize, serialize
+from pyforma._util import join
+
+_origin = Origin(position=(1, 1))
+
+
+def _outcome(fn: Callable[[], Any]) -> tuple[str, Any]:
+    try:
+        return "ok", fn()
+    except Exception as ex:
+        return type(ex).__name__, str(ex)
+
+
+def _twice(x: Any) -> Any:
+    return x * 2
+
+
+@final
+@dataclass(frozen=True, kw_only=True)
+class _Custom(Expression):
+    """Expression type the serialization doesn't know"""
+
+    @override
+    def _collect_unresolved_identifiers(self) -> frozenset[str]:
+        return frozenset()  # pragma: no cover # not used
+
+    @override
+    def simplify(self, variables: dict[str, Any], *, renderers: Any) -> Expression:
+        return self  # pragma: no cover # not used
+
+    @override
+    def evaluate(self, variables: dict[str, Any], *, renderers: Any) -> Any:
+        return None  # pragma: no cover # not used
+
+
+def _yes_no(value: bool) -> str:
+    return "yes" if value else "no"
+
+
+@pytest.mark.parametrize(
+    "source,variables",
+    [
+        ("", {}),
+        ("foo", {}),
+        ("foo{{ bar }}baz", {"bar": 42}),
+        ("{{ -a + b * 2 }}{{ not a }}", {"a": 1, "b": 2.5}),
+        ("{{ xs[1] }}{{ s.upper() }}", {"xs": [1, 2], "s": "ab"}),
+        ("{{ [1, a] }}{{ {'k': a}['k'] }}", {"a": None}),
+        ("{{ f('11', base=2) }}", {"f": int}),
+        ("{{ (lambda x, y: x + y)(1, a) }}", {"a": 2}),
+        ("{{ if a: 1 elif b: 2 else: 3 }}", {"a": False, "b": True}),
+        ("{{ for x, y in xs: x + y }}", {"xs": ["ab", (1, 2)]}),
+        ("{{ with a = 1; b, c = s: a + b + c }}", {"s": (2, 3)}),
+        ("{% for x in xs %}[{{ x }}]{% endfor %}", {"xs": range(3)}),
+        ("{% if a %}A{% elif b %}B{% else %}C{% endif %}", {"a": 0, "b": 1}),
+        ("{% with a = b %}{{ a }}{% endwith %}", {"b": "c"}),
+        ("{{ a + 1 }}", {"a": "not a number"}),
+    ],
+)
+def test_round_trip(source: str, variables: dict[str, Any]):
+    template = Template(source)
+    loaded = Template(deserialize(serialize(template)))
+    assert loaded == template
+    expected = _outcome(lambda: template.render(variables))
+    assert _outcome(lambda: loaded.render(variables)) == expected
+
+
+@pytest.mark.parametrize(
+    "variables",
+    [
+        {"a": None, "b": True, "c": 1, "d": 1.5, "e": 1j, "f": "s", "g": b"b"},
+        {"a": (1, [2.0], {3}, frozenset({"4"}), {"5": (6,)})},
+        {"a": _twice, "b": math, "c": math.sqrt, "d": Origin, "e": join},
+        {"a": (_twice,), "b": [math], "c": {"k": Origin}, "d": {_twice: 1}},
+        {"a": ValueExpression(origin=_origin, value=2)},
+    ],
+)
+def test_round_trip_values(variables: dict[str, Any]):
+    template = Template("{{ h(a, b, c, d, e, f, g) }}")
+    substituted = template.substitute(variables)
+    loaded = Template(deserialize(serialize(substituted)))
+    assert loaded == substituted
+
+    def value_types(t: Template) -> list[type]:
+        call = t.content[0]
+        assert isinstance(call, CallExpression)
+        return [type(a.value) for a in call.arguments if isinstance(a, ValueExpression)]
+
+    assert value_types(loaded) == value_types(substituted)
+
+
+def test_round_trip_functions():
+    template = Template(
+        "{% with f = lambda x: x * k %}{{ f(a) }}{% endwith %}{{ g(a) }}"
+    ).substitute({"k": 3, "g": _twice})
+    loaded = Template(deserialize(serialize(template)))
+    assert loaded.render({"a": 2}) == template.render({"a": 2}) == "64"
+
+    # Functions keep the renderers they were created with
+    lambda_expression = Template("{{ lambda: k }}").content[0]
+    renderers = ((bool, _yes_no),) + Template.default_renderers
+    fn = lambda_expression.evaluate({"k": True}, renderers=renderers)
+    template = Template("{{ g(f) }}").substitute({"f": fn})
+    loaded = Template(deserialize(serialize(template)))
+    call = loaded.content[0]
+    assert isinstance(call, CallExpression)
+    value = call.arguments[0]
+    assert isinstance(value, ValueExpression)
+    assert isinstance(value.value, LambdaFunction)
+    assert value.value.renderers == renderers
+    assert value.value() is True
+
+    def local(value: bool) -> str:
+        return str(value)
+
+    renderers = ((bool, local),)
+    fn = lambda_expression.evaluate({"k": True}, renderers=renderers)
+    with pytest.raises(ValueError, match="Value of type function cannot be"):
+        _ = serialize(Template("{{ g(f) }}").substitute({"f": fn}))
+
+
+def test_origins():
+    template = Template("a\n{{ b + 1 }}").substitute({})
+    loaded = Template(deserialize(serialize(template)))
+    assert loaded.content[1].origin == template.content[1].origin
+    with pytest.raises(TypeError) as error:
+        _ = loaded.render({"b": "c"})
+    assert str(error.value).startswith(f"{template.content[1].origin}:")
+
+
+def test_source_ids(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("föo{{ bar }}")
+    template = Template(path)
+    loaded = Template(deserialize(serialize(template)))
+    assert loaded == template
+    assert loaded.origin.source_id == str(path)
+
+
+def test_memory_mapped(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("föo{{ bar }}baz")
+    template = Template(path, memory_map=True)
+    loaded = Template(deserialize(serialize(template)))
+    assert loaded.render({"bar": 1}) == "föo1baz"
+    assert all(
+        type(c.value) is str for c in loaded.content if isinstance(c, ValueExpression)
+    )
+
+
+def test_unserializable_values():
+    def local() -> None:
+        pass
+
+    class Local:
+        pass
+
+    template = Template("{{ f(a) }}")
+    for value in (local, Local(), [local], lambda: None, iter(())):
+        with pytest.raises(ValueError, match="cannot be serialized"):
+            _ = serialize(template.substitute({"a": value}))
+
+
+def test_unserializable_expression():
+    template = TemplateExpression(origin=_origin, content=(_Custom(origin=_origin),))
+    with pytest.raises(ValueError, match="Expression of type _Custom"):
+        _ = serialize(template)
+
+
+def test_invalid_data():
+    data = serialize(Template("{{ a }}"))
+    header = data[:9]
+    with pytest.raises(ValueError, match="not a serialized template"):
+        _ = deserialize(b"garbage")
+    with pytest.raises(ValueError, match="Unsupported .* version 2, expected 1"):
+        _ = deserialize(data[:8] + b"\x02" + data[9:])
+    with pytest.raises(ValueError, match="Invalid serialized template"):
+        _ = deserialize(header + b"garbage")
+    for body in [
+        (("",), (99, 1, 1, 0)),  # Unknown kind
+        (("",), (0, 1, 1, 0, (99,))),  # Unknown value tag
+        (("",), (0, 1, 1, 0, (0, None))),  # Root is not a template
+        (("",), (13, 1, 1, 0, ((0, 1, 1, 0, (4, (1, 1, 1, 0, "x"), (), (), ())),))),
+    ]:
+        with pytest.raises(ValueError, match="Invalid serialized template"):
+            _ = deserialize(header + zlib.compress(marshal.dumps(body)))
@@ -0,0 +1,57 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from pyforma._ast.source_text import MappedSource, SourceText
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "",
+        "foo bar",
+        "héllo wörld",
+        "€ 𝄞 ab\ncd €",
+        "ä" * 20 + "b" * 5 + "𝄞" * 7,
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1 << 16])
+def test_mapped_source(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    content: str,
+    chunk_size: int,
+):
+    monkeypatch.setattr(MappedSource, "_chunk_size", chunk_size)
+    path = tmp_path / "template.txt"
+    _ = path.write_bytes(content.encode())
+
+    source = MappedSource(path)
+    assert source.decode() == content
+    for start in range(len(content) + 1):
+        for stop in range(start, len(content) + 1):
+            text = SourceText(source, source.offset(start), source.offset(stop))
+            assert str(text) == content[start:stop]
+            chunks = list(text.chunks())
+            assert "".join(chunks) == content[start:stop]
+            assert all(len(c.encode()) < chunk_size + 4 for c in chunks)
+
+
+def test_mapped_source_invalid_encoding(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_bytes(b"foo \xff")
+    with pytest.raises(UnicodeDecodeError):
+        _ = MappedSource(path).decode()
+
+
+def test_mapped_source_missing_file(tmp_path: Path):
+    with pytest.raises(OSError):
+        _ = MappedSource(tmp_path / "missing.txt")
+
+
+def test_source_text_pickle(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("foo bar")
+    text = SourceText(MappedSource(path), 4, 7)
+    assert pickle.loads(pickle.dumps(text)) == "bar"
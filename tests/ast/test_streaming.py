@@ -0,0 +1,182 @@
+import itertools
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pyforma import Template
+from pyforma._ast import (
+    CallExpression,
+    IdentifierExpression,
+    IfExpression,
+    TemplateExpression,
+    ValueExpression,
+)
+from pyforma._ast.origin import Origin
+from pyforma._ast.source_text import MappedSource, SourceText
+from pyforma._ast.streaming import stream
+
+_origin = Origin(position=(1, 1))
+
+
+def _outcome(fn: Callable[[], Any]) -> tuple[str, Any]:
+    try:
+        return "ok", fn()
+    except Exception as ex:
+        return type(ex).__name__, str(ex)
+
+
+@pytest.mark.parametrize(
+    "source,variables",
+    [
+        ("", {}),
+        ("foo", {}),
+        ("foo{{ bar }}baz", {"bar": 42}),
+        ("{{ bar }}", {"bar": [1]}),
+        ("{% for x in xs %}[{{ x }}]{% endfor %}", {"xs": range(3)}),
+        ("{% for x, y in xs %}{{ x }}{{ y }}{% endfor %}", {"xs": [(1, 2), "ab"]}),
+        ("{% for x in xs %}{{ x }}{% endfor %}", {"xs": 1}),
+        ("{% for x in xs %}{{ x }}{% endfor %}", {"xs": [1, None]}),
+        ("{% if a %}A{% elif b %}B{{ b }}{% else %}C{% endif %}", {"a": 0, "b": 1}),
+        ("{% if a %}A{% elif b %}B{% endif %}", {"a": 0, "b": 0}),
+        (
+            "{% with a = b; c, d = e %}{{ a }}{{ c }}{{ d }}{% endwith %}",
+            {"b": 1, "e": "xy"},
+        ),
+        ("{{ with a = b: a + 1 }}", {"b": 1}),
+        ("{{```a{{b}}c```}}", {"b": "z"}),
+        ("{{ t }}", {"t": Template("{{ a }}"), "a": 1}),
+        ("{{ t }}x", {"t": ValueExpression(origin=_origin, value="v")}),
+        ("x{{ t }}", {"t": ValueExpression(origin=_origin, value="v")}),
+        ("{{ undefined }}", {}),
+        ("{% if x %}x{% else %}{{ undefined }}{% endif %}", {"x": True}),
+    ],
+)
+def test_stream(source: str, variables: dict[str, Any]):
+    template = Template(source)
+    expected = _outcome(lambda: template.render(variables))
+    assert _outcome(lambda: "".join(template.render_iter(variables))) == expected
+
+
+def test_stream_loop_iterations():
+    template = Template("{% for x in xs %}{{ x }},{% endfor %}")
+    pieces = stream(template, {"xs": iter(range(10**9))}, Template.default_renderers)
+    assert [next(pieces) for _ in range(4)] == ["0", ",", "1", ","]
+
+
+def test_stream_if_expression_bodies():
+    expr = TemplateExpression(
+        origin=_origin,
+        content=(
+            IfExpression(
+                origin=_origin,
+                cases=(
+                    (
+                        ValueExpression(origin=_origin, value=True),
+                        ValueExpression(origin=_origin, value=42),
+                    ),
+                ),
+            ),
+        ),
+    )
+    assert list(stream(expr, {}, Template.default_renderers)) == ["42"]
+
+
+def test_stream_if_expression_not_taken():
+    false = ValueExpression(origin=_origin, value=False)
+    expr = TemplateExpression(
+        origin=_origin,
+        content=(IfExpression(origin=_origin, cases=((false, false),)),),
+    )
+    with pytest.raises(ValueError):
+        _ = list(stream(expr, {}, Template.default_renderers))
+
+
+def test_stream_loop_separator():
+    loop = Template("{% for x in xs %}{{ x }}{% endfor %}").content[0]
+    assert isinstance(loop, CallExpression)
+    separator = ValueExpression(origin=_origin, value="-")
+    expr = TemplateExpression(
+        origin=_origin,
+        content=(replace(loop, arguments=(separator, loop.arguments[1])),),
+    )
+    assert "".join(stream(expr, {"xs": "abc"}, Template.default_renderers)) == "a-b-c"
+
+
+@pytest.mark.parametrize("source", ["föo{{ t }}", "föo{{ t }}bar{{ u }}"])
+def test_stream_memory_mapped(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, source: str
+):
+    monkeypatch.setattr(MappedSource, "_chunk_size", 2)
+    path = tmp_path / "template.txt"
+    _ = path.write_text(source)
+    template = Template(path, memory_map=True)
+    variables = {"t": ValueExpression(origin=_origin, value="v"), "u": 1}
+    expected = _outcome(lambda: template.render(variables))
+    pieces = _outcome(lambda: list(template.render_iter(variables)))
+    assert (
+        pieces[0],
+        "".join(pieces[1]) if pieces[0] == "ok" else pieces[1],
+    ) == expected
+
+
+def test_stream_inserted_expressions(tmp_path: Path):
+    path = tmp_path / "text.txt"
+    _ = path.write_text("abc")
+    text = SourceText(MappedSource(path), 0, 3)
+    calls: list[int] = []
+
+    def f() -> int:
+        calls.append(1)
+        return 1
+
+    variables: dict[str, Any] = {
+        "s": "s",
+        "t": text,
+        "i": ValueExpression(origin=_origin, value="i"),
+        "m": ValueExpression(origin=_origin, value=text),
+        "e": IdentifierExpression(origin=_origin, identifier="x"),
+        "f": f,
+    }
+    parts = [
+        ValueExpression(origin=_origin, value="v"),
+        ValueExpression(origin=_origin, value=text),
+        *(IdentifierExpression(origin=_origin, identifier=iden) for iden in "stime"),
+        CallExpression(
+            origin=_origin,
+            callee=IdentifierExpression(origin=_origin, identifier="f"),
+            arguments=(),
+            kw_arguments=(),
+        ),
+    ]
+
+    def outcome(evaluate: Callable[[], Any]) -> tuple[tuple[str, Any], int]:
+        calls.clear()
+        return _outcome(evaluate), len(calls)
+
+    # Expressions are inserted like by the interpreter, without evaluating anything again
+    for n in range(4):
+        for content in itertools.product(parts, repeat=n):
+            expr = TemplateExpression(origin=_origin, content=content)
+            expected = outcome(
+                lambda: expr.evaluate(variables, renderers=Template.default_renderers)
+            )
+            actual = outcome(
+                lambda: "".join(stream(expr, variables, Template.default_renderers))
+            )
+            assert actual == expected
+
+
+def test_stream_inserted_expression_pieces():
+    template = Template("a{{ f() }}{{ t }}b{{ f() }}")
+    variables = {"f": lambda: 1, "t": ValueExpression(origin=_origin, value="v")}
+    # Streamed until the expression, then collected until it is known whether it can be inserted
+    pieces = stream(template, variables, Template.default_renderers)
+    assert [next(pieces), next(pieces)] == ["a", "1"]
+    with pytest.raises(ValueError, match="Failed to evaluate"):
+        _ = next(pieces)
+
+    template = Template("{{ t }}b{{ f() }}")
+    assert list(stream(template, variables, Template.default_renderers)) == ["vb1"]
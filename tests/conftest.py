@@ -0,0 +1,33 @@
+import pytest
+
+import pyforma._parser.compiler
+import pyforma._parser.expression
+from pyforma import Template, TemplateCache
+
+
+@pytest.fixture(autouse=True, params=["precedence-climbing", "combinators"])
+def expression_engine(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> str:
+    """Runs every test against each expression engine"""
+    engine: str = request.param
+    monkeypatch.setattr(pyforma._parser.expression, "expression_engine", engine)
+    return engine
+
+
+@pytest.fixture(autouse=True, params=[True, False], ids=["compiled", "interpreted"])
+def compilation_enabled(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> bool:
+    """Runs every test with and without compiled parsers"""
+    enabled: bool = request.param
+    monkeypatch.setattr(pyforma._parser.compiler, "compilation_enabled", enabled)
+    return enabled
+
+
+@pytest.fixture(autouse=True)
+def template_cache(monkeypatch: pytest.MonkeyPatch) -> TemplateCache:
+    """Gives every test its own template cache, so that no test sees templates parsed by another one"""
+    cache = TemplateCache()
+    monkeypatch.setattr(Template, "template_cache", cache)
+    return cache
@@ -10,7 +10,9 @@ from pyforma._parser import (
     ParseSuccess,
     ParseFailure,
     ParseResult,
+    parser,
 )
+from pyforma._parser.parser import FirstPredicate
 
 
 @pytest.mark.parametrize(
@@ -69,3 +71,43 @@ def test_alternation(
         assert result.context == ParseContext(source, index=len(expected.result))
     else:
         assert result.context == context
+
+
+def test_alternation_first():
+    assert alternation(literal("a"), literal("b")).first is not None
+    assert alternation(literal("a"), literal("")).first is None
+
+
+@pytest.mark.parametrize(
+    "source,diagnostics,expected_calls",
+    [
+        ("a", False, ["a", "any"]),
+        ("b", False, ["any", "b"]),
+        ("c", False, ["any"]),
+        ("", False, ["any"]),
+        ("c", True, ["a", "any", "b"]),
+    ],
+)
+def test_alternation_dispatch(
+    source: str,
+    diagnostics: bool,
+    expected_calls: list[str],
+):
+    calls: list[str] = []
+
+    def make_parser(name: str, first: FirstPredicate | None) -> Parser[str]:
+        @parser(name=name, first=first)
+        def parse(context: ParseContext) -> ParseResult[str]:
+            calls.append(name)
+            return ParseResult.make_failure(context=context, expected=name)
+
+        return parse
+
+    a = make_parser("a", lambda c: c == "a")
+    b = make_parser("b", lambda c: c == "b")
+    any_char = make_parser("any", None)
+    parse = alternation(a, any_char, b)
+
+    result = parse(ParseContext(source, diagnostics=diagnostics))
+    assert result.is_failure
+    assert calls == expected_calls
@@ -22,10 +22,10 @@ from pyforma._parser.template_syntax_config import BlockSyntaxConfig
                         expected='"{#"',
                         cause=ParseResult(
                             ParseFailure(expected='"{"'),
-                            context=ParseContext(source="", index=0, position=(1, 1)),
+                            context=ParseContext(source="", index=0),
                         ),
                     ),
-                    context=ParseContext(source="", index=0, position=(1, 1)),
+                    context=ParseContext(source="", index=0),
                 ),
             ),
             0,
@@ -43,12 +43,10 @@ from pyforma._parser.template_syntax_config import BlockSyntaxConfig
                         expected='"#}"',
                         cause=ParseResult(
                             ParseFailure(expected='"#"'),
-                            context=ParseContext(
-                                source="{# foo", index=6, position=(1, 7)
-                            ),
+                            context=ParseContext(source="{# foo", index=6),
                         ),
                     ),
-                    context=ParseContext(source="{# foo", index=6, position=(1, 7)),
+                    context=ParseContext(source="{# foo", index=6),
                 ),
             ),
             0,
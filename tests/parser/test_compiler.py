@@ -0,0 +1,99 @@
+from typing import Any
+
+import pytest
+
+from pyforma._parser import (
+    ParseContext,
+    ParseResult,
+    Parser,
+    alternation,
+    digits,
+    literal,
+    lookahead,
+    negative_lookahead,
+    non_empty,
+    option,
+    parser,
+    repetition,
+    sequence,
+    transform_consumed,
+    transform_result,
+    transform_success,
+    whitespace,
+)
+import pyforma._parser.compiler
+from pyforma._parser.compiler import compiled, generate_source
+from pyforma._parser.parser import Definition
+
+
+@pytest.fixture(autouse=True)
+def compilation_enabled(monkeypatch: pytest.MonkeyPatch) -> bool:
+    """Overrides the global fixture, the tests in this module need compiled parsers"""
+    monkeypatch.setattr(pyforma._parser.compiler, "compilation_enabled", True)
+    return True
+
+
+@parser(name="custom", definition=Definition("custom"))
+def _custom(context: ParseContext) -> ParseResult[str]:
+    return literal("x")(context)
+
+
+_parsers: list[Parser[Any]] = [
+    literal("foo"),
+    whitespace,
+    sequence(),
+    sequence(literal("f"), literal("o"), whitespace, literal("o"), digits),
+    alternation(literal("foo"), sequence(literal("f"), digits), whitespace),
+    option(literal("foo")),
+    repetition(literal("o")),
+    non_empty(whitespace),
+    lookahead(literal("f")),
+    negative_lookahead(literal("f")),
+    transform_success(literal("foo"), transform=str.upper),
+    transform_success(
+        sequence(literal("f"), whitespace), transform=lambda s, c: (s[0], c.index)
+    ),
+    transform_consumed(sequence(literal("f"), digits), transform=str.upper),
+    transform_consumed(literal("x"), transform=lambda s, c: (s, c.index)),
+    transform_result(literal("foo"), transform=lambda r: r),
+    _custom,
+]
+
+
+@pytest.mark.parametrize("source", ["", "foo", "f12", "  foo", "oo", "x", "o"])
+@pytest.mark.parametrize("in_parser", _parsers, ids=lambda p: p.name)
+@pytest.mark.parametrize("diagnostics", [True, False])
+@pytest.mark.parametrize("index", [0, 1])
+def test_compiled(in_parser: Parser[Any], source: str, diagnostics: bool, index: int):
+    if index > len(source):
+        return
+    context = ParseContext(source, index=index, diagnostics=diagnostics)
+    expected = in_parser(ParseContext(source, index=index, diagnostics=diagnostics))
+    result = compiled(in_parser)(context)
+    assert result.value == expected.value
+    assert result.context == expected.context
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_compilation_enabled(monkeypatch: pytest.MonkeyPatch, enabled: bool):
+    monkeypatch.setattr(pyforma._parser.compiler, "compilation_enabled", enabled)
+    root = sequence(literal("f"), literal("o"))
+    context = ParseContext("fo")
+    assert compiled(root)(context).success.result == ("f", "o")
+    assert ((root.parse, 0, False) in context.memo.table) == (not enabled)
+
+
+def test_compiled_name():
+    p = sequence(literal("a"), literal("b"))
+    assert compiled(p).name == p.name
+    assert compiled(p).first is p.first
+    assert compiled(p) is compiled(p)
+
+
+def test_generate_source():
+    source, namespace = generate_source(
+        sequence(literal("{{"), literal("-"), whitespace, _custom)
+    )
+    assert "def parse(ctx, source, i):" in source
+    assert "source.startswith('{{-', i)" in source
+    assert _custom in namespace.values()
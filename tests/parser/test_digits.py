@@ -0,0 +1,32 @@
+import pytest
+
+from pyforma._parser import (
+    ParseContext,
+    Parser,
+    bindigits,
+    digits,
+    hexdigits,
+    octdigits,
+)
+
+
+@pytest.mark.parametrize(
+    "source,parser,expected",
+    [
+        ("", digits, ""),
+        ("0123456789a", digits, "0123456789"),
+        ("12³_4", digits, "12³"),
+        ("x1", digits, ""),
+        ("0123456789abcdefABCDEFg", hexdigits, "0123456789abcdefABCDEF"),
+        ("0123456789", octdigits, "01234567"),
+        ("0120", bindigits, "01"),
+        ("١", digits, "١"),
+        ("١", hexdigits, ""),
+    ],
+)
+def test_digits(source: str, parser: Parser[str], expected: str):
+    context = ParseContext(source)
+    result = parser(context)
+    assert result.is_success
+    assert result.success.result == expected
+    assert result.context == ParseContext(source, index=len(expected))
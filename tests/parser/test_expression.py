@@ -1,6 +1,11 @@
+from collections.abc import Callable
+from typing import Any
+
 import pytest
 
-from pyforma import TemplateSyntaxConfig
+import pyforma._parser.expression
+
+from pyforma import Template, TemplateSyntaxConfig
 from pyforma._ast import (
     IdentifierExpression,
     ValueExpression,
@@ -18,7 +23,7 @@ from pyforma._ast import (
 from pyforma._parser.parse_context import ParseContext
 from pyforma._ast.origin import Origin
 from pyforma._parser.expression import expression, _none_expr  # pyright: ignore[reportPrivateUsage]
-from pyforma._parser.parse_result import ParseFailure, ParseSuccess
+from pyforma._parser.parse_result import ParseFailure, ParseResult, ParseSuccess
 from pyforma._parser.template import inner_template
 
 _origin = Origin(position=(1, 1))
@@ -906,3 +911,21 @@ def test_expression(
         assert result.context == ParseContext(source, index=result_idx)
     else:
         assert result.context == context
+
+
+def test_expression_engines_disagree(monkeypatch: pytest.MonkeyPatch):
+    # Failures are described by the combinators, which must not parse what precedence climbing failed to parse
+    def operator_expression(_: Any) -> Callable[[ParseContext], ParseResult[Any]]:
+        return lambda context: ParseResult.make_failure(context=context, expected="")
+
+    monkeypatch.setattr(
+        pyforma._parser.expression, "operator_expression", operator_expression
+    )
+    monkeypatch.setattr(
+        pyforma._parser.expression, "expression_engine", "precedence-climbing"
+    )
+    with pytest.raises(
+        AssertionError,
+        match=r"^:1:4: The precedence-climbing engine failed .* combinators engine",
+    ):
+        _ = Template("{{ 1 }}")
@@ -15,6 +15,10 @@ from pyforma._parser import (
         ("foo", ParseSuccess("foo")),
         ("foo123 0", ParseSuccess("foo123")),
         ("123", ParseFailure(expected="identifier")),
+        ("_foo_1-bar", ParseSuccess("_foo_1")),
+        ("\u00e4\u00df\u0301x y", ParseSuccess("\u00e4\u00df\u0301x")),
+        ("\u0301x", ParseFailure(expected="identifier")),
+        ("x\u00b2", ParseSuccess("x")),
     ],
 )
 def test_identifier(
@@ -52,3 +52,11 @@ def test_literal(
         assert result.context == ParseContext(source, index=len(expected.result))
     else:
         assert result.context == context
+
+
+def test_literal_first():
+    first = literal("foo").first
+    assert first is not None
+    assert first("f")
+    assert not first("o")
+    assert literal("").first is None
@@ -6,6 +6,7 @@ import pytest
 
 from pyforma._parser import (
     munch,
+    munch_chars,
     ParseContext,
     ParseFailure,
     ParseSuccess,
@@ -58,3 +59,59 @@ def test_munch(
         assert result.context == ParseContext(source, index=len(expected.result))
     else:
         assert result.context == context
+
+
+@pytest.mark.parametrize(
+    "source,predicate,first,expected",
+    [  # type: ignore
+        ("", str.isdigit, None, ""),
+        ("foo", str.isdigit, None, ""),
+        ("123foo", str.isdigit, None, "123"),
+        ("123", str.isdigit, None, "123"),
+        ("a12b", str.isdigit, str.isalpha, "a12"),
+        ("1a2b", str.isdigit, str.isalpha, ""),
+        ("foo", Weird(), None, ""),
+    ],
+)
+def test_munch_chars(
+    source: str,
+    predicate: Callable[[str], bool],
+    first: Callable[[str], bool] | None,
+    expected: str,
+):
+    context = ParseContext(source)
+    result = munch_chars(predicate, first=first)(context)
+    assert result.is_success
+    assert result.success.result == expected
+    assert result.context == ParseContext(source, index=len(expected))
+
+
+@pytest.mark.parametrize(
+    "predicate,name,expected",
+    [  # type: ignore
+        (str.isdigit, None, "munch-chars(isdigit)"),
+        (ConsecutiveDigits(2), None, "munch-chars(ConsecutiveDigits)"),
+        (Weird(), None, "munch-chars(munch)"),
+        (str.isdigit, "digits", "digits"),
+    ],
+)
+def test_munch_chars_name(
+    predicate: Callable[[str], bool],
+    name: str | None,
+    expected: str,
+):
+    assert munch_chars(predicate, name=name).name == expected
+
+
+def test_munch_chars_checks_each_character_once():
+    checked: list[str] = []
+
+    def predicate(c: str) -> bool:
+        checked.append(c)
+        return c.isdigit()
+
+    # Linear in the length of the match, unlike munch(), which checks every prefix
+    source = "1234" * 1000 + "x"
+    result = munch_chars(predicate)(ParseContext(source))
+    assert result.success.result == source[:-1]
+    assert checked == list(source)
@@ -5,6 +5,8 @@ from pyforma._parser import (
     Parser,
     whitespace,
     non_empty,
+    literal,
+    digits,
     ParseFailure,
     ParseSuccess,
 )
@@ -31,3 +33,9 @@ def test_non_empty(
         assert result.context == ParseContext(source, index=len(expected.result))
     else:
         assert result.context == context
+
+
+def test_non_empty_first():
+    assert non_empty(literal("a")).first is literal("a").first
+    assert non_empty(digits).first is None
+    assert non_empty(digits, first=str.isdigit).first is str.isdigit
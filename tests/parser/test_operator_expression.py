@@ -0,0 +1,132 @@
+import pytest
+
+from pyforma._ast import BinOpExpression, IdentifierExpression, UnOpExpression
+from pyforma._ast.origin import Origin
+from pyforma._parser import ParseContext
+from pyforma._parser.identifier_expression import identifier_expression
+from pyforma._parser.operator_expression import operator_expression
+from pyforma._parser.parse_result import ParseFailure, ParseSuccess
+
+
+def _id(identifier: str, column: int) -> IdentifierExpression:
+    return IdentifierExpression(
+        origin=Origin(position=(1, column)), identifier=identifier
+    )
+
+
+_origin = Origin(position=(1, 1))
+
+
+@pytest.mark.parametrize(
+    "source,expected,result_idx",
+    [
+        ("", ParseFailure(expected="operator-expression"), 0),
+        ("+", ParseFailure(expected="operator-expression"), 0),
+        ("a", ParseSuccess(_id("a", 1)), 1),
+        ("a +", ParseSuccess(_id("a", 1)), 1),
+        (
+            "a**b**c",
+            ParseSuccess(
+                BinOpExpression(
+                    origin=_origin,
+                    op="**",
+                    lhs=BinOpExpression(
+                        origin=_origin, op="**", lhs=_id("a", 1), rhs=_id("b", 4)
+                    ),
+                    rhs=_id("c", 7),
+                )
+            ),
+            7,
+        ),
+        (
+            "a + b * c",
+            ParseSuccess(
+                BinOpExpression(
+                    origin=_origin,
+                    op="+",
+                    lhs=_id("a", 1),
+                    rhs=BinOpExpression(
+                        origin=Origin(position=(1, 5)),
+                        op="*",
+                        lhs=_id("b", 5),
+                        rhs=_id("c", 9),
+                    ),
+                )
+            ),
+            9,
+        ),
+        (
+            "- not a",
+            ParseSuccess(UnOpExpression(origin=_origin, op="-", operand=_id("not", 3))),
+            5,
+        ),
+        (
+            "not a < b < c",
+            ParseSuccess(
+                UnOpExpression(
+                    origin=_origin,
+                    op="not",
+                    operand=BinOpExpression(
+                        origin=Origin(position=(1, 5)),
+                        op="and",
+                        lhs=BinOpExpression(
+                            origin=Origin(position=(1, 5)),
+                            op="<",
+                            lhs=_id("a", 5),
+                            rhs=_id("b", 9),
+                        ),
+                        rhs=BinOpExpression(
+                            origin=Origin(position=(1, 5)),
+                            op="<",
+                            lhs=_id("b", 9),
+                            rhs=_id("c", 13),
+                        ),
+                    ),
+                )
+            ),
+            13,
+        ),
+        (
+            "a == b or c",
+            ParseSuccess(
+                BinOpExpression(
+                    origin=_origin,
+                    op="or",
+                    lhs=BinOpExpression(
+                        origin=_origin, op="==", lhs=_id("a", 1), rhs=_id("b", 6)
+                    ),
+                    rhs=_id("c", 11),
+                )
+            ),
+            11,
+        ),
+        (
+            "a * + b",
+            ParseSuccess(
+                BinOpExpression(
+                    origin=_origin,
+                    op="*",
+                    lhs=_id("a", 1),
+                    rhs=UnOpExpression(
+                        origin=Origin(position=(1, 5)), op="+", operand=_id("b", 7)
+                    ),
+                )
+            ),
+            7,
+        ),
+        (
+            "a ** + b",
+            ParseSuccess(_id("a", 1)),
+            1,
+        ),
+    ],
+)
+def test_operator_expression(
+    source: str,
+    expected: ParseSuccess | ParseFailure,
+    result_idx: int,
+):
+    context = ParseContext(source)
+    result = operator_expression(identifier_expression)(context)
+    assert result.value == expected
+    assert result.context == ParseContext(source, index=result_idx)
@@ -1,7 +1,10 @@
 from contextlib import nullcontext
+from pathlib import Path
 from typing import ContextManager
 import pytest
 
+from pyforma._ast.origin import Origin
+from pyforma._ast.source_text import MappedSource, SourceText
 from pyforma._parser import ParseContext
 
 
@@ -57,6 +60,8 @@ def test_invalid_initialization(source: str, index: int):
         ("bar", 1, slice(0, 2, 1), nullcontext("ar")),
         ("foobar", 1, slice(-3, -1, 1), nullcontext("ba")),
         ("barfoo", 3, slice(None, None, -1), nullcontext("oof")),
+        ("barfoo", 0, slice(None, None, -1), nullcontext("oofrab")),
+        ("barfoo", 3, slice(None, 1, -1), nullcontext("o")),
         ("foo", 0, "blurb", pytest.raises(TypeError)),
     ],
 )
@@ -71,6 +76,23 @@ def test_indexing(
         assert context[item] == e
 
 
+@pytest.mark.parametrize(
+    "source,index,prefix,expected",
+    [
+        ("", 0, "", True),
+        ("", 0, "f", False),
+        ("foo", 0, "fo", True),
+        ("foo", 1, "oo", True),
+        ("foo", 1, "fo", False),
+        ("foo", 1, "ooo", False),
+        ("foo", 3, "", True),
+    ],
+)
+def test_startswith(source: str, index: int, prefix: str, expected: bool):
+    context = ParseContext(source, index)
+    assert context.startswith(prefix) == expected
+
+
 @pytest.mark.parametrize(
     "source,index,count,expected",
     [
@@ -122,6 +144,10 @@ def test_consume(
         ("foo", 1, 1, 2),
         ("foo\nbar", 3, 1, 4),
         ("foo\nbar", 4, 2, 1),
+        ("foo\nbar", 7, 2, 4),
+        ("foo\nbar\n\nbaz", 8, 3, 1),
+        ("foo\nbar\n\nbaz", 10, 4, 2),
+        ("\r\n\tx", 3, 2, 2),
     ],
 )
 def test_line_and_column(
@@ -132,3 +158,26 @@ def test_line_and_column(
 ):
     context = ParseContext(source, index)
     assert context.line_and_column() == (line, col)
+
+
+def test_line_index_is_shared():
+    context = ParseContext("foo\nbar")
+    consumed = context.consume(5)
+    assert consumed.line_index is context.line_index
+    assert consumed.line_and_column() == (2, 2)
+    assert consumed.origin() == Origin(position=(2, 2))
+
+
+def test_source_text(tmp_path: Path):
+    path = tmp_path / "source.txt"
+    _ = path.write_text("föo bar")
+    mapped_source = MappedSource(path)
+
+    context = ParseContext("föo bar", index=1)
+    assert context.source_text(3) == "öo"
+
+    context = ParseContext("föo bar", index=1, mapped_source=mapped_source)
+    assert context.source_text(3) == SourceText(mapped_source, 1, 4)
+    consumed = context.consume(3)
+    assert consumed.mapped_source is mapped_source
+    assert str(consumed.source_text(7)) == "bar"
@@ -0,0 +1,129 @@
+from collections.abc import Callable
+
+import pytest
+from pytest_mock import MockerFixture
+
+from pyforma import ParseStatistics, Template
+from pyforma._parser import (
+    ParseContext,
+    ParseMemo,
+    TemplateSyntaxConfig,
+    literal,
+    template,
+)
+
+
+def test_memo_counts():
+    context = ParseContext("foobar")
+    parse = literal("foo")
+
+    assert context.memo.hits == 0
+    assert context.memo.misses == 0
+    assert len(context.memo) == 0
+
+    r1 = parse(context)
+    r2 = parse(context)
+    assert r1 is r2
+    assert context.memo.hits == 1
+    assert context.memo.misses == 1
+    assert len(context.memo) == 1
+
+    _ = parse(r1.context)
+    assert context.memo.misses == 2
+    assert len(context.memo) == 2
+
+    context.memo.clear()
+    assert len(context.memo) == 0
+    assert context.memo.misses == 2
+
+
+def test_memo_statistics():
+    assert ParseStatistics().memo_hit_rate == 0.0
+    assert ParseStatistics(memo_hits=1, memo_misses=3).memo_hit_rate == 0.25
+
+    context = ParseContext("foobar")
+    parse = literal("foo")
+    _ = parse(context)
+    _ = parse(context)
+    assert context.memo.statistics == ParseStatistics(
+        memo_hits=1, memo_misses=1, memo_entries=1
+    )
+
+
+def test_template_parse_statistics():
+    template = Template("foo{{bar}}")
+    statistics = template.parse_statistics
+    assert statistics.memo_misses > 0
+    assert statistics.memo_entries > 0
+
+    # Only parsed templates report their parse
+    assert Template("foo{{bar}}").parse_statistics == ParseStatistics()
+    assert template.substitute({}).parse_statistics == ParseStatistics()
+
+
+def test_memo_shared_within_parse():
+    context = ParseContext("foobar")
+    assert context.consume(3).memo is context.memo
+    assert ParseContext("foobar").memo is not context.memo
+
+
+def test_memo_distinguishes_template_expressions():
+    context = ParseContext("foo")
+    parse = literal("foo")
+    _ = parse(context)
+    _ = parse(ParseContext("foo", in_template_expr=True, memo=context.memo))
+    assert context.memo.misses == 2
+
+
+def test_template_frees_memo(mocker: MockerFixture):
+    spy = mocker.spy(ParseMemo, "clear")
+    _ = Template("foo{{bar}}")
+    assert spy.call_count == 1
+
+
+def test_template_frees_memo_of_diagnostic_pass(mocker: MockerFixture):
+    spy = mocker.spy(ParseMemo, "clear")
+    with pytest.raises(ValueError):
+        _ = Template("foo{{bar")
+    assert spy.call_count == 2
+
+
+def _nested_parens(n: int) -> str:
+    return "{{ " + "(" * n + "a" + ")" * n + " }}"
+
+
+def _binop_chain(n: int) -> str:
+    return "{{ " + " + ".join(f"x{i} * y[{i}] ** 2" for i in range(n)) + " }}"
+
+
+def _comparison_chain(n: int) -> str:
+    return "{{ a" + " < b" * n + " }}"
+
+
+def _unop_chain(n: int) -> str:
+    return "{{ " + "-" * n + "a }}"
+
+
+def _alternatives(n: int) -> str:
+    return "x {{ [1, 'a', 2.5, {}] }} {% if c %}y{% endif %}" * n
+
+
+@pytest.mark.parametrize(
+    "make_source,n",
+    [
+        (_nested_parens, 4),
+        (_binop_chain, 10),
+        (_comparison_chain, 10),
+        (_unop_chain, 10),
+        (_alternatives, 10),
+    ],
+)
+def test_memo_misses_grow_linearly(make_source: Callable[[int], str], n: int):
+    parse = template(TemplateSyntaxConfig())
+
+    def misses(source: str) -> int:
+        context = ParseContext(source)
+        assert parse(context).is_success
+        return context.memo.misses
+
+    assert misses(make_source(2 * n)) <= 2 * misses(make_source(n))
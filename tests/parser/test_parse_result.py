@@ -22,6 +22,32 @@ def test_failure():
     assert result.failure.expected == "42"
 
 
+def test_failure_without_diagnostics():
+    context = ParseContext("foo", diagnostics=False)
+    cause = ParseResult.make_failure(context=context, expected="bar")
+    result = ParseResult.make_failure(context=context, expected="42", cause=cause)
+    assert result.is_failure
+    assert result.context is context
+    assert result.failure is cause.failure
+    assert result.failure.cause is None
+
+
+def test_farthest_index():
+    context = ParseContext("foobar")
+    success = ParseResult.make_success(result=42, context=context.consume(2))
+    assert success.farthest_index == 2
+
+    leaf = ParseResult.make_failure(context=context.consume(4), expected="b")
+    middle = ParseResult.make_failure(
+        context=context.consume(1), expected="a", cause=leaf
+    )
+    root = ParseResult.make_failure(context=context, expected="42", cause=middle)
+    assert leaf.farthest_index == 4
+    assert middle.farthest_index == 4
+    assert root.farthest_index == 4
+    assert ParseResult(root.failure, context=context.consume(6)).farthest_index == 4
+
+
 def test_repr():
     context = ParseContext("")
     result = ParseResult.make_success(result=42, context=context)
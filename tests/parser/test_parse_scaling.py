@@ -0,0 +1,53 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from pyforma._parser import ParseContext, TemplateSyntaxConfig, template
+
+
+def _block(i: int) -> str:
+    return (
+        f"line {i}: static text with some words\n"
+        f"{{{{ items[{i}].name + prefix * 2 }}}}\n"
+        "{% for x in xs %}{{ x }}, {% endfor %}\n"
+        "{# a comment #}\n"
+        "{{ 'a string' }}\n"
+    )
+
+
+def _parse_work(mocker: MockerFixture, source: str) -> tuple[int, int]:
+    """Parses the source and counts the parser runs and consumed contexts"""
+    consume = mocker.spy(ParseContext, "consume")
+    context = ParseContext(source)
+    assert template(TemplateSyntaxConfig())(context).is_success
+    count = consume.call_count
+    mocker.stop(consume)
+    return context.memo.misses, count
+
+
+def test_parse_work_scales_linearly(mocker: MockerFixture):
+    small, medium, large = (
+        _parse_work(mocker, "".join(_block(i % 10) for i in range(blocks)))
+        for blocks in (10, 20, 40)
+    )
+
+    # Every block adds the same work, however many blocks precede it
+    for s, m, lg in zip(small, medium, large):
+        assert lg - m == 2 * (m - s)
+
+
+@pytest.mark.parametrize(
+    "open,close",
+    [
+        ("{#", "#}"),
+        ("{{ '", "' }}"),
+        ('{{ "', '" }}'),
+        ("{% literal a %}", "{% endliteral a %}"),
+    ],
+)
+def test_parse_work_independent_of_content_length(
+    mocker: MockerFixture, open: str, close: str
+):
+    # Comments, string literals and literal environments are searched for their end, not parsed character by character
+    short = _parse_work(mocker, f"{open}{'x' * 10}{close}")
+    long = _parse_work(mocker, f"{open}{'x' * 10000}{close}")
+    assert long == short
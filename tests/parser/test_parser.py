@@ -2,6 +2,7 @@ from typing import Any, override
 import pytest
 
 from pyforma._parser import ParseResult, ParseContext, parser, Parser
+from pyforma._parser.parser import FirstPredicate, any_first
 
 
 @parser
@@ -50,3 +51,32 @@ def test_unsupported_parser():
 
     with pytest.raises(TypeError):
         _ = parser(WeirdParser())
+
+
+def test_parser_first():
+    @parser(first=str.isdigit)
+    def digit(context: ParseContext) -> ParseResult[str]:
+        return ParseResult.make_success(context=context.consume(), result=context[0])
+
+    assert digit.name == "digit"
+    assert digit.first is str.isdigit
+    assert empty.first is None
+
+
+@pytest.mark.parametrize(
+    "predicates,char,expected",
+    [
+        ((), "a", False),
+        ((str.isdigit, str.isalpha), "a", True),
+        ((str.isdigit, str.isalpha), "1", True),
+        ((str.isdigit, str.isalpha), "_", False),
+    ],
+)
+def test_any_first(predicates: tuple[FirstPredicate, ...], char: str, expected: bool):
+    first = any_first(*predicates)
+    assert first is not None
+    assert first(char) == expected
+
+
+def test_any_first_unknown():
+    assert any_first(str.isdigit, None) is None
@@ -0,0 +1,28 @@
+import pytest
+
+from pyforma._parser import ParseContext, pattern
+
+
+@pytest.mark.parametrize(
+    "source,index,regex,expected",
+    [
+        ("", 0, r"\s*", ""),
+        ("  foo", 0, r"\s*", "  "),
+        ("  foo", 2, r"\s*", ""),
+        ("foo  bar", 3, r"\s*", "  "),
+        ("foo", 0, "[0-9]+", ""),
+        ("foo123bar", 3, "[0-9]+", "123"),
+        ("foo123bar", 0, "foo|foo123", "foo"),
+    ],
+)
+def test_pattern(source: str, index: int, regex: str, expected: str):
+    context = ParseContext(source, index)
+    result = pattern(regex)(context)
+    assert result.is_success
+    assert result.success.result == expected
+    assert result.context == ParseContext(source, index=index + len(expected))
+
+
+def test_pattern_name():
+    assert pattern("[0-9]*").name == "pattern([0-9]*)"
+    assert pattern("[0-9]*", name="digits").name == "digits"
@@ -53,3 +53,8 @@ def test_sequence(
         assert result.context == ParseContext(source, index=expect_len)
     else:
         assert result.context == context
+
+
+def test_sequence_first():
+    assert sequence(literal("a"), literal("b")).first is literal("a").first
+    assert sequence().first is None
@@ -107,3 +107,12 @@ def test_switch(
         assert result.context == ParseContext(source, index=len(expected.result))
     else:
         assert result.context == context
+
+
+def test_switch_first():
+    first = switch((literal("a"), literal("b")), default=literal("c")).first
+    assert first is not None
+    assert first("a")
+    assert not first("b")
+    assert first("c")
+    assert switch((literal("a"), literal("b")), default=literal("")).first is None
@@ -20,3 +20,30 @@ def test_text(
     assert result.is_success
     assert result.success.result == expected
     assert result.context == ParseContext(source, index=len(expected))
+
+
+@pytest.mark.parametrize(
+    "source,index,end_strs,expected",
+    [
+        ("foo bar", 0, (), "foo bar"),
+        ("foo bar", 4, (), "bar"),
+        ("foo bar", 0, ("",), ""),
+        ("foo [[ bar ]]", 0, ("[[", "]]"), "foo "),
+        ("foo [[ bar ]]", 6, ("[[", "]]"), " bar "),
+        ("a.b*c", 0, ("*", "."), "a"),
+        ("foo``` bar {{", 0, ("{{", "```"), "foo"),
+        ("foo``` bar {{", 3, ("{{", "```"), ""),
+        ("foo``` bar {{", 4, ("{{", "```"), "`` bar "),
+    ],
+)
+def test_text_end_strs(
+    source: str,
+    index: int,
+    end_strs: tuple[str, ...],
+    expected: str,
+):
+    context = ParseContext(source, index)
+    result = text(*end_strs)(context)
+    assert result.is_success
+    assert result.success.result == expected
+    assert result.context == ParseContext(source, index=index + len(expected))
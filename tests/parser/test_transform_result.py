@@ -127,3 +127,10 @@ def test_transform_consumed(
         assert result.context == ParseContext(source, index=len(source))
     else:
         assert result.context == context
+
+
+def test_transform_first():
+    base = literal("a")
+    assert transform_success(base, transform=str.upper).first is base.first
+    assert transform_consumed(base, transform=str.upper).first is base.first
+    assert transform_result(base, transform=lambda r: r).first is None
@@ -1,4 +1,5 @@
 import pytest
+from pytest_mock import MockerFixture
 
 from pyforma._parser import (
     ParseContext,
@@ -7,8 +8,22 @@ from pyforma._parser import (
     literal,
     ParseFailure,
     ParseSuccess,
+    alternation,
+    parser,
+    pattern,
+    sequence,
+    transform_success,
     until,
 )
+from pyforma._parser.parse_result import ParseResult
+
+
+@parser(name="x")
+def _x(context: ParseContext) -> ParseResult[str]:
+    """Delimiter without definition"""
+    if context.startswith("x"):
+        return ParseResult.make_success(context=context.consume(1), result="x")
+    return ParseResult.make_failure(context=context, expected="x")
 
 
 @pytest.mark.parametrize(
@@ -16,6 +31,20 @@ from pyforma._parser import (
     [
         ("foo", literal("o"), ParseSuccess("f")),
         ("foobars", literal("b"), ParseSuccess("foo")),
+        ("foo", literal("x"), ParseSuccess("foo")),
+        ("foo", literal(""), ParseSuccess("")),
+        ("abacabc", sequence(literal("ab"), literal("c")), ParseSuccess("abac")),
+        ("abab", sequence(literal("ab"), literal("c")), ParseSuccess("abab")),
+        (
+            "aabc",
+            transform_success(sequence(literal("b")), transform=str),
+            ParseSuccess("aa"),
+        ),
+        ("abc", sequence(pattern("a*"), literal("c")), ParseSuccess("ab")),
+        ("abc", sequence(), ParseSuccess("")),
+        ("abc", alternation(literal("c"), _x), ParseSuccess("ab")),
+        ("abc", alternation(), ParseSuccess("abc")),
+        ("abxc", _x, ParseSuccess("ab")),
     ],
 )
 def test_until(
@@ -55,3 +84,20 @@ def test_not_in(
         assert result.context == ParseContext(source, index=len(expected.result))
     else:
         assert result.context == context
+
+
+@pytest.mark.parametrize(
+    "delimiter",
+    [
+        literal("#}"),
+        alternation(literal("#}"), literal("%}")),
+        sequence(literal("#"), literal("}")),
+    ],
+)
+def test_until_scans_for_delimiter(mocker: MockerFixture, delimiter: Parser):
+    # Contexts are only created where the delimiter may start, not for every character
+    consume = mocker.spy(ParseContext, "consume")
+    source = "abc#d" * 1000 + "#}"
+    result = until(delimiter)(ParseContext(source, diagnostics=False))
+    assert result.success.result == source[:-2]
+    assert consume.call_count < len(source) // 2
@@ -0,0 +1,42 @@
+from typing import Any
+
+import pytest
+
+from pyforma._parallel import (
+    _initialize_worker,  # pyright: ignore[reportPrivateUsage]
+    _render_batch,  # pyright: ignore[reportPrivateUsage]
+    render_in_processes,
+)
+
+
+def _render(variables: list[dict[str, Any]]) -> list[str]:
+    return [str(v["x"] * 2) for v in variables]
+
+
+@pytest.mark.parametrize("workers,chunksize", [(1, 1), (2, 3), (None, 256)])
+def test_render_in_processes(workers: int | None, chunksize: int):
+    variables = ({"x": n} for n in range(50))
+    results = render_in_processes(
+        _render, variables, workers=workers, chunksize=chunksize
+    )
+    assert list(results) == [str(n * 2) for n in range(50)]
+
+
+def test_render_in_processes_error():
+    variables = [{"x": 1}, {"y": 2}]
+    results = render_in_processes(_render, variables, workers=1, chunksize=1)
+    assert next(results) == "2"
+    with pytest.raises(KeyError):
+        _ = next(results)
+
+
+@pytest.mark.parametrize("workers,chunksize", [(0, 1), (1, 0)])
+def test_render_in_processes_invalid(workers: int, chunksize: int):
+    with pytest.raises(ValueError):
+        _ = list(render_in_processes(_render, [], workers=workers, chunksize=chunksize))
+
+
+def test_render_batch():
+    # Runs in worker processes otherwise
+    _initialize_worker(_render)
+    assert _render_batch([{"x": 1}, {"x": 2}]) == ["2", "4"]
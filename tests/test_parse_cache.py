@@ -0,0 +1,174 @@
+import importlib.metadata
+import pickle
+import threading
+import zlib
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from pyforma import (
+    DefaultTemplateContext,
+    ParseCache,
+    ParseCacheStatistics,
+    Template,
+    TemplateCache,
+    TemplateSyntaxConfig,
+)
+from pyforma._ast import TemplateExpression
+from pyforma._ast.origin import Origin
+from pyforma._parse_cache import _version  # pyright: ignore[reportPrivateUsage]
+from pyforma._parser import BlockSyntaxConfig, ParseMemo
+
+_syntax = TemplateSyntaxConfig()
+_source = "Hello {{ name }}!"
+
+
+def _parsed(source_id: str = "") -> TemplateExpression:
+    template = Template(_source)
+    return TemplateExpression(
+        origin=Origin(position=(1, 1), source_id=source_id), content=template.content
+    )
+
+
+def test_statistics():
+    assert ParseCacheStatistics().hit_rate == 0.0
+    assert ParseCacheStatistics(hits=3, misses=1).hit_rate == 0.75
+
+
+def test_roundtrip(tmp_path: Path):
+    cache = ParseCache(tmp_path / "cache")
+    assert cache.directory == tmp_path / "cache"
+    assert cache.load(_source, source_id="", syntax=_syntax) is None
+
+    cache.store(_source, _parsed(), source_id="", syntax=_syntax)
+    assert cache.load(_source, source_id="", syntax=_syntax) == _parsed()
+
+    statistics = cache.statistics
+    assert statistics.hits == 1
+    assert statistics.misses == 1
+    assert statistics.load_time > 0.0
+    assert statistics.hit_rate == 0.5
+
+
+@pytest.mark.parametrize(
+    "source,source_id,syntax",
+    [
+        (_source + " ", "", _syntax),
+        (_source, "foo", _syntax),
+        (_source, "", TemplateSyntaxConfig(expression=BlockSyntaxConfig("<<", ">>"))),
+    ],
+)
+def test_key(tmp_path: Path, source: str, source_id: str, syntax: TemplateSyntaxConfig):
+    cache = ParseCache(tmp_path)
+    cache.store(_source, _parsed(), source_id="", syntax=_syntax)
+    assert cache.load(source, source_id=source_id, syntax=syntax) is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"garbage",
+        zlib.compress(b"garbage"),
+        zlib.compress(pickle.dumps("not a template")),
+    ],
+)
+def test_invalid_entry(tmp_path: Path, data: bytes):
+    cache = ParseCache(tmp_path)
+    cache.store(_source, _parsed(), source_id="", syntax=_syntax)
+    (entry,) = tmp_path.iterdir()
+    _ = entry.write_bytes(data)
+    assert cache.load(_source, source_id="", syntax=_syntax) is None
+    assert cache.statistics.misses == 1
+
+
+def test_failed_store_leaves_no_files(tmp_path: Path, mocker: MockerFixture):
+    cache = ParseCache(tmp_path)
+    _ = mocker.patch("os.replace", side_effect=OSError("disk full"))
+    with pytest.raises(OSError):
+        cache.store(_source, _parsed(), source_id="", syntax=_syntax)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_concurrent_access(tmp_path: Path):
+    cache = ParseCache(tmp_path)
+    errors: list[BaseException] = []
+
+    def work():
+        try:
+            for _ in range(20):
+                cache.store(_source, _parsed(), source_id="", syntax=_syntax)
+                loaded = cache.load(_source, source_id="", syntax=_syntax)
+                assert loaded == _parsed()
+        except BaseException as e:  # pragma: no cover # only reached if the test fails
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(list(tmp_path.iterdir())) == 1
+    assert cache.statistics.hits == 80
+
+
+def test_template_warm_start(
+    tmp_path: Path, mocker: MockerFixture, template_cache: TemplateCache
+):
+    cache = ParseCache(tmp_path)
+    cold = Template(_source, parse_cache=cache)
+    template_cache.clear()
+
+    spy = mocker.spy(ParseMemo, "clear")
+    warm = Template(_source, parse_cache=ParseCache(tmp_path))
+    assert spy.call_count == 0  # Not parsed at all
+    assert warm == cold
+
+
+def test_template_syntax_error_not_cached(tmp_path: Path):
+    cache = ParseCache(tmp_path)
+    with pytest.raises(ValueError):
+        _ = Template("{{", parse_cache=cache)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_context_load_template(tmp_path: Path, template_cache: TemplateCache):
+    template_path = tmp_path / "template.txt"
+    _ = template_path.write_text(_source)
+    cache = ParseCache(tmp_path / "cache")
+
+    context = DefaultTemplateContext(base_path=tmp_path, parse_cache=cache)
+    template = context.load_template(Path("template.txt"))
+    assert cache.statistics.misses == 1
+
+    template_cache.clear()
+    assert Template(template_path.resolve(), parse_cache=cache) == template
+    assert cache.statistics.hits == 1
+
+
+def test_template_failed_store(tmp_path: Path, mocker: MockerFixture):
+    cache = ParseCache(tmp_path)
+    _ = mocker.patch("os.replace", side_effect=OSError("read-only file system"))
+    assert Template(_source, parse_cache=cache) == Template(_source)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_version_without_metadata(tmp_path: Path, mocker: MockerFixture):
+    _version.cache_clear()
+    _ = mocker.patch(
+        "importlib.metadata.version",
+        side_effect=importlib.metadata.PackageNotFoundError("pyforma"),
+    )
+    try:
+        version = _version()
+        assert version.startswith("source-")
+        assert _version() == version
+
+        cache = ParseCache(tmp_path)
+        cache.store(_source, _parsed(), source_id="", syntax=_syntax)
+        assert cache.load(_source, source_id="", syntax=_syntax) == _parsed()
+    finally:
+        _version.cache_clear()
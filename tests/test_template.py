@@ -1,3 +1,5 @@
+import asyncio
+import io
 from collections.abc import Callable, Sequence, Sized
 from contextlib import nullcontext
 from pathlib import Path
@@ -5,7 +7,7 @@ from typing import Any, ContextManager, final, override
 
 import pytest
 
-from pyforma import Template, TemplateSyntaxConfig
+from pyforma import ExecutionStatistics, Template, TemplateSyntaxConfig, TieringPolicy
 from pyforma._ast import (
     Expression,
     IdentifierExpression,
@@ -25,8 +27,12 @@ from pyforma._ast.expressions import (
     DictExpression,
     LambdaExpression,
 )
+from pyforma._ast.compiler import compile_expression
 from pyforma._ast.origin import Origin
+from pyforma._ast.source_text import SourceText
 from pyforma._parser.template_syntax_config import BlockSyntaxConfig
+from pyforma._template import _render_batch  # pyright: ignore[reportPrivateUsage]
+from pyforma._tiering import wait_for_background_compilation
 from pyforma._util import join
 
 
@@ -1743,6 +1749,213 @@ def test_render(
         assert Template(source).render(sub) == e
 
 
+def test_render_untaken_branch():
+    template = Template("{% if x %}foo{% else %}{{ bar }}{% endif %}")
+    assert template.render({"x": True}) == "foo"
+
+
+def test_render_evaluates_loop_body_per_iteration():
+    template = Template("{% for i in range(3) %}{{ next(counter) }}{% endfor %}")
+    counter = iter(range(10))
+    assert template.render({"range": range, "next": next, "counter": counter}) == "012"
+
+
+@pytest.mark.parametrize(
+    "source,origin",
+    [
+        ("é {{ (if None: 1 else: f) }}", ":1:24:"),
+        ("{{ (with w = f: w) }}", ":1:17:"),
+        ("{% for v in [1] %}{{ (if 1: f) }}{% endfor %}", ":1:29:"),
+        ("{{ with a = 1: (if a: f) }}", ":1:23:"),
+        ("{{ if 0: f }}", ":1:4:"),
+    ],
+)
+def test_render_no_renderer_origin(source: str, origin: str):
+    # Reported at the expression that produced the value, by all ways of rendering
+    template = Template(source)
+    variables = {"f": object()}
+    renders: list[Callable[[], Any]] = [
+        lambda: template.render(variables),
+        lambda: template.compile()(variables),
+        lambda: "".join(template.render_iter(variables)),
+        lambda: asyncio.run(template.render_async(variables)),
+        lambda: list(template.render_many([variables])),
+    ]
+    for render in renders:
+        with pytest.raises(ValueError, match=f"{origin} No renderer"):
+            _ = render()
+
+
+def test_render_iter():
+    template = Template("a{% for x in xs %}{{ x }}{% endfor %}b")
+    pieces = template.render_iter({"xs": iter(range(10**9))})
+    assert [next(pieces) for _ in range(3)] == ["a", "0", "1"]
+
+
+def _yes_no(value: bool) -> str:
+    return "yes" if value else "no"
+
+
+def test_render_iter_renderers():
+    template = Template("{{ x }}")
+    renderers = ((bool, _yes_no),)
+    assert list(template.render_iter({"x": True}, renderers=renderers)) == ["yes"]
+
+
+def test_render_iter_unresolved():
+    pieces = Template("a{{ x }}").render_iter()
+    with pytest.raises(ValueError):
+        _ = next(pieces)
+
+
+@pytest.mark.parametrize("buffer_size", [1, 3, 1 << 16])
+def test_render_to(buffer_size: int):
+    template = Template("a{% for x in xs %}{{ x }},{% endfor %}b")
+    file = io.StringIO()
+    template.render_to(file, {"xs": range(5)}, buffer_size=buffer_size)
+    assert file.getvalue() == template.render({"xs": range(5)})
+
+
+@final
+class _UnhashableRenderer:
+    __hash__ = None  # pyright: ignore[reportAssignmentType]
+
+    def __call__(self, value: bool) -> str:
+        return _yes_no(value)
+
+
+def test_render_renderers(monkeypatch: pytest.MonkeyPatch):
+    template = Template("{{ a }}")
+    renderers = ((bool, _UnhashableRenderer()),)
+    assert template.render({"a": True}, renderers=renderers) == "yes"
+    assert template.render({"a": True}, renderers=[(bool, _yes_no)]) == "yes"
+    assert template.render({"a": True}) == "True"
+
+    # Renders pick up changed default renderers
+    monkeypatch.setattr(Template, "default_renderers", ((int, hex),))
+    assert template.render({"a": 10}) == "0xa"
+    with pytest.raises(ValueError):
+        _ = template.render({"a": 1.5})
+
+
+def test_render_many(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        Template, "tiering_policy", TieringPolicy(compile_threshold=None)
+    )
+    template = Template("{{ a }}{% for x in xs %}{{ x }}{% endfor %}")
+    variables = [{"a": n, "xs": range(n)} for n in range(4)]
+    results = template.render_many(iter(variables))
+    assert next(results) == "0"
+    assert template.execution_statistics.tier == "compiled"
+    assert list(results) == [template.render(v) for v in variables[1:]]
+    assert template.execution_statistics.renders == 7
+
+    renderers = ((bool, _yes_no),)
+    results = template.render_many([{"a": True, "xs": ()}], renderers=renderers)
+    assert list(results) == ["yes"]
+
+    with pytest.raises(ValueError):
+        _ = list(template.render_many([{}]))
+
+
+def test_render_many_process():
+    template = Template(
+        "{% with f = lambda x: x * k %}{{ f(a) }}{% endwith %}"
+    ).substitute({"k": 3})
+    variables = [{"a": n} for n in range(10)]
+    results = template.render_many(
+        variables, executor="process", workers=2, chunksize=3
+    )
+    assert list(results) == [str(n * 3) for n in range(10)]
+    assert template.execution_statistics.renders == 10
+
+    renderers = ((bool, _yes_no),)
+    results = Template("{{ a }}").render_many(
+        [{"a": True}], renderers=renderers, executor="process", workers=1
+    )
+    assert list(results) == ["yes"]
+
+
+def test_render_batch():
+    # Runs in worker processes otherwise
+    template = Template("{{ a }}")
+    assert _render_batch(template, None, [{"a": 1}, {"a": 2}]) == ["1", "2"]
+
+
+def test_dumps_loads():
+    template = Template(
+        "{% for x in xs %}{{ f(x) }}{% endfor %}{{ with y = lambda z: z * k: y(2) }}"
+    ).substitute({"k": 3})
+    loaded = Template.loads(template.dumps())
+    assert loaded == template
+    variables = {"xs": [1, 2], "f": str}
+    assert loaded.render(variables) == template.render(variables) == "126"
+
+    with pytest.raises(ValueError):
+        _ = Template.loads(b"garbage")
+    with pytest.raises(ValueError):
+        _ = Template("{{ f(x) }}").substitute({"x": object()}).dumps()
+
+
+def test_render_async():
+    async def load(x: int) -> int:
+        return x + 1
+
+    template = Template("{% for x in xs %}{{ load(x) }}{% endfor %}")
+    result = asyncio.run(template.render_async({"load": load, "xs": [1, 2]}))
+    assert result == "23"
+    renderers = ((bool, _yes_no),)
+    result = asyncio.run(
+        Template("{{ x }}").render_async({"x": True}, renderers=renderers)
+    )
+    assert result == "yes"
+    assert asyncio.run(Template("a").render_async()) == "a"
+
+
+def test_render_async_invalid_concurrency():
+    with pytest.raises(ValueError):
+        _ = asyncio.run(Template("a").render_async(max_concurrency=0))
+
+
+def test_render_promotes_to_compiled(monkeypatch: pytest.MonkeyPatch):
+    policy = TieringPolicy(compile_threshold=3, background=False)
+    monkeypatch.setattr(Template, "tiering_policy", policy)
+    template = Template("{% for x in xs %}{{ x }}{% endfor %}")
+    assert template.execution_statistics == ExecutionStatistics()
+
+    for renders in range(1, 5):
+        assert template.render({"xs": [1, 2]}) == "12"
+        statistics = template.execution_statistics
+        assert statistics.renders == renders
+        assert statistics.tier == ("compiled" if renders >= 3 else "interpreted")
+
+    with pytest.raises(TypeError):
+        _ = template.render({"xs": 1})
+    with pytest.raises(ValueError):
+        _ = template.render({})
+    assert template.render({"xs": [[1]]}, renderers=[(list, str)]) == "[1]"
+
+
+def test_render_promotes_in_background(monkeypatch: pytest.MonkeyPatch):
+    policy = TieringPolicy(compile_threshold=1)
+    monkeypatch.setattr(Template, "tiering_policy", policy)
+    template = Template("{{ x }}")
+    assert template.render({"x": 1}) == "1"
+    wait_for_background_compilation()
+    assert template.execution_statistics.tier == "compiled"
+    assert template.execution_statistics.compile_time > 0
+    assert template.render({"x": 2}) == "2"
+
+
+def test_render_never_promoted(monkeypatch: pytest.MonkeyPatch):
+    policy = TieringPolicy(compile_threshold=None)
+    monkeypatch.setattr(Template, "tiering_policy", policy)
+    template = Template("{{ x }}")
+    for _ in range(200):
+        assert template.render({"x": 1}) == "1"
+    assert template.execution_statistics == ExecutionStatistics(renders=200)
+
+
 def test_init_with_custom_syntax():
     template = Template(
         "foo{{barbau/*comment*/no[[var]]bom#}",
@@ -1762,11 +1975,177 @@ def test_init_from_path(monkeypatch: pytest.MonkeyPatch):
     )
 
 
+@pytest.mark.parametrize(
+    "source,sub",
+    [
+        ("", {}),
+        ("foo", {}),
+        ("föo{{bar}}baß\r\n", {"bar": "€"}),
+        ("{{foo}}{{bar}}", {"foo": 42, "bar": "y"}),
+        ("a{% if x %}b{{x}}c{% endif %}d", {"x": 1}),
+        ("{{```ä{{b}}c```}}", {"b": "z"}),
+    ],
+)
+def test_render_memory_mapped(tmp_path: Path, source: str, sub: dict[str, Any]):
+    path = tmp_path / "template.txt"
+    _ = path.write_bytes(source.encode())
+    assert Template(path, memory_map=True).render(sub) == Template(source).render(sub)
+
+
+def test_substitute_memory_mapped(tmp_path: Path):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("foo{{bar}}baz{{qux}}")
+    template = Template(path, memory_map=True).substitute({"bar": 1})
+
+    assert [
+        type(e.value) if isinstance(e, ValueExpression) else None
+        for e in template.content
+    ] == [SourceText, str, SourceText, None]
+    assert template.render({"qux": 2}) == "foo1baz2"
+    assert template.substitute({"qux": 2}).content == (
+        ValueExpression(
+            origin=Origin(position=(1, 1), source_id=str(path)), value="foo1baz2"
+        ),
+    )
+
+
+def test_compiled_memory_mapped(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    policy = TieringPolicy(compile_threshold=1, background=False)
+    monkeypatch.setattr(Template, "tiering_policy", policy)
+    compiled: list[Callable[[dict[str, Any]], Any]] = []
+
+    def compile(*args: Any) -> Callable[[dict[str, Any]], Any] | None:
+        function = compile_expression(*args)
+        assert function is not None
+        compiled.append(function)
+        return function
+
+    monkeypatch.setattr("pyforma._template.compile_expression", compile)
+    path = tmp_path / "template.txt"
+    _ = path.write_text("foo{{bar}}baz{% if bar %}qux{% endif %}")
+    template = Template(path, memory_map=True)
+
+    assert template.render({"bar": 1}) == "foo1bazqux"
+    assert template.execution_statistics.tier == "compiled"
+    assert template.render({"bar": 0}) == "foo0baz"
+
+    # The static text is still referenced in the mapping, not decoded into constants of the compiled function
+    constants = [*compiled[0].__globals__.values()]
+    assert sum(isinstance(c, SourceText) for c in constants) == 3
+    assert not any(
+        isinstance(c, str) and any(t in c for t in ("foo", "baz", "qux"))
+        for c in constants
+    )
+
+
 def test_init_from_invalid():
     with pytest.raises(ValueError):
         _ = Template("foo{{barbau{{")
 
 
+@pytest.mark.parametrize(
+    "source,message",
+    [
+        (
+            "foo\nbar {{ baz(1,\n 2 }}",
+            (
+                "Invalid template syntax\n"
+                "  at 1:1: expected sequence(template, eof)\n"
+                "  at 2:5: expected expression block\n"
+                "  at 2:5: expected expression-block\n"
+                '  at 2:11: expected "}}"\n'
+                '  at 2:11: expected "}"'
+            ),
+        ),
+        (
+            "a\n{% if x %}\nb{%endfor%}",
+            (
+                "Invalid template syntax\n"
+                "  at 1:1: expected sequence(template, eof)\n"
+                "  at 2:1: expected eof"
+            ),
+        ),
+        (
+            "{{ a ** -b }}",
+            (
+                "Invalid template syntax\n"
+                "  at 1:1: expected sequence(template, eof)\n"
+                "  at 1:1: expected expression block\n"
+                "  at 1:1: expected expression-block\n"
+                '  at 1:6: expected "}}"\n'
+                '  at 1:6: expected "}"'
+            ),
+        ),
+        (
+            "{{ }}",
+            (
+                "Invalid template syntax\n"
+                "  at 1:1: expected sequence(template, eof)\n"
+                "  at 1:1: expected expression block\n"
+                "  at 1:1: expected expression-block\n"
+                "  at 1:4: expected expression\n"
+                '  at 1:4: expected binary-expression("or")\n'
+                '  at 1:4: expected sequence(binary-expression("and"), repetition(sequence(whitespace, alternation("or"), whitespace, binary-expression("and"))))\n'
+                '  at 1:4: expected binary-expression("and")\n'
+                '  at 1:4: expected sequence(unary-expression("not"), repetition(sequence(whitespace, alternation("and"), whitespace, unary-expression("not"))))\n'
+                '  at 1:4: expected unary-expression("not")\n'
+                '  at 1:4: expected alternation(sequence(alternation("not"), whitespace, unary-expression("not")), comparison-expression)\n'
+                '  at 1:4: expected sequence(alternation("not"), whitespace, unary-expression("not"))\n'
+                '  at 1:4: expected alternation("not")\n'
+                '  at 1:4: expected "not"\n'
+                '  at 1:4: expected "n"'
+            ),
+        ),
+        (
+            "x\n{{ [1, 2 }}",
+            (
+                "Invalid template syntax\n"
+                "  at 1:1: expected sequence(template, eof)\n"
+                "  at 2:1: expected expression block\n"
+                "  at 2:1: expected expression-block\n"
+                "  at 2:4: expected expression\n"
+                '  at 2:4: expected binary-expression("or")\n'
+                '  at 2:4: expected sequence(binary-expression("and"), repetition(sequence(whitespace, alternation("or"), whitespace, binary-expression("and"))))\n'
+                '  at 2:4: expected binary-expression("and")\n'
+                '  at 2:4: expected sequence(unary-expression("not"), repetition(sequence(whitespace, alternation("and"), whitespace, unary-expression("not"))))\n'
+                '  at 2:4: expected unary-expression("not")\n'
+                '  at 2:4: expected alternation(sequence(alternation("not"), whitespace, unary-expression("not")), comparison-expression)\n'
+                "  at 2:4: expected comparison-expression\n"
+                '  at 2:4: expected sequence(binary-expression("in", "not in"), repetition(sequence(whitespace, alternation("==", "!=", "<=", "<", ">=", ">"), whitespace, binary-expression("in", "not in"))))\n'
+                '  at 2:4: expected binary-expression("in", "not in")\n'
+                '  at 2:4: expected sequence(binary-expression("|"), repetition(sequence(whitespace, alternation("in", "not in"), whitespace, binary-expression("|"))))\n'
+                '  at 2:4: expected binary-expression("|")\n'
+                '  at 2:4: expected sequence(binary-expression("^"), repetition(sequence(whitespace, alternation("|"), whitespace, binary-expression("^"))))\n'
+                '  at 2:4: expected binary-expression("^")\n'
+                '  at 2:4: expected sequence(binary-expression("&"), repetition(sequence(whitespace, alternation("^"), whitespace, binary-expression("&"))))\n'
+                '  at 2:4: expected binary-expression("&")\n'
+                '  at 2:4: expected sequence(binary-expression("<<", ">>"), repetition(sequence(whitespace, alternation("&"), whitespace, binary-expression("<<", ">>"))))\n'
+                '  at 2:4: expected binary-expression("<<", ">>")\n'
+                '  at 2:4: expected sequence(binary-expression("+", "-"), repetition(sequence(whitespace, alternation("<<", ">>"), whitespace, binary-expression("+", "-"))))\n'
+                '  at 2:4: expected binary-expression("+", "-")\n'
+                '  at 2:4: expected sequence(binary-expression("*", "//", "/", "%", "@"), repetition(sequence(whitespace, alternation("+", "-"), whitespace, binary-expression("*", "//", "/", "%", "@"))))\n'
+                '  at 2:4: expected binary-expression("*", "//", "/", "%", "@")\n'
+                '  at 2:4: expected sequence(unary-expression("+", "-", "~"), repetition(sequence(whitespace, alternation("*", "//", "/", "%", "@"), whitespace, unary-expression("+", "-", "~"))))\n'
+                '  at 2:4: expected unary-expression("+", "-", "~")\n'
+                '  at 2:4: expected alternation(sequence(alternation("+", "-", "~"), whitespace, unary-expression("+", "-", "~")), binary-expression("**"))\n'
+                '  at 2:4: expected binary-expression("**")\n'
+                '  at 2:4: expected sequence(transform(transform_success(primary-expression, <lambda>), _transform_primary_expression), repetition(sequence(whitespace, alternation("**"), whitespace, transform(transform_success(primary-expression, <lambda>), _transform_primary_expression))))\n'
+                "  at 2:4: expected primary_expression\n"
+                "  at 2:4: expected primary-expression\n"
+                "  at 2:4: expected simple-expression\n"
+                "  at 2:4: expected list-expression\n"
+                '  at 2:9: expected "]"\n'
+                '  at 2:9: expected "]"'
+            ),
+        ),
+    ],
+)
+def test_init_error_message(source: str, message: str):
+    with pytest.raises(ValueError) as e:
+        _ = Template(source)
+    assert str(e.value) == message
+
+
 def test_eq():
     assert Template("{{foo}}") == Template("{{foo}}")
     assert Template("{{foo}}") != Template("{{bar}}")
@@ -0,0 +1,201 @@
+import copy
+import threading
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from pyforma import (
+    Template,
+    TemplateCache,
+    TemplateCacheStatistics,
+    TemplateSyntaxConfig,
+    ParseCache,
+)
+from pyforma._ast import TemplateExpression, ValueExpression
+from pyforma._ast.origin import Origin
+from pyforma._parser import BlockSyntaxConfig, ParseMemo
+
+_syntax = TemplateSyntaxConfig()
+
+
+def _parsed(source: str) -> TemplateExpression:
+    template = Template(source)
+    return TemplateExpression(origin=template.origin, content=template.content)
+
+
+def _repeated(template: TemplateExpression, n: int) -> TemplateExpression:
+    content = tuple(e for _ in range(n) for e in copy.deepcopy(template.content))
+    return TemplateExpression(origin=template.origin, content=content)
+
+
+def test_statistics():
+    assert TemplateCacheStatistics().hit_rate == 0.0
+    assert TemplateCacheStatistics(hits=1, misses=3, evictions=2).hit_rate == 0.25
+
+
+def test_load_and_store():
+    cache = TemplateCache()
+    assert cache.load("foo", source_id="", syntax=_syntax) is None
+
+    template = _parsed("foo")
+    cache.store("foo", template, source_id="", syntax=_syntax)
+    cache.store("foo", _parsed("foo"), source_id="", syntax=_syntax)
+    assert len(cache) == 1
+    assert cache.load("foo", source_id="", syntax=_syntax) is template
+
+    assert cache.load("foo", source_id="bar", syntax=_syntax) is None
+    syntax = TemplateSyntaxConfig(expression=BlockSyntaxConfig("<<", ">>"))
+    assert cache.load("foo", source_id="", syntax=syntax) is None
+
+    assert cache.statistics == TemplateCacheStatistics(hits=1, misses=3)
+
+
+def test_max_entries():
+    cache = TemplateCache(max_entries=2)
+    for source in ("a", "b", "c"):
+        cache.store(source, _parsed(source), source_id="", syntax=_syntax)
+        _ = cache.load("a", source_id="", syntax=_syntax)  # Keep "a" in use
+
+    assert len(cache) == 2
+    assert cache.load("a", source_id="", syntax=_syntax) is not None
+    assert cache.load("b", source_id="", syntax=_syntax) is None
+    assert cache.load("c", source_id="", syntax=_syntax) is not None
+    assert cache.statistics.evictions == 1
+
+
+def test_max_size():
+    small, large = "a" * 10, "b" * 1000
+    cache = TemplateCache(max_entries=None, max_size=900)
+    cache.store(small, _parsed(small), source_id="", syntax=_syntax)
+    cache.store(large, _parsed(large), source_id="", syntax=_syntax)
+    assert len(cache) == 0  # The large template doesn't fit at all
+    assert cache.size == 0
+    assert cache.statistics.evictions == 2
+
+    cache.store(small, _parsed(small), source_id="", syntax=_syntax)
+    assert 0 < cache.size <= 900
+
+
+def test_size_of_parsed_template():
+    source = "{{ a }}{% if b %}{{ c + 1 }}{% endif %}"
+    cache = TemplateCache()
+    cache.store(source, _parsed(source), source_id="", syntax=_syntax)
+    size = cache.size
+    assert size > 10 * len(source)  # The tree is much larger than its source
+
+    # The trees of long templates are approximated from a sample of their content
+    long = _repeated(_parsed(source), 1000)
+    cache = TemplateCache()
+    cache.store(source * 1000, long, source_id="", syntax=_syntax)
+    assert 500 * size < cache.size < 2000 * size
+
+    # Values of constants are measured, too
+    value = ValueExpression(origin=Origin(position=(1, 1)), value={"a": ["b" * 1000]})
+    cache = TemplateCache()
+    cache.store(
+        "",
+        TemplateExpression(origin=value.origin, content=(value,)),
+        source_id="",
+        syntax=_syntax,
+    )
+    assert cache.size > 1000
+
+
+def test_default_max_size():
+    cache = TemplateCache(max_entries=None)
+    template = _repeated(_parsed("{{ a }}"), 2000)
+    for n in range(400):
+        cache.store(str(n), template, source_id="", syntax=_syntax)
+    assert 0 < cache.size <= 64 * 2**20
+    assert 0 < len(cache) < 400
+
+
+def test_unbounded():
+    cache = TemplateCache(max_entries=None, max_size=None)
+    for n in range(1000):
+        cache.store(str(n), _parsed(str(n)), source_id="", syntax=_syntax)
+    assert len(cache) == 1000
+    assert cache.statistics.evictions == 0
+
+
+def test_clear():
+    cache = TemplateCache()
+    cache.store("foo", _parsed("foo"), source_id="", syntax=_syntax)
+    _ = cache.load("foo", source_id="", syntax=_syntax)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+    assert cache.statistics.hits == 1
+
+
+def test_concurrent_access():
+    cache = TemplateCache(max_entries=8)
+    sources = [f"foo{{{{ x{n} }}}}" for n in range(16)]
+    templates = {s: _parsed(s) for s in sources}
+
+    def work():
+        for s in sources * 10:
+            cached = cache.load(s, source_id="", syntax=_syntax)
+            if cached is None:
+                cache.store(s, templates[s], source_id="", syntax=_syntax)
+            else:
+                assert cached is templates[s]
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    s = cache.statistics
+    assert len(cache) == 8
+    assert s.hits + s.misses == 4 * 160
+
+
+def test_template_uses_cache(template_cache: TemplateCache, mocker: MockerFixture):
+    first = Template("Hello {{ name }}!")
+    spy = mocker.spy(ParseMemo, "clear")
+    second = Template("Hello {{ name }}!")
+    assert spy.call_count == 0  # Not parsed again
+    assert second == first
+    assert template_cache.statistics == TemplateCacheStatistics(hits=1, misses=1)
+
+
+def test_template_cache_disabled(mocker: MockerFixture):
+    _ = mocker.patch.object(Template, "template_cache", None)
+    spy = mocker.spy(ParseMemo, "clear")
+    _ = Template("foo")
+    _ = Template("foo")
+    assert spy.call_count == 2
+
+
+def test_template_cache_skips_mapped_files(
+    template_cache: TemplateCache, tmp_path: Path
+):
+    path = tmp_path / "template.txt"
+    _ = path.write_text("foo")
+    _ = Template(path, memory_map=True)
+    assert len(template_cache) == 0
+    _ = Template(path)
+    assert len(template_cache) == 1
+
+
+def test_template_cache_fed_by_parse_cache(
+    template_cache: TemplateCache, tmp_path: Path
+):
+    parse_cache = ParseCache(tmp_path)
+    first = Template("foo{{bar}}", parse_cache=parse_cache)
+    template_cache.clear()
+
+    second = Template("foo{{bar}}", parse_cache=parse_cache)
+    assert parse_cache.statistics.hits == 1
+    assert len(template_cache) == 1
+    assert Template("foo{{bar}}", parse_cache=parse_cache) == second == first
+    assert parse_cache.statistics.hits == 1
+
+
+def test_syntax_errors_are_not_cached(template_cache: TemplateCache):
+    with pytest.raises(ValueError):
+        _ = Template("{{")
+    assert len(template_cache) == 0
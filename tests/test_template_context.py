@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock
@@ -9,6 +10,7 @@ from pyforma import DefaultTemplateContext, Template, TemplateContext
 from pyforma._ast import ValueExpression
 from pyforma._ast.expressions.template_expression import TemplateExpression
 from pyforma._ast.origin import Origin
+from pyforma._template_context import _load  # pyright: ignore[reportPrivateUsage]
 
 
 def test_load_template(mocker: MockerFixture) -> None:
@@ -19,6 +21,7 @@ def test_load_template(mocker: MockerFixture) -> None:
         return "mocked"
 
     _ = mocker.patch.object(Path, "read_text", new=fake_read_text)
+    _load.cache_clear()
 
     base_path = Path("/foo/bar")
     context = TemplateContext(base_path=base_path)
@@ -135,3 +138,26 @@ def test_render(
 ):
     context = DefaultTemplateContext(default_variables=variables)
     assert context.render(template) == expected
+
+
+def test_render_async():
+    async def load() -> str:
+        return "bar"
+
+    context = DefaultTemplateContext(default_variables={"foo": load})
+    template = Template("{{ foo() }}{{ len(x) }}")
+    result = asyncio.run(context.render_async(template, variables={"x": "ab"}))
+    assert result == "bar2"
+
+
+def test_render_many():
+    context = DefaultTemplateContext(default_variables={"foo": "bar"})
+    template = Template("{{ foo }}{{ len(x) }}")
+    variables = [{"x": "ab"}, {"x": "abc", "foo": "baz"}]
+    results = context.render_many(template, variables=variables)
+    assert list(results) == ["bar2", "baz3"]
+
+    results = context.render_many(
+        template, variables=variables, executor="process", workers=1
+    )
+    assert list(results) == ["bar2", "baz3"]
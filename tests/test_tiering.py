@@ -0,0 +1,167 @@
+import pickle
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from pyforma import ExecutionStatistics, TieringPolicy
+from pyforma._tiering import TieredExecution, wait_for_background_compilation
+
+_renderers = ((str, str),)
+_policy = TieringPolicy()
+
+
+def _compile(renderers: Any) -> Callable[[dict[str, Any]], str]:
+    def render(variables: dict[str, Any]) -> str:
+        return f"{variables}{len(renderers)}"
+
+    return render
+
+
+def test_statistics():
+    assert ExecutionStatistics() == ExecutionStatistics(
+        renders=0, tier="interpreted", compile_time=0.0
+    )
+
+
+def test_promotion():
+    execution = TieredExecution()
+    policy = TieringPolicy(compile_threshold=2, background=False)
+    assert execution.function(_renderers, policy, _compile) is None
+    function = execution.function(_renderers, policy, _compile)
+    assert function is not None
+    assert function({}) == "{}1"
+    assert execution.function(_renderers, policy, _compile) is function
+
+    # Other renderers are counted and compiled separately
+    assert execution.function(_renderers * 2, policy, _compile) is None
+    other = execution.function(_renderers * 2, policy, _compile)
+    assert other is not None
+    assert other({}) == "{}2"
+
+    assert execution.statistics.renders == 5
+    assert execution.statistics.tier == "compiled"
+
+
+def test_renders_per_renderers():
+    execution = TieredExecution()
+    policy = TieringPolicy(compile_threshold=2, background=False)
+    compiled: list[Any] = []
+
+    def compile(renderers: Any) -> Callable[[dict[str, Any]], str]:
+        compiled.append(renderers)
+        return _compile(renderers)
+
+    # Renderers that change with every render are never compiled
+    for i in range(100):
+        assert execution.function(((str, str),) * (i + 1), policy, compile) is None
+    assert compiled == []
+    assert execution.statistics == ExecutionStatistics(renders=100)
+
+    # Only the most recently used renderers are counted
+    assert execution.function(((str, str),) * 100, policy, compile) is not None
+    assert execution.function(((str, str),) * 1, policy, compile) is None
+    assert len(compiled) == 1
+
+
+def test_max_compiled():
+    execution = TieredExecution()
+    policy = TieringPolicy(compile_threshold=1, background=False, max_compiled=2)
+    first = execution.function(_renderers, policy, _compile)
+    second = execution.function(_renderers * 2, policy, _compile)
+    assert execution.function(_renderers, policy, _compile) is first
+    _ = execution.function(_renderers * 3, policy, _compile)
+
+    # The least recently used function is dropped
+    assert execution.function(_renderers, policy, _compile) is first
+    assert execution.prepare(_renderers * 2, policy, _compile) is not second
+
+
+def test_failed_compilation():
+    execution = TieredExecution()
+    policy = TieringPolicy(compile_threshold=1, background=False)
+    attempts: list[Any] = []
+
+    def compile(renderers: Any) -> Callable[[dict[str, Any]], str]:
+        attempts.append(renderers)
+        raise RuntimeError("compilation failed")
+
+    # Renders are interpreted, and the template is not compiled again
+    for _ in range(3):
+        assert execution.function(_renderers, policy, compile) is None
+    assert len(attempts) == 1
+    assert execution.statistics.tier == "interpreted"
+
+    # Explicit compilation tries again
+    with pytest.raises(RuntimeError):
+        _ = execution.prepare(_renderers, policy, compile)
+    assert execution.prepare(_renderers, policy, _compile)({}) == "{}1"
+    assert execution.statistics.tier == "compiled"
+
+
+def test_failed_background_compilation():
+    execution = TieredExecution()
+    policy = TieringPolicy(compile_threshold=1)
+
+    def compile(renderers: Any) -> Callable[[dict[str, Any]], str]:
+        raise RuntimeError(f"compilation failed for {renderers}")
+
+    assert execution.function(_renderers, policy, compile) is None
+    wait_for_background_compilation()
+    assert execution.statistics.tier == "interpreted"
+
+
+def test_compiling():
+    execution = TieredExecution()
+    policy = TieringPolicy(compile_threshold=1, background=False)
+
+    def compile(renderers: Any) -> Callable[[dict[str, Any]], str]:
+        assert execution.statistics.tier == "compiling"
+        # Renders during compilation are interpreted
+        assert execution.function(renderers, policy, _compile) is None
+        return _compile(renderers)
+
+    assert execution.function(_renderers, policy, compile) is not None
+    assert execution.statistics.tier == "compiled"
+    assert execution.statistics.renders == 2
+
+
+def test_unhashable_renderers():
+    execution = TieredExecution()
+    policy = TieringPolicy(compile_threshold=1, background=False)
+    renderers: Any = ((str, [str]),)
+    assert execution.function(renderers, policy, _compile) is None
+    assert execution.statistics == ExecutionStatistics(renders=1)
+
+
+def test_prepare():
+    execution = TieredExecution()
+    function = execution.prepare(_renderers, _policy, _compile)
+    assert function({}) == "{}1"
+    assert execution.statistics == ExecutionStatistics(
+        renders=0, tier="compiled", compile_time=execution.statistics.compile_time
+    )
+    assert execution.prepare(_renderers, _policy, _compile) is function
+
+    # Compiled functions are shared with function()
+    policy = TieringPolicy(compile_threshold=None)
+    assert execution.function(_renderers, policy, _compile) is function
+
+    execution.count()
+    assert execution.statistics.renders == 2
+
+
+def test_prepare_unhashable_renderers():
+    execution = TieredExecution()
+    renderers: Any = ((str, [str]),)
+    assert execution.prepare(renderers, _policy, _compile)({}) == "{}1"
+    assert execution.statistics == ExecutionStatistics()
+
+
+def test_pickle():
+    execution = TieredExecution()
+    policy = TieringPolicy(compile_threshold=1, background=False)
+    _ = execution.function(_renderers, policy, _compile)
+    copy = pickle.loads(pickle.dumps(execution))
+    assert isinstance(copy, TieredExecution)
+    assert copy.statistics == ExecutionStatistics()